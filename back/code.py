@@ -98,7 +98,7 @@ async def main():
         temperature=sensor_temperature,
         # battery=None, temperature=None,
         bluetooth=ble, service=service.service, receiver=receiver, sender=sender,
-        receiver_rear=receiver_rear, receiver_brake=receiver_brake, receiver_dir=receiver_direction,
+        receiver_rear=receiver_rear, receiver_brake=receiver_brake, receiver_dir=receiver_direction, policy=True,
         settings_rear=settings_rear, settings_brake=settings_brake, settings_general=settings_general, settings_dir=settings_direction,
         is_logging=is_logging,
     )
@@ -76,6 +76,10 @@ class BLEConnection:
             return results[0]
         return None
 
+    def services(self, uuids: tuple) -> tuple:
+        """ Discover the services of these uuids in one go. """
+        return self.connection.discover_remote_services(uuids)
+
     @property
     def connected(self) -> bool:
         """True if the connection to the peer is still active."""
@@ -134,6 +138,13 @@ class AdaCharacteristic:
             )
         self.characteristic.set_cccd(notify=write)
 
+    def bind(self, characteristic: _bleio.Characteristic) -> 'AdaCharacteristic':
+        """ Use another remote characteristic (after a reconnection). """
+        self.characteristic = characteristic
+        self._last_value = b''
+        self.characteristic.set_cccd(notify=False)
+        return self
+
     @property
     def uuid(self) -> _bleio.UUID:
         return self.characteristic.uuid
@@ -139,11 +139,18 @@ class Bluetooth(_ble.Bluetooth):
             count += 1
         if not connection.connected or not self.connected:
             return None
-        connection.connection.connection_interval = _TRANSMISSION_INTERVAL_MS
+        self._set_transmission_interval(
+            connection, self.transmission_interval if self.transmission_interval is not None else _TRANSMISSION_INTERVAL_MS
+        )
         self.logging(f"Connection interval: {connection.connection.connection_interval}ms", "INFO")
         gc.collect()
         return connection
 
+    def _set_transmission_interval(self, connection: BluetoothConnection, value: int) -> bool:
+        """ Request a connection interval (the peer may reject it). """
+        connection.connection.connection_interval = value
+        return True
+
     async def _unconnected(self, connection: BluetoothConnection):
         """ Wait for connection to be disconnected. """
         while self.connected and connection.connected:
@@ -180,6 +187,49 @@ class Bluetooth(_ble.Bluetooth):
                     self.logging(f"Error while getting services: {e}", "ERROR")
                     await asyncio.sleep(_CONNECTING_ERROR_WAIT)
 
+    def _handles(self, connection: BluetoothConnection) -> list | None:
+        """ Cache the uuids objects and the index of each characteristic in its remote service. """
+        handles = []
+        for service in self.services:
+            if service.service is None:
+                return None
+            chars = service.service.characteristics
+            mapping = []
+            for characteristic in service.characteristics:
+                if characteristic.characteristic is None:
+                    continue
+                for index in range(len(chars)):
+                    if chars[index].uuid == characteristic.characteristic.uuid:
+                        mapping.append((index, chars[index].uuid, characteristic))
+                        break
+            handles.append((service, service.service.uuid, mapping))
+        return handles
+
+    async def _restore(self, connection: BluetoothConnection, handles: list) -> bool:
+        """ Discover only the cached services (in one go) and bind the characteristics by index. """
+        if connection is None or connection.connection is None:
+            return False
+        remotes = connection.connection.services(tuple(uuid for _, uuid, _ in handles))
+        if len(remotes) != len(handles):
+            return False
+        for (service, uuid, mapping), remote in zip(handles, remotes):
+            if remote.uuid != uuid:
+                return False
+            chars = remote.characteristics
+            for index, char_uuid, _ in mapping:
+                if index >= len(chars) or chars[index].uuid != char_uuid:
+                    return False
+        # Valid -> Bind
+        for (service, uuid, mapping), remote in zip(handles, remotes):
+            service.service = remote
+            chars = remote.characteristics
+            for index, _, characteristic in mapping:
+                if isinstance(characteristic.characteristic, AdaCharacteristic):
+                    characteristic.characteristic.bind(chars[index])
+                else:
+                    characteristic.characteristic = AdaCharacteristic(chars[index], size=characteristic.size)
+        return True
+
 
 gc.collect()
 
@@ -63,6 +63,13 @@ _ICM20X_REG_INT_STATUS_1 = 0x1A  # Interrupt status register 1   data register f
 _ICM20X_REG_INT_STATUS_2 = 0x1B  # Interrupt status register 2   FIFO overflow
 _ICM20X_REG_INT_STATUS_3 = 0x1C  # Interrupt status register 3   Watermark interrupt
 
+_ICM20X_FIFO_EN_2 = 0x67  # Sensors written to the FIFO (accel bit 4, gyro z/y/x bits 3-1)
+_ICM20X_FIFO_RST = 0x68  # FIFO reset (bits 4-0 asserted then cleared)
+_ICM20X_FIFO_MODE = 0x69  # 0: stream (overwrites when full), 1: snapshot
+_ICM20X_FIFO_COUNTH = 0x70  # Bytes in the FIFO (13 bits, big-endian over COUNTH and COUNTL)
+_ICM20X_FIFO_R_W = 0x72  # FIFO data (successive reads pop successive bytes)
+_ICM20X_FIFO_SIZE = 512  # Bytes of FIFO
+
 # Bank 2
 _ICM20X_GYRO_SMPLRT_DIV = 0x00
 _ICM20X_GYRO_CONFIG_1 = 0x01
@@ -165,6 +172,12 @@ class ICM20X:  # pylint:disable=too-many-instance-attributes
     _data_ready = ROBit(_ICM20X_REG_INT_STATUS_1, 0)
 
     _i2c_master_cycle_en = RWBit(_ICM20X_LP_CONFIG, 6)
+
+    _fifo_en = RWBit(_ICM20X_USER_CTRL, 6)
+    _fifo_sensors = UnaryStruct(_ICM20X_FIFO_EN_2, ">B")
+    _fifo_rst = UnaryStruct(_ICM20X_FIFO_RST, ">B")
+    _fifo_mode = UnaryStruct(_ICM20X_FIFO_MODE, ">B")
+    _fifo_count = ROUnaryStruct(_ICM20X_FIFO_COUNTH, ">H")
     _accel_cycle_en = RWBit(_ICM20X_LP_CONFIG, 5)
     _gyro_cycle_en = RWBit(_ICM20X_LP_CONFIG, 4)
 
@@ -519,6 +532,62 @@ class ICM20X:  # pylint:disable=too-many-instance-attributes
         self._bank = 0
         self._low_power_en = enabled
 
+    # FIFO (batches of samples read at once)
+
+    def fifo_start(self, gyro: bool = False) -> None:
+        """Write the accelerometer (and gyro) samples to the FIFO (stream mode), read with :meth:`fifo_read`.
+        A frame is 6 bytes (accel x, y, z) or 12 bytes with the gyro, in big-endian int16."""
+        self._bank = 0
+        self._fifo_frame = 12 if gyro else 6
+        self.fifo_buffer = bytearray(_ICM20X_FIFO_SIZE - _ICM20X_FIFO_SIZE % self._fifo_frame)
+        self._fifo_view = memoryview(self.fifo_buffer)
+        self.fifo_overflows = 0
+        self._fifo_mode = 0
+        self._fifo_sensors = 0x1E if gyro else 0x10
+        self.fifo_reset()
+        self._fifo_en = True
+
+    def fifo_stop(self) -> None:
+        self._bank = 0
+        self._fifo_en = False
+        self._fifo_sensors = 0
+
+    def fifo_reset(self) -> None:
+        self._bank = 0
+        self._fifo_rst = 0x1F
+        self._fifo_rst = 0x00
+
+    @property
+    def fifo_count(self) -> int:
+        """Bytes waiting in the FIFO."""
+        self._bank = 0
+        return self._fifo_count & 0x1FFF
+
+    def fifo_read(self) -> int:
+        """Read the whole frames waiting in the FIFO into fifo_buffer (one I2C transaction), the number of frames.
+        A full FIFO (samples lost) is counted in fifo_overflows and emptied."""
+        count = self.fifo_count
+        if count >= _ICM20X_FIFO_SIZE:
+            self.fifo_overflows += 1
+        size = min(count - count % self._fifo_frame, len(self.fifo_buffer))
+        if size == 0:
+            return 0
+        self.i2c_device.i2c.readfrom_mem_into(self.i2c_device.address, _ICM20X_FIFO_R_W, self._fifo_view[:size])
+        if count >= _ICM20X_FIFO_SIZE:
+            self.fifo_reset()
+        return size // self._fifo_frame
+
+    def fifo_acceleration(self, frame: int, axis: int) -> float:
+        """Acceleration (m/s^2) along axis (0, 1, 2) of a frame read by :meth:`fifo_read`."""
+        i = frame * self._fifo_frame + 2 * axis
+        raw = self.fifo_buffer[i] << 8 | self.fifo_buffer[i + 1]
+        return self._scale_xl_data(raw - 65536 if raw & 0x8000 else raw)
+
+    @property
+    def fifo_rate(self) -> float:
+        """Frames per second written to the FIFO."""
+        return self.accelerometer_data_rate
+
     @property
     def gravity(self) -> float:
         """The gravity magnitude in m/s^2."""
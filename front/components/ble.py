@@ -1,6 +1,7 @@
 import asyncio
 
 import aioble
+from aioble.client import ClientService, ClientCharacteristic
 import bluetooth
 from micropython import const
 
@@ -89,15 +90,19 @@ class Bluetooth(_ble.Bluetooth):
     # TODO: Fix _scan not working: generator as no __aiter__ or smt like that
 
     async def _advertise(self) -> BluetoothConnection | None:
-        """ Advertise and returns a connection object (connection: aioble.device.DeviceConnection). """
-        connection = await aioble.advertise(
-            _ADVERTISEMENT_INTERVAL_US,
-            name=self.name,
-            services=[bluetooth.UUID(service.uuid) for service in self.services], # List of UUIDs
-            # appearance=_GENERIC_THERMOMETER,
-            # manufacturer=(0xabcd, b"1234"),
-            timeout_ms=_ADVERTISEMENT_TIMEOUT_MS,
-        )
+        """ Advertise and returns a connection object (connection: aioble.device.DeviceConnection).
+        Returns None if the advertising duration ended (to advertise again with a new interval). """
+        try:
+            connection = await aioble.advertise(
+                self.advertising_interval * 1000 if self.advertising_interval is not None else _ADVERTISEMENT_INTERVAL_US,
+                name=self.name,
+                services=[bluetooth.UUID(service.uuid) for service in self.services], # List of UUIDs
+                # appearance=_GENERIC_THERMOMETER,
+                # manufacturer=(0xabcd, b"1234"),
+                timeout_ms=int(self.advertising_duration * 1000) if self.advertising_duration is not None else _ADVERTISEMENT_TIMEOUT_MS,
+            )
+        except asyncio.TimeoutError:
+            return None
         return BluetoothConnection(connection.device).connect(connection)
 
     async def scan(self):
@@ -145,6 +150,38 @@ class Bluetooth(_ble.Bluetooth):
                 for characteristic in service.characteristics:
                     characteristic.characteristic = await service.service.characteristic(bluetooth.UUID(characteristic.uuid))
 
+    def _handles(self, connection: BluetoothConnection) -> list | None:
+        """ Cache the handles of the services (start, end) and of the characteristics (end, value, properties). """
+        handles = []
+        for service in self.services:
+            if service.service is None:
+                return None
+            chars = []
+            for characteristic in service.characteristics:
+                char = characteristic.characteristic
+                if char is None:
+                    return None
+                chars.append((characteristic, char._end_handle, char._value_handle, char.properties, char.uuid))
+            handles.append((service, service.service._start_handle, service.service._end_handle, service.service.uuid, chars))
+        return handles
+
+    async def _restore(self, connection: BluetoothConnection, handles: list) -> bool:
+        """ Discover only the services: if their handles did not change, the characteristics are rebuilt from cache. """
+        if connection is None or connection.connection is None:
+            return False
+        remotes = []
+        for service, start, end, uuid, chars in handles:
+            remote = await connection.connection.service(uuid)
+            if remote is None or remote._start_handle != start or remote._end_handle != end:
+                return False
+            remotes.append(remote)
+        # Valid -> Rebuild (without discovering the characteristics)
+        for (service, start, end, uuid, chars), remote in zip(handles, remotes):
+            service.service = remote
+            for characteristic, end_handle, value_handle, properties, char_uuid in chars:
+                characteristic.characteristic = ClientCharacteristic(remote, end_handle, value_handle, properties, char_uuid)
+        return True
+
 
 # =========================== #
 #             GATT            #
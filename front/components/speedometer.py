@@ -3,21 +3,16 @@
 import time
 
 # Interface
-from interface.basic.utils import rounder
 from interface.components.speedometer import Speedometer as _Speedometer
 
 class Speedometer(_Speedometer):
 
+    typecode = "l"   # time.ticks_ms() fits (30 bits)
+
     # To edit when using a different way to get time
 
-    @property
-    def now(self):
+    def ticks(self) -> int:
         return time.ticks_ms()
 
-    def diff(self, before=None, now=None):
-        return rounder(
-            time.ticks_diff(
-                (self.now if now is None else now), (self._time_last if before is None else before)
-            )/1000,
-            self.rounding
-        )
+    def ticks_diff(self, after: int, before: int) -> int:
+        return time.ticks_diff(after, before)
@@ -33,7 +33,7 @@ class Wifi(_Wifi):
     # Specific
 
     def _disconnect(self):
-        self.wifi.active = False
+        self.wifi.active(False)
 
 
 class AccessPoint(Wifi):
@@ -41,6 +41,10 @@ class AccessPoint(Wifi):
                  name: str | None = None, is_logging: bool | None = None, style: str | None = None):
         super().__init__(ssid=ssid, protocol=network.WLAN.IF_AP, password=password, is_logging=is_logging, style=style)
 
+    @property
+    def connected(self) -> bool:
+        return self.wifi.active()
+
     def _connect(self):
         self.wifi.config(essid=self.ssid, password=self.password, authmode=network.AUTH_WPA_WPA2_PSK)
         self.wifi.active(True)
@@ -55,7 +59,11 @@ class WifiStation(Wifi):
     def _connect(self):
         self.wifi.active(True)
         self.wifi.connect(self.ssid, self.password)
-        self.logging(self.wifi.ifconfig("addr4"))
+
+    def _disconnect(self):
+        if self.wifi.isconnected():
+            self.wifi.disconnect()
+        self.wifi.active(False)
 
 
 class WifiManager(_WifiManager):
@@ -22,6 +22,7 @@ print(gc.mem_free())  # 2021328
 from interface.features.front import Front
 from interface.features.wireless import RearBluetooth, DirectionBluetooth, BrakeBluetooth, BikeLight, ToFrontBluetooth, ToBackBluetooth
 from interface.features.settings import FileSettings
+from interface.components.files import JsonStore
 from interface.features.bike import BikeMenuSettings, BikeApp
 
 gc.collect()
@@ -35,8 +36,9 @@ gc.collect()
 print(gc.mem_free())  # 1799856
 
 # Wireless
+from interface.wireless.api import ResponseCache
 from interface.wireless.date import DateAPI
-# from interface.wireless.location import LocationAPI
+from interface.wireless.location import LocationAPI
 from interface.wireless.phone import PhoneAPI
 
 # Front
@@ -49,6 +51,7 @@ from front.adafruit import board
 from front.adafruit.stemma.veml_7700 import LuxSensor
 from front.adafruit.stemma.max1704x import MAX17048
 from front.adafruit.stemma.pcf8523.pcf8523 import PCF8523
+from front.adafruit.stemma.icm20x import ICM20649
 from front.components.speedometer import Speedometer
 
 gc.collect()
@@ -98,7 +101,7 @@ _PIN_CANCEL = _PIN_WARNING
 
 async def main():
     # Settings
-    settings = FileSettings(r"files", template="template_0")
+    settings = FileSettings(r"files", template="template_0", bundle=True)
     settings_rear = settings.rear_settings
     settings_direction = settings.direction_settings
     settings_brake = settings.brake_settings
@@ -111,12 +114,14 @@ async def main():
     station = WifiStation(is_logging=True)
     wifi = WifiManager(ap, station, phone=phone, file=settings.creds_file)
     wifi.initialise()
+    phone.wifi = wifi
 
     gc.collect()
 
     # APIs
-    clock_api = DateAPI(wifi, is_logging=True)
-    # location_api = LocationAPI(wifi, is_logging=True)
+    cache = ResponseCache(r"files/cache.json")
+    clock_api = DateAPI(wifi, cache=cache, is_logging=True)
+    location_api = LocationAPI(wifi, cache=cache, is_logging=True)
     # weather_api = WeatherAPI(location_api, is_logging=True)
 
     # ------ Inputs ------
@@ -141,6 +146,7 @@ async def main():
     sensor_light = LuxSensor(i2c)
     sensor_battery = MAX17048(i2c)
     sensor_hall = Button(_PIN_HALL, inverse=True, pull=True)
+    sensor_imu = ICM20649(i2c)
 
     # Clock
     rtc = PCF8523(i2c)
@@ -182,14 +188,14 @@ async def main():
         output_left=light_left, output_right=light_right, output_warning=light_warning, output_buzzer=buzzer,
         screen=screen,
         activation=activation, frequency=frequency, modes=True, types=True, manual=True,
-        dark=sensor_light, night=clock, light=sensor_light, clock=clock,
+        dark=sensor_light, night=clock, light=sensor_light, clock=clock, location=location_api,
         left=left, right=right, warning=warning, beep=True,
-        enable=True, speedometer=True, hall=sensor_hall, acceleration=True,
+        enable=True, speedometer=True, hall=sensor_hall, acceleration=True, analytics=True, imu=sensor_imu,
         keys=keys, apps=apps, timing=True, eco=eco, battery=sensor_battery, amplification=brightness, automatic=sensor_light,
         dis_left=left, dis_right=right, dis_select=frequency, dis_cancel=warning,
         bluetooth=ble, service=service.service, receiver=receiver, sender=sender,
-        sender_rear=sender_rear, sender_dir=sender_direction, sender_brake=sender_brake,
-        phone=phone,
+        sender_rear=sender_rear, sender_dir=sender_direction, sender_brake=sender_brake, policy=True,
+        phone=phone, uploader=True, wifi=wifi, recorder="files/rides",
         settings_rear=settings_rear, settings_brake=settings_brake, settings_dir=settings_direction,
         settings_general=settings_general,
         is_logging=is_logging, speedometer_class=Speedometer
@@ -210,6 +216,8 @@ async def main():
 
     await asyncio.gather(
         controller.refreshing(),
+        JsonStore.flushing(),
+        wifi.refreshing(),
         memory(3)
     )
 
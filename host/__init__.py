@@ -0,0 +1,10 @@
+""" Host (CPython) implementation of the components, to run and measure the interface without the boards. """
+
+import sys
+
+# The interface uses micropython.const -> Provided on the host
+try:
+    import micropython
+except ImportError:
+    from host import micropython
+    sys.modules["micropython"] = micropython
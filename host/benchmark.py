@@ -0,0 +1,262 @@
+""" **BLE benchmark** of the BikeLight service over the loopback link.
+
+Usage: python -m host.benchmark [--interval 30] [--mtu 23] [--loss 0] [--latency 0] [--changes 30] [--seed 0]
+
+Scenarios
+---------
+- signals:   Brake toggled (front -> back, urgent lane).
+- config:    Rear brightness changed in bursts (front -> back, config lane).
+- flood:     Brake toggled while the back floods the telemetry (batched and rate-limited by its lane).
+- flood_no_lanes: Same flood without priority lanes (every characteristic written at once, like the brake).
+- reconnect: Time to reconnect to the last peer (direct connect and cached handles, GattCache).
+- reconnect_no_cache: Same without the cache (scan, connect and full discovery each time).
+
+Measures
+--------
+- Latency of an update (from set_value on one side to the callback on the other): p50, p90, p99, max.
+- Bytes on air, packets (and lost packets) and writes.
+- Writes per logical change (below 1 when changes are batched / coalesced).
+"""
+
+import host
+
+import argparse
+import asyncio
+
+from interface.features.wireless import BikeLight, BrakeBluetooth, RearBluetooth, ToFrontBluetooth
+from interface.components.ble import TFT_NAME, BLUEFRUIT_NAME
+from host.components.ble import Link, Bluetooth, Service, Characteristic, Information
+
+
+_CONNECTING_TIMEOUT = 10
+
+
+# =========================== #
+#           Measures          #
+# =========================== #
+
+
+def percentile(values: list, ratio: float) -> float:
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(ratio * (len(values) - 1))))]
+
+
+class Probe:
+    """ Latency of the changes of an information: set on one side, received on the other. """
+
+    def __init__(self, sender: Information, receiver: Information):
+        self.sender = sender
+        self.receiver = receiver
+        self.pending: dict = {}
+        self.latencies: list[float] = []
+        self.changes = 0
+        self.receiver.add(funcs=self.received)
+
+    @property
+    def now(self) -> float:
+        return asyncio.get_event_loop().time()
+
+    def send(self, value):
+        self.changes += 1
+        self.pending[value] = self.now
+        self.sender.set_value(value)
+
+    def received(self, value):
+        sent = self.pending.pop(value, None)
+        if sent is not None:
+            self.latencies.append((self.now - sent) * 1000)
+
+    def report(self, writes: int) -> str:
+        return f"p50 {percentile(self.latencies, 0.5):7.1f}ms | p90 {percentile(self.latencies, 0.9):7.1f}ms | " \
+               f"p99 {percentile(self.latencies, 0.99):7.1f}ms | max {max(self.latencies, default=float('nan')):7.1f}ms | " \
+               f"received {len(self.latencies)}/{self.changes} | writes/change {writes / max(1, self.changes):.2f}"
+
+
+# =========================== #
+#            Setup            #
+# =========================== #
+
+
+class Pair:
+    """ Front (peripheral, server) and back (central, client) connected through a link. """
+
+    def __init__(self, link: Link):
+        self.link = link
+        self.front_ble = Bluetooth(link, name=TFT_NAME).set_as_peripheral()
+        self.back_ble = Bluetooth(link, name=BLUEFRUIT_NAME).set_as_central(name=TFT_NAME)
+        self.front = BikeLight(self.front_ble, service=Service, characteristic=Characteristic, information=Information)
+        self.back = BikeLight(self.back_ble, service=Service, characteristic=Characteristic, information=Information)
+        self.tasks = []
+
+    async def start(self):
+        for ble, service in [(self.front_ble, self.front.service), (self.back_ble, self.back.service)]:
+            self.tasks.append(asyncio.create_task(ble.refreshing()))
+            self.tasks.append(asyncio.create_task(service.refreshing()))
+            ble.connect()
+        await self.connected()
+
+    async def connected(self) -> float:
+        start = asyncio.get_event_loop().time()
+        await asyncio.wait_for(self._connected(), _CONNECTING_TIMEOUT)
+        return (asyncio.get_event_loop().time() - start) * 1000
+
+    async def _connected(self):
+        await self.front_ble.ready.wait()
+        await self.back_ble.ready.wait()
+
+    def no_lanes(self):
+        """ Every characteristic written at once (no batching nor rate-limiting). """
+        for light in (self.front, self.back):
+            for characteristic in (light.signals, light.generic, light.bluefruit):
+                characteristic.wait_batch = None
+                characteristic.wait_write = None
+
+    def resume(self, *informations: Information):
+        for information in informations:
+            information.resume()
+
+    async def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+
+
+# =========================== #
+#          Scenarios          #
+# =========================== #
+
+
+async def scenario_signals(link: Link, changes: int) -> str:
+    pair = Pair(link)
+    sender, receiver = BrakeBluetooth(pair.front), BrakeBluetooth(pair.back)
+    pair.resume(sender.activation, receiver.activation)
+    await pair.start()
+    link.reset()
+    probe = Probe(sender.activation, receiver.activation)
+    for i in range(changes):
+        probe.send(i % 2 == 0)
+        await asyncio.sleep(0.2)
+    await asyncio.sleep(0.5)
+    await pair.stop()
+    return probe.report(pair.front.signals.characteristic.writes)
+
+
+async def scenario_config(link: Link, changes: int) -> str:
+    pair = Pair(link)
+    sender, receiver = RearBluetooth(pair.front), RearBluetooth(pair.back)
+    pair.resume(sender.brightness, receiver.brightness)
+    await pair.start()
+    link.reset()
+    probe = Probe(sender.brightness, receiver.brightness)
+    # Bursts of 5 changes (like turning the potentiometer)
+    for i in range(changes):
+        probe.send(10 + i % 90)
+        await asyncio.sleep(0.02 if i % 5 != 4 else 0.5)
+    await asyncio.sleep(1)
+    await pair.stop()
+    return probe.report(pair.front.generic.characteristic.writes)
+
+
+async def scenario_flood(link: Link, changes: int, lanes: bool = True) -> str:
+    pair = Pair(link)
+    if not lanes:
+        pair.no_lanes()
+    sender, receiver = BrakeBluetooth(pair.front), BrakeBluetooth(pair.back)
+    telemetry = ToFrontBluetooth(pair.back)
+    pair.resume(sender.activation, receiver.activation, telemetry.temperature, telemetry.battery,
+                ToFrontBluetooth(pair.front).temperature, ToFrontBluetooth(pair.front).battery)
+    await pair.start()
+
+    async def flooding():
+        value = 0
+        while True:
+            value += 1
+            telemetry.temperature.set_value(value / 10)
+            telemetry.battery.set_value(value % 100)
+            await asyncio.sleep(0.01)
+
+    # Flooding before measuring: the telemetry lane is already writing (or waiting) when the brake changes
+    flood = asyncio.create_task(flooding())
+    await asyncio.sleep(1.5)
+    link.reset()
+    probe = Probe(sender.activation, receiver.activation)
+    for i in range(changes):
+        probe.send(i % 2 == 0)
+        await asyncio.sleep(0.2)
+    await asyncio.sleep(0.5)
+    flood.cancel()
+    await pair.stop()
+    return probe.report(pair.front.signals.characteristic.writes) + \
+        f" | telemetry writes {pair.back.bluefruit.characteristic.writes}"
+
+
+async def scenario_flood_no_lanes(link: Link, changes: int) -> str:
+    return await scenario_flood(link, changes, lanes=False)
+
+
+async def scenario_reconnect(link: Link, changes: int, cache: bool = True) -> str:
+    pair = Pair(link)
+    await pair.start()
+    link.reset()
+    durations = []
+    for _ in range(max(1, changes // 10)):
+        pair.back_ble.disconnect()
+        while pair.back_ble.connected:
+            await asyncio.sleep(0.005)
+        if not cache:
+            pair.back_ble.cache.clear()
+        pair.back_ble.connect()
+        durations.append(await pair.connected())
+    await pair.stop()
+    return f"p50 {percentile(durations, 0.5):7.1f}ms | max {max(durations):7.1f}ms | reconnections {len(durations)}"
+
+
+async def scenario_reconnect_no_cache(link: Link, changes: int) -> str:
+    return await scenario_reconnect(link, changes, cache=False)
+
+
+_SCENARIOS = {
+    "signals": scenario_signals,
+    "config": scenario_config,
+    "flood": scenario_flood,
+    "flood_no_lanes": scenario_flood_no_lanes,
+    "reconnect": scenario_reconnect,
+    "reconnect_no_cache": scenario_reconnect_no_cache,
+}
+
+
+# =========================== #
+#             Main            #
+# =========================== #
+
+
+async def run(interval: int | float = 30, mtu: int = 23, loss: float = 0, latency: int | float = 0,
+              changes: int = 30, seed: int | None = 0, scenarios: list[str] | None = None):
+    for name in scenarios if scenarios else _SCENARIOS.keys():
+        link = Link(interval_ms=interval, mtu=mtu, loss=loss, latency_ms=latency, seed=seed)
+        report = await _SCENARIOS[name](link, changes)
+        print(f"{name:<18} | {report}")
+        print(f"{'':<18} | bytes on air {link.bytes} | packets {link.packets} (lost {link.lost}) | writes {link.writes}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BLE benchmark of the BikeLight service over a loopback link.")
+    parser.add_argument("--interval", type=float, default=30, help="Connection interval (ms).")
+    parser.add_argument("--mtu", type=int, default=23, help="ATT MTU (bytes).")
+    parser.add_argument("--loss", type=float, default=0, help="Packet loss (0 to 1).")
+    parser.add_argument("--latency", type=float, default=0, help="Added latency per write (ms).")
+    parser.add_argument("--changes", type=int, default=30, help="Number of changes per scenario.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the packet loss.")
+    parser.add_argument("scenarios", nargs="*", help=f"Scenarios to run (all by default): {', '.join(_SCENARIOS)}.")
+    args = parser.parse_args()
+    for name in args.scenarios:
+        if name not in _SCENARIOS:
+            parser.error(f"unknown scenario: {name}")
+    print(Link(args.interval, args.mtu, args.loss, args.latency))
+    asyncio.run(run(args.interval, args.mtu, args.loss, args.latency, args.changes, args.seed, args.scenarios))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+""" **Checks** of the interface on the host (behaviours the boards cannot show easily).
+
+Usage: python -m host.checks [names...]
+
+Checks
+------
+- log_buffer: records of a LogManager failing to write (full buffer, rotation) are dropped without breaking the files.
+- log_find: records from start (BinaryLogFile index) include the ones of the same second written before its mark.
+- wifi_backoff: requests waiting for the wifi during a backoff do not add connection attempts.
+- fusion_noise: road vibration (zero mean) does not raise the brake, a braking does within tens of ms.
+"""
+
+import host
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+from interface.components.files import LogManager, LogFile, BinaryLogFile
+from interface.wireless.wifi import Wifi, WifiManager
+from interface.components.fusion import BrakeFusion, IMUBatches
+from interface.operational.special import TriggerComparison
+
+
+# =========================== #
+#             Logs            #
+# =========================== #
+
+
+class FailingLogManager(LogManager):
+    """ LogManager whose writes fail while failing is set (full storage). """
+    failing = False
+
+    def _open(self):
+        if self.failing:
+            raise OSError(28, "No space left on device")
+        super()._open()
+
+
+def check_log_buffer():
+    for file_class in (LogFile, BinaryLogFile):
+        folder = tempfile.mkdtemp()
+        try:
+            manager = FailingLogManager(
+                os.path.join(folder, "logs"), file_class=file_class, buffer_size=64, buffer_max=256, size=100000,
+            )
+            manager.failing = True
+            for i in range(20):
+                manager.log({"time": "2026-01-01T08:00:00", "level": 20, "name": "Check", "message": f"Record {i}"})
+            assert manager.dropped > 0, "no record dropped past buffer_max"
+            # Rotation while the writes fail: the records encoded for the former file are dropped
+            manager.new_file()
+            manager.failing = False
+            for i in range(40):
+                manager.log({"time": "2026-01-01T08:00:01", "level": 20, "name": "Check", "message": f"Record {i}"})
+            manager.close()
+            for file in manager.files:
+                if file.exists:
+                    file.read()
+            assert manager.dropped == 20, f"{manager.dropped} records dropped instead of 20"
+            records = len(list(manager.records()))
+            assert records == 40, f"{records} records read instead of 40 ({file_class.__name__})"
+        finally:
+            shutil.rmtree(folder)
+
+
+def check_log_find():
+    folder = tempfile.mkdtemp()
+    try:
+        file = BinaryLogFile.at("log", folder=folder, every=64)
+        for second in range(3):
+            for i in range(70):
+                file.log({"time": f"2026-01-01T08:00:0{second}", "level": 20, "name": "Check", "message": f"Record {i}"})
+        marks = [moment for moment, _ in file._read_index()[1]]
+        assert marks.count(marks[len(marks) // 2]) > 1, "no second with several marks"
+        for second in range(3):
+            records = len(list(file.records(start=f"2026-01-01T08:00:0{second}")))
+            assert records == 70 * (3 - second), f"{records} records from second {second} instead of {70 * (3 - second)}"
+    finally:
+        shutil.rmtree(folder)
+
+
+# =========================== #
+#             Wifi            #
+# =========================== #
+
+
+class UnreachableWifi(Wifi):
+    """ Wifi never connected (out of range), counting the attempts. """
+    attempts = 0
+
+    @property
+    def connected(self) -> bool:
+        return False
+
+    def _connect(self):
+        self.attempts += 1
+
+
+def check_wifi_backoff():
+    async def checking():
+        station = UnreachableWifi()
+        wifi = WifiManager(UnreachableWifi(), station, timeout=0.1, backoff=1, wait_refresh=0.05)
+        wifi.station()
+        task = asyncio.create_task(wifi.refreshing())
+        # First attempt (about 0.2s) -> backoff of 1s
+        await asyncio.sleep(0.5)
+        attempts = station.attempts
+        for _ in range(10):
+            await wifi.wait_connected(0.02)
+        assert station.attempts == attempts, f"{station.attempts - attempts} attempts while backing off"
+        # Backoff over -> attempted again
+        await asyncio.sleep(1)
+        assert station.attempts > attempts, "no attempt after the backoff"
+        # A change of mode cuts the backoff short
+        attempts = station.attempts
+        wifi.station()
+        await asyncio.sleep(0.05)
+        assert station.attempts > attempts, "backoff not cut short by a change of mode"
+        task.cancel()
+
+    asyncio.run(checking())
+
+
+# =========================== #
+#            Fusion           #
+# =========================== #
+
+
+class FifoIMU:
+    """ IMU whose FIFO holds the samples given (axis 0), fifo_rate frames per second. """
+    fifo_rate = 1125
+
+    def __init__(self):
+        self.frames = []
+
+    def fifo_start(self, gyro: bool = False):
+        ...
+
+    def fifo_stop(self):
+        ...
+
+    def fifo_read(self) -> int:
+        return len(self.frames)
+
+    def fifo_acceleration(self, frame: int, axis: int) -> float:
+        return self.frames[frame] if axis == 0 else 0.0
+
+
+def check_fusion_noise():
+    imu = FifoIMU()
+    batches = IMUBatches(imu)
+    fusion = BrakeFusion(speedometer=None, batches=batches)
+    brake = TriggerComparison(source=fusion, lower=-0.15, operator="<", switch=True, expansion_lower=0.1)
+    noise = random.Random(0)
+    per_batch = int(imu.fifo_rate * batches.wait_refresh)
+
+    def run(seconds: float, mean: float) -> float | None:
+        """ Batches of vibration around mean (m/s²): time (s) at which the brake is raised, None if not. """
+        for i in range(int(seconds / batches.wait_refresh)):
+            imu.frames = [mean + noise.uniform(-2, 2) for _ in range(per_batch)]
+            batches.update()
+            brake.update()
+            if brake.value:
+                return (i + 1) * batches.wait_refresh
+        return None
+
+    raised = run(30, 0)
+    assert raised is None, f"brake raised by the vibration after {raised:.1f}s"
+    raised = run(1, -3)
+    assert raised is not None and raised <= 0.1, f"braking of -3 m/s² raised after {raised}s"
+
+
+_CHECKS = {
+    "log_buffer": check_log_buffer,
+    "log_find": check_log_find,
+    "wifi_backoff": check_wifi_backoff,
+    "fusion_noise": check_fusion_noise,
+}
+
+
+# =========================== #
+#             Main            #
+# =========================== #
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Checks of the interface on the host.")
+    parser.add_argument("names", nargs="*", help=f"Checks to run (all by default): {', '.join(_CHECKS)}.")
+    args = parser.parse_args()
+    failed = 0
+    for name in args.names or _CHECKS.keys():
+        if name not in _CHECKS:
+            parser.error(f"unknown check: {name}")
+        try:
+            _CHECKS[name]()
+            print(f"{name:<14} | ok")
+        except AssertionError as e:
+            failed += 1
+            print(f"{name:<14} | FAILED {e}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+
+import gc
+gc.collect()
+
+import asyncio
+import random
+
+from interface.components import ble as _ble
+
+_SCANNING_DURATION = 2
+_READING_WAIT = 0.05
+_WRITING_WAIT = 0.5
+
+# Bytes on air per packet: preamble (1) + access address (4) + header (2) + L2CAP (4) + ATT (3) + CRC (3)
+_PACKET_OVERHEAD = 17
+_ATT_HEADER = 3
+
+# Connection events of discovery: per service and per characteristic
+_DISCOVERY_SERVICE = 2
+_DISCOVERY_CHARACTERISTIC = 1
+# ATT payload of a discovery response (handles and 128-bit uuid)
+_DISCOVERY_SIZE = 20
+
+
+# =========================== #
+#             Link            #
+# =========================== #
+
+
+class Link:
+    """ **Simulated radio link** between two loopback devices (in the same process).
+
+    - Packets are sent at connection events (each interval_ms), at most per_event packets per event.
+    - Writes larger than the MTU are split in packets.
+    - A lost packet is sent again at the next connection event.
+    - Latency is added once a write is received (processing of the peer).
+    """
+
+    def __init__(self, interval_ms: int | float = 30, mtu: int = 23, loss: float = 0, latency_ms: int | float = 0,
+                 per_event: int = 1, seed: int | None = None):
+        self.interval_ms = interval_ms
+        self.mtu = mtu
+        self.loss = loss
+        self.latency_ms = latency_ms
+        self.per_event = per_event
+        self.random = random.Random(seed)
+
+        # GAP
+        self.advertiser = None
+        self.is_connected = asyncio.Event()
+        self.is_disconnected = asyncio.Event()
+        self.is_disconnected.set()
+
+        # GATT -> (service uuid, characteristic uuid): Attribute
+        self.attributes: dict[tuple, 'Attribute'] = {}
+
+        # Connection events
+        self._anchor = 0
+        self._event = -1
+        self._used = 0
+
+        # Measures
+        self.bytes = 0
+        self.packets = 0
+        self.lost = 0
+        self.writes = 0
+
+    def __repr__(self):
+        return f"<Link {self.interval_ms}ms | MTU {self.mtu} | loss {self.loss:.0%} | latency {self.latency_ms}ms>"
+
+    @property
+    def connected(self) -> bool:
+        return self.is_connected.is_set()
+
+    @property
+    def now(self) -> float:
+        return asyncio.get_event_loop().time()
+
+    def reset(self):
+        """ Reset the measures. """
+        self.bytes = 0
+        self.packets = 0
+        self.lost = 0
+        self.writes = 0
+        for attribute in self.attributes.values():
+            attribute.writes = 0
+
+    """ GAP """
+
+    def connect(self):
+        self._anchor = self.now
+        self._event = -1
+        self.is_disconnected.clear()
+        self.is_connected.set()
+
+    def disconnect(self):
+        self.is_connected.clear()
+        self.is_disconnected.set()
+
+    """ Radio """
+
+    async def event(self):
+        """ Wait for a connection event with room for a packet. """
+        while True:
+            interval = self.interval_ms / 1000
+            elapsed = self.now - self._anchor
+            await asyncio.sleep(interval - elapsed % interval)
+            index = round((self.now - self._anchor) / interval)
+            if index != self._event:
+                self._event = index
+                self._used = 0
+            if self._used < self.per_event:
+                self._used += 1
+                return
+
+    async def exchange(self, size: int = _DISCOVERY_SIZE):
+        """ One packet of a GATT procedure (discovery), counted in the measures. """
+        await self.event()
+        self.packets += 1
+        self.bytes += _PACKET_OVERHEAD + min(self.mtu - _ATT_HEADER, size)
+
+    async def transmit(self, size: int) -> bool:
+        """ Send size bytes of value (one write). Returns False if disconnected meanwhile. """
+        payload = self.mtu - _ATT_HEADER
+        packets = max(1, -(-size // payload))
+        sent = 0
+        while sent < packets:
+            if not self.connected:
+                return False
+            await self.event()
+            self.packets += 1
+            self.bytes += _PACKET_OVERHEAD + min(payload, size - sent * payload)
+            if self.random.random() < self.loss:
+                self.lost += 1
+                continue
+            sent += 1
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        self.writes += 1
+        return True
+
+
+gc.collect()
+
+
+class Attribute:
+    """ A value of the GATT server, written by one side and read by the other. """
+
+    def __init__(self, link: Link, size: int):
+        self.link = link
+        self.size = size
+        self.value = b'\x00' * size
+        self.changed = asyncio.Event()
+        self.writes = 0
+
+    async def read(self) -> bytes:
+        await self.changed.wait()
+        self.changed.clear()
+        return self.value
+
+    async def write(self, value: bytes) -> bool:
+        if not await self.link.transmit(len(value)):
+            return False
+        self.writes += 1
+        self.value = value
+        self.changed.set()
+        return True
+
+
+gc.collect()
+
+
+# =========================== #
+#             GAP             #
+# =========================== #
+
+
+class Device:
+    def __init__(self, name: str | None, address: str | None):
+        self.name = name
+        self.address = address
+
+    def __repr__(self):
+        return f"Loopback({self.address}, {self.name})"
+
+
+gc.collect()
+
+
+class LoopConnection:
+    def __init__(self, link: Link):
+        self.link = link
+
+    @property
+    def connected(self) -> bool:
+        return self.link.connected
+
+
+gc.collect()
+
+
+class BluetoothConnection(_ble.BluetoothConnection):
+    device: Device
+    connection: LoopConnection
+
+
+gc.collect()
+
+
+class Bluetooth(_ble.Bluetooth):
+    """ **Loopback Bluetooth** (host)
+
+    - Two instances sharing a Link: one set as peripheral (advertises), the other as central (scans).
+    - Connection interval, MTU, loss and latency are the ones of the link.
+    """
+
+    connection: BluetoothConnection
+    services: list['Service']
+
+    def __init__(self, link: Link, name: str = _ble.TFT_NAME, address: str | None = None,
+                 connection_interval: int | float = 0.1,
+                 logging_name: str | None = None, is_logging: bool | None = None, style: str | None = None):
+        super().__init__(name=name, connection_interval=connection_interval,
+                         logging_name=logging_name, is_logging=is_logging, style=style)
+        self.link = link
+        self.name = name
+        self.address = address.lower() if isinstance(address, str) else name
+
+        # Set once connected and discovered (on_connected)
+        self.ready = asyncio.Event()
+
+    def on_connected(self):
+        super().on_connected()
+        self.ready.set()
+
+    def on_disconnected(self):
+        self.ready.clear()
+        super().on_disconnected()
+
+    """ GAP: Specific to language """
+
+    async def _advertise(self) -> BluetoothConnection | None:
+        self.link.advertiser = self
+        try:
+            if self.advertising_duration is not None:
+                await asyncio.wait_for(self.link.is_connected.wait(), self.advertising_duration)
+            else:
+                await self.link.is_connected.wait()
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self.link.advertiser = None
+        return BluetoothConnection(Device(None, None)).connect(LoopConnection(self.link))
+
+    async def scan(self):
+        waited = 0
+        while self.link.advertiser is None and waited < _SCANNING_DURATION:
+            await asyncio.sleep(_READING_WAIT)
+            waited += _READING_WAIT
+        advertiser = self.link.advertiser
+        if advertiser is None:
+            return
+        # Received at the next advertising event
+        interval = advertiser.advertising_interval if advertiser.advertising_interval is not None else 25
+        await asyncio.sleep(self.link.random.random() * interval / 1000)
+        await self._scan(BluetoothConnection(Device(advertiser.name, advertiser.address)))
+
+    async def _disconnect(self, connection: BluetoothConnection) -> bool:
+        self.link.disconnect()
+        return True
+
+    async def _connect(self, connection: BluetoothConnection) -> BluetoothConnection | None:
+        if self.link.connected:
+            return None
+        self.link.connect()
+        if self.transmission_interval is not None:
+            self._set_transmission_interval(connection, self.transmission_interval)
+        return connection.connect(LoopConnection(self.link))
+
+    def _set_transmission_interval(self, connection: BluetoothConnection, value: int) -> bool:
+        self.link.interval_ms = value
+        return True
+
+    async def _unconnected(self, connection: BluetoothConnection):
+        await self.link.is_disconnected.wait()
+
+    """ GATT: Specific to language """
+
+    async def _server(self):
+        for service in self.services:
+            service.service = service.uuid
+            for characteristic in service.characteristics:
+                key = (service.uuid, characteristic.uuid)
+                if key not in self.link.attributes:
+                    self.link.attributes[key] = Attribute(self.link, characteristic.size)
+                characteristic.characteristic = self.link.attributes[key]
+
+    async def _client(self, connection: BluetoothConnection):
+        for service in self.services:
+            for _ in range(_DISCOVERY_SERVICE):
+                await self.link.exchange()
+            service.service = service.uuid
+            for characteristic in service.characteristics:
+                for _ in range(_DISCOVERY_CHARACTERISTIC):
+                    await self.link.exchange()
+                characteristic.characteristic = self.link.attributes.get((service.uuid, characteristic.uuid))
+
+    def _handles(self, connection: BluetoothConnection) -> dict:
+        return {(service.uuid, char.uuid): char.characteristic for service in self.services for char in service.characteristics}
+
+    async def _restore(self, connection: BluetoothConnection, handles: dict) -> bool:
+        for service in self.services:
+            for _ in range(_DISCOVERY_SERVICE):
+                await self.link.exchange()
+            service.service = service.uuid
+            for characteristic in service.characteristics:
+                attribute = handles.get((service.uuid, characteristic.uuid))
+                if attribute is None or attribute is not self.link.attributes.get((service.uuid, characteristic.uuid)):
+                    return False
+                characteristic.characteristic = attribute
+        return True
+
+
+gc.collect()
+
+
+# =========================== #
+#             GATT            #
+# =========================== #
+
+
+class Service(_ble.Service):
+    service: str | None
+    bluetooth: Bluetooth
+    characteristics: list['Characteristic']
+
+
+gc.collect()
+
+
+class Characteristic(_ble.Characteristic):
+    service: Service
+    characteristic: Attribute | None
+
+    async def _read(self) -> bytes:
+        if self.characteristic is not None:
+            return await self.characteristic.read()
+        await asyncio.sleep(_READING_WAIT)
+        return b''
+
+    async def _write(self) -> bool:
+        if self.characteristic is not None:
+            return await self.characteristic.write(self.encode(self.value))
+        await asyncio.sleep(_WRITING_WAIT)
+        return False
+
+
+gc.collect()
+
+
+class Information(_ble.Information):
+    characteristic: Characteristic
+
+
+gc.collect()
@@ -0,0 +1,45 @@
+""" **Binary logs** (BinaryLogFile) converted back to JSON on the host.
+
+Usage: python -m host.logs log.bin [more.bin log.bin.z log.txt.z] [-o out.json] [--start 2024-01-01T08:00:00] [--end ...]
+
+- A single file: written to out.json (or printed).
+- Several files (rotated logs of a LogManager): merged in order.
+- start / end use the sparse index of each file: only the part of the file after the mark is read.
+- Archives (.z, compressed by the LogManager) are decompressed on the fly.
+"""
+
+import host
+
+import argparse
+import json
+
+from interface.components.files import BinaryLogFile, LogArchive
+
+
+def convert(paths: list[str], start: str | None = None, end: str | None = None) -> list[dict]:
+    records = []
+    for path in paths:
+        file = LogArchive(path) if path.endswith("." + LogArchive.extension) else BinaryLogFile(path)
+        records.extend(file.records(start=start, end=end))
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert binary logs (BinaryLogFile) back to JSON.")
+    parser.add_argument("paths", nargs="+", help="Binary logs (.bin) or archives (.z), in order.")
+    parser.add_argument("-o", "--output", default=None, help="JSON file (printed if not given).")
+    parser.add_argument("--start", default=None, help="Only records from this time (YYYY-MM-DDTHH:MM:SS).")
+    parser.add_argument("--end", default=None, help="Only records until this time (YYYY-MM-DDTHH:MM:SS).")
+    parser.add_argument("--indent", type=int, default=None, help="Indentation of the JSON.")
+    args = parser.parse_args()
+    records = convert(args.paths, args.start, args.end)
+    if args.output is None:
+        print(json.dumps(records, indent=args.indent))
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(records, f, indent=args.indent)
+        print(f"{len(records)} records -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
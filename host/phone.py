@@ -0,0 +1,133 @@
+""" **Stand-in phone server** (host) for the PhoneAPI and the asynchronous HTTP client.
+
+Usage: python -m host.phone [--host 0.0.0.0] [--port 8000] [--delay 0] [--data data.json]
+
+Routes
+------
+- GET  /           -> JSON of the data (settings: rear, direction, brake, general, creds / wifi, records),
+                      with ETag and Last-Modified (304 Not Modified when If-None-Match matches).
+- PUT  /           -> Merge the JSON body into the data.
+- POST /telemetry  -> Append the JSON body (list of blocks) to the telemetry.
+- GET  /telemetry  -> JSON of the telemetry received.
+
+delay (seconds) is added before each response (slow network).
+Connections are kept alive (HTTP/1.1) unless the request asks to close them (or is HTTP/1.0).
+"""
+
+import host
+
+import argparse
+import asyncio
+import json
+import time
+import zlib
+
+
+class PhoneServer:
+    def __init__(self, data: dict | None = None, delay: float = 0):
+        self.data = {} if data is None else data
+        self.telemetry: list = []
+        self.delay = delay
+        self.requests = 0
+        self.connections = 0
+        self.server = None
+        self.modified = time.time()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8000) -> 'PhoneServer':
+        self.server = await asyncio.start_server(self.handle, host, port)
+        return self
+
+    @property
+    def port(self) -> int:
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    @property
+    def etag(self) -> str:
+        return '"{:08x}"'.format(zlib.crc32(json.dumps(self.data, sort_keys=True).encode()))
+
+    @property
+    def last_modified(self) -> str:
+        return time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(self.modified))
+
+    def route(self, method: str, path: str, body: bytes, headers: dict[str, str] | None = None) -> tuple[int, object]:
+        headers = {} if headers is None else headers
+        if path == "/" and method == "GET":
+            if headers.get("if-none-match") == self.etag or \
+                    "if-none-match" not in headers and headers.get("if-modified-since") == self.last_modified:
+                return 304, None
+            return 200, self.data
+        if path == "/" and method == "PUT":
+            self.data.update(json.loads(body))
+            self.modified = time.time()
+            return 200, {}
+        if path == "/telemetry" and method == "POST":
+            blocks = json.loads(body)
+            self.telemetry.extend(blocks if isinstance(blocks, list) else [blocks])
+            return 200, {}
+        if path == "/telemetry" and method == "GET":
+            return 200, self.telemetry
+        return 404, {"error": f"{method} {path}"}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                method, target, version = line.decode().strip().split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if not line or line == b"\r\n":
+                        break
+                    key, _, value = line.decode().partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.requests += 1
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                path = target.split("?", 1)[0]
+                status, data = self.route(method, path, body, headers)
+                content = b"" if data is None else json.dumps(data).encode()
+                extra = f"ETag: {self.etag}\r\nLast-Modified: {self.last_modified}\r\n" if path == "/" and method == "GET" else ""
+                reason = {200: "OK", 304: "Not Modified"}.get(status, "Not Found")
+                alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                writer.write(f"HTTP/1.1 {status} {reason}\r\n{extra}Connection: {'keep-alive' if alive else 'close'}\r\n"
+                             f"Content-Type: application/json\r\nContent-Length: {len(content)}\r\n\r\n".encode() + content)
+                await writer.drain()
+                if not alive:
+                    break
+        except (ValueError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host: str, port: int, delay: float, data: dict | None):
+    server = await PhoneServer(data, delay).start(host, port)
+    print(f"Phone server on {host}:{server.port}")
+    async with server.server:
+        await server.server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in phone server for the PhoneAPI.")
+    parser.add_argument("--host", default="0.0.0.0", help="Address to listen on.")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on.")
+    parser.add_argument("--delay", type=float, default=0, help="Delay before each response (s).")
+    parser.add_argument("--data", default=None, help="JSON file of the initial data.")
+    args = parser.parse_args()
+    data = None
+    if args.data is not None:
+        with open(args.data, encoding="utf-8") as f:
+            data = json.load(f)
+    asyncio.run(serve(args.host, args.port, args.delay, data))
+
+
+if __name__ == "__main__":
+    main()
@@ -59,6 +59,39 @@ def date_formatter(year: int, month: int, day: int, unit: int = 0, crop: bool =
 
 gc.collect()
 
+# ISO <-> Seconds (since 2000-01-01, same on the boards and the host)
+
+def _days_from_civil(year: int, month: int, day: int) -> int:
+    year -= month <= 2
+    era = year // 400
+    yoe = year - era * 400
+    doy = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    return era * 146097 + yoe * 365 + yoe // 4 - yoe // 100 + doy - 730425
+
+def _civil_from_days(days: int) -> tuple[int, int, int]:
+    days += 730425
+    era = days // 146097
+    doe = days - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = mp + (3 if mp < 10 else -9)
+    return yoe + era * 400 + (month <= 2), month, day
+
+def iso_to_seconds(value: str) -> int:
+    """ Convert "YYYY-MM-DDTHH:MM:SS" to seconds since 2000-01-01T00:00:00. """
+    days = _days_from_civil(int(value[0:4]), int(value[5:7]), int(value[8:10]))
+    return days * 86400 + int(value[11:13]) * 3600 + int(value[14:16]) * 60 + int(value[17:19])
+
+def seconds_to_iso(value: int) -> str:
+    """ Convert seconds since 2000-01-01T00:00:00 to "YYYY-MM-DDTHH:MM:SS". """
+    days, value = divmod(int(value), 86400)
+    return "{:04d}-{:02d}-{:02d}T{:02d}:{:02d}:{:02d}".format(
+        *_civil_from_days(days), value // 3600, value % 3600 // 60, value % 60)
+
+gc.collect()
+
 # =========================== #
 #         Speedometer         #
 # =========================== #
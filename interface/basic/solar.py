@@ -0,0 +1,84 @@
+
+import gc
+gc.collect()
+
+import math
+
+# =========================== #
+#     Sunrise and Sunset      #
+# =========================== #
+
+# NOAA general solar position (fractional year), accurate to about a minute between the polar circles.
+
+ZENITH = 90.833  # Sun centre below the horizon at sunrise/sunset (refraction + radius), in degrees
+
+
+def day_of_year(year: int, month: int, day: int) -> int:
+    leap = year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+    return (275 * month) // 9 - (1 + (not leap)) * ((month + 9) // 12) + day - 30
+
+
+def sun_times(year: int, month: int, day: int, latitude: float, longitude: float, offset: float = 0,
+              zenith: float = ZENITH) -> tuple[float, float]:
+    """ (sunrise, sunset) in local hours (UTC + offset): (0, 24) when the sun does not set, (12, 12) when it does not rise. """
+    gamma = 2 * math.pi / 365 * (day_of_year(year, month, day) - 1)
+    equation = 229.18 * (0.000075 + 0.001868 * math.cos(gamma) - 0.032077 * math.sin(gamma)
+                         - 0.014615 * math.cos(2 * gamma) - 0.040849 * math.sin(2 * gamma))
+    declination = (0.006918 - 0.399912 * math.cos(gamma) + 0.070257 * math.sin(gamma)
+                   - 0.006758 * math.cos(2 * gamma) + 0.000907 * math.sin(2 * gamma)
+                   - 0.002697 * math.cos(3 * gamma) + 0.00148 * math.sin(3 * gamma))
+    latitude = math.radians(latitude)
+    cos_angle = math.cos(math.radians(zenith)) / (math.cos(latitude) * math.cos(declination)) \
+        - math.tan(latitude) * math.tan(declination)
+    if cos_angle < -1:
+        return 0, 24
+    if cos_angle > 1:
+        return 12, 12
+    angle = math.degrees(math.acos(cos_angle))
+    noon = 720 - 4 * longitude - equation  # Minutes (UTC)
+    return ((noon - 4 * angle) / 60 + offset) % 24, ((noon + 4 * angle) / 60 + offset) % 24
+
+
+gc.collect()
+
+
+class Sun:
+    """ Sunrise and sunset at a place (latitude, longitude, offset to UTC in hours), memoised for the day. """
+
+    def __init__(self, latitude: float, longitude: float, offset: float = 0, zenith: float = ZENITH):
+        self.latitude = latitude
+        self.longitude = longitude
+        self.offset = offset
+        self.zenith = zenith
+        self._day = None
+        self._times = (12, 12)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.latitude}, {self.longitude}, UTC{self.offset:+})"
+
+    def locate(self, latitude: float | None, longitude: float | None, offset: float | None = None):
+        """ New place (ignored when unknown). """
+        if latitude is None or longitude is None:
+            return
+        self.latitude, self.longitude = latitude, longitude
+        if offset is not None:
+            self.offset = offset
+        self._day = None
+
+    def times(self, year: int, month: int, day: int, dst: int = 0) -> tuple[float, float]:
+        """ (sunrise, sunset) in local hours (+1 with daylight saving). """
+        if self._day != (year, month, day, dst):
+            self._day = (year, month, day, dst)
+            self._times = sun_times(year, month, day, self.latitude, self.longitude, self.offset + dst, self.zenith)
+        return self._times
+
+    @property
+    def sunrise(self) -> float:
+        return self._times[0]
+
+    @property
+    def sunset(self) -> float:
+        return self._times[1]
+
+
+gc.collect()
@@ -63,6 +63,15 @@ def time_formatter(value: float, unit: str = "h") -> str:
     return text
 
 
+""" Tasks """
+
+def schedule(result):
+    """ Run result in the background if it is a coroutine (callbacks can be sync or async). """
+    if result is not None and hasattr(result, "send"):
+        return asyncio.create_task(result)
+    return result
+
+
 """ Memory """
 
 async def clean(wait: int | float = 3):
@@ -0,0 +1,188 @@
+
+import gc
+gc.collect()
+
+from interface.basic.utils import rounder
+from interface.operational.triggers import Action
+
+
+# =========================== #
+#          Analytics          #
+# =========================== #
+
+
+class Analytics(Action):
+    """ **Ride analytics** fed by the Speedometer at each revolution (O(1), no history kept).
+
+    - Auto-pause: moving while the speed is at least pause_speed (m/s), the time below it is paused time.
+    - Moving time and moving distance -> average moving speed.
+    - Segments: split each `split` meters (or lap()): count, last and best durations (s) and speeds.
+    - Records: max_speed, odometer and total_duration written to the GeneralSettings when pausing and on reset.
+    - Callbacks (funcs...) are called with moving (bool) when it changes.
+
+    Same fixed point as the Speedometer: ms, mm/s and mm, converted at presentation.
+    """
+
+    def __init__(self, source, settings=None,
+                 auto_pause: bool = True, pause_speed: float = 1.5, split: float = 1000,
+                 funcs=None, events=None, coroutines=None, event_loop=None,
+                 name: str = None, is_logging: bool = None, style: str = None):
+        """
+
+        Args:
+            source ():
+                The Speedometer feeding the analytics.
+            settings ():
+                The GeneralSettings where the records are saved (max_speed, odometer, total_duration).
+            auto_pause ():
+                Whether the time under pause_speed is paused (otherwise always moving once started).
+            pause_speed ():
+                The speed in m/s under which the ride is paused.
+            split ():
+                The distance of a segment in meters (0 for laps only).
+        """
+        self.source = source
+        self.settings = settings
+        self.auto_pause = auto_pause
+        self.pause_speed = int(pause_speed * 1000)  # mm/s
+        self.split = int(split * 1000)              # mm
+
+        # State
+        self.moving = False
+        self.pauses = 0
+        self._time_last = None
+        self._speed_last = 0
+
+        # Moving (ms, mm)
+        self._moving_time = 0
+        self._moving_distance = 0
+
+        # Segments (ms, mm)
+        self.segments = 0
+        self._segment_time = 0
+        self._segment_distance = 0
+        self._last_time = 0
+        self._last_distance = 0
+        self._best_speed = 0
+
+        super().__init__(
+            funcs=funcs, events=events, coroutines=coroutines, event_loop=event_loop,
+            name=name, is_logging=is_logging, style=style,
+        )
+        source.analytics = self
+
+    # Feeding (Speedometer)
+
+    def revolution(self, speed: int):
+        """ New speed (mm/s): the time since the last one is moving time (at the former speed) when moving. """
+        now = self.source.ticks()
+        if self._time_last is not None and self.moving:
+            elapsed = self.source.ticks_diff(now, self._time_last)
+            step = self._speed_last * elapsed // 1000
+            self._moving_time += elapsed
+            self._moving_distance += step
+            self._segment_time += elapsed
+            self._segment_distance += step
+            if 0 < self.split <= self._segment_distance:
+                self._segment_distance -= self.split
+                self.close_segment(self.split)
+        self._time_last = now
+        self._speed_last = speed
+        self.set_moving(speed >= self.pause_speed or (not self.auto_pause and speed > 0))
+
+    def stop(self):
+        """ Speed back to 0. """
+        self.revolution(0)
+        self._time_last = None
+
+    def set_moving(self, value: bool):
+        if value == self.moving:
+            return
+        self.moving = value
+        if not value:
+            self.pauses += 1
+            self.logging(f"Paused after {self.moving_time}s moving", level="DEBUG")
+            self.save()
+        self.callback(value)
+
+    # Segments
+
+    def close_segment(self, distance: int):
+        """ Segment of distance (mm) done in the current segment time. """
+        if self._segment_time <= 0:
+            return
+        self.segments += 1
+        self._last_time = self._segment_time
+        self._last_distance = distance
+        speed = distance * 1000 // self._segment_time
+        if speed > self._best_speed:
+            self._best_speed = speed
+        self._segment_time = 0
+        self.logging(f"Segment {self.segments}: {self.last_segment_time}s", level="INFO")
+
+    def lap(self, _=None):
+        """ Close the current segment (manual lap). """
+        self.close_segment(self._segment_distance)
+        self._segment_distance = 0
+
+    # Records
+
+    def save(self):
+        """ Records of the speedometer into the settings (and their file). """
+        if self.settings is None:
+            return
+        self.settings.max_speed = self.source.max_speed
+        self.settings.odometer = self.source.odometer
+        self.settings.total_duration = self.source.total_duration
+        self.settings.save()
+
+    def reset(self):
+        """ New trip: records saved, trip of the speedometer added to them and analytics cleared. """
+        self.source.reset()
+        self.save()
+        self.moving = False
+        self.pauses = 0
+        self._time_last = None
+        self._speed_last = 0
+        self._moving_time = 0
+        self._moving_distance = 0
+        self.segments = 0
+        self._segment_time = 0
+        self._segment_distance = 0
+        self._last_time = 0
+        self._last_distance = 0
+        self._best_speed = 0
+
+    # Presentation (unit of the speedometer)
+
+    def _speed(self, value: int) -> float:
+        unit = self.source.unit
+        return rounder(value * (0.0036 / 1.609 if unit == 2 else 0.0036 if unit == 1 else 0.001), self.source.rounding)
+
+    @property
+    def moving_time(self) -> int:
+        return self._moving_time // 1000
+
+    @property
+    def paused_time(self) -> int:
+        return max(0, self.source.duration - self.moving_time)
+
+    @property
+    def average(self) -> float:
+        """ Average moving speed. """
+        return self._speed(self._moving_distance * 1000 // self._moving_time if self._moving_time > 0 else 0)
+
+    @property
+    def last_segment_time(self) -> int:
+        return self._last_time // 1000
+
+    @property
+    def last_segment_speed(self) -> float:
+        return self._speed(self._last_distance * 1000 // self._last_time if self._last_time > 0 else 0)
+
+    @property
+    def best_segment_speed(self) -> float:
+        return self._speed(self._best_speed)
+
+
+gc.collect()
@@ -2,6 +2,7 @@
 # Built-in
 import gc
 gc.collect()
+import time
 import asyncio
 from micropython import const
 
@@ -75,6 +76,20 @@ class BluetoothConnection:
 gc.collect()
 
 
+class GattCache:
+    """ Handles discovered on a peer, reused when reconnecting to it. """
+    def __init__(self, peer: BluetoothConnection, signature: tuple, handles):
+        self.peer = peer
+        self.signature = signature
+        self.handles = handles
+
+    def __repr__(self):
+        return f"<GattCache of '{self.peer.address}'>"
+
+
+gc.collect()
+
+
 class Bluetooth:
 
     def __init__(self, name: str | None = None, connection_interval: int | float = 1,
@@ -94,12 +109,22 @@ class Bluetooth:
         self.is_disconnecting = asyncio.Event()
         self.connection_interval: int | float = connection_interval
 
+        # GAP -> Radio: transmission interval (ms), advertising interval (ms) and duration (s) -> None for default
+        self.transmission_interval: int | None = None
+        self.advertising_interval: int | None = None
+        self.advertising_duration: int | float | None = None
+        self.last_connected = time.time()
+
         # Connected events
         self.status = asyncio.Event()
 
         # GATT
         self.services: list['Service'] = []
 
+        # GATT -> Handles cached per peer address (client)
+        self.cache: dict[str, GattCache] = {}
+        self.last: str | None = None
+
     async def _errors(self, context: str, obj, wait: int | float, func, *args, **kwargs):
         try:
             self.logging(f"{context} {obj}")
@@ -153,6 +178,20 @@ class Bluetooth:
         self.gap = 0
         return self
 
+    def set_transmission_interval(self, value: int | None):
+        """ Request a transmission interval (ms) now if connected, and for the next connections. """
+        if value == self.transmission_interval:
+            return
+        self.transmission_interval = value
+        if value is not None and self.connected:
+            try:
+                if self._set_transmission_interval(self.connection, value):
+                    self.logging(f"Transmission interval: {value}ms", "INFO")
+                else:
+                    self.logging(f"Transmission interval: {value}ms cannot be requested by this device", "WARNING")
+            except Exception as e:
+                self.logging(f"Error while setting transmission interval: {e}", "ERROR")
+
     """ GAP: Properties and async """
 
     @property
@@ -167,6 +206,11 @@ class Bluetooth:
     def central(self) -> bool:
         return self.gap == 2
 
+    @property
+    def signature(self) -> tuple:
+        """ The uuids of the services and characteristics, a cache made with other definitions is not valid. """
+        return tuple((service.uuid, tuple(char.uuid for char in service.characteristics)) for service in self.services)
+
     async def connecting(self):
         while True:
             await self.is_connecting.wait()
@@ -176,7 +220,8 @@ class Bluetooth:
                     self.on_disconnected()
                 # Connect as central or peripheral
                 if self.central:
-                    await self._errors("Scanning for", self.target, _CONNECTING_ERROR_WAIT, self.scan)
+                    if not await self.reconnect():
+                        await self._errors("Scanning for", self.target, _CONNECTING_ERROR_WAIT, self.scan)
                 elif self.peripheral:
                     await self._errors("Advertising for", self.target, _CONNECTING_ERROR_WAIT, self.advertise)
             # Wait for a disconnection
@@ -198,6 +243,7 @@ class Bluetooth:
     def on_disconnected(self):
         self.logging(f"Disconnected from {self.connection}")
         self.connection = None
+        self.last_connected = time.time()
         for service in self.services:
             for characteristic in service.characteristics:
                 characteristic.set_activation_bluetooth(False)
@@ -205,6 +251,8 @@ class Bluetooth:
 
     def on_connected(self):
         self.logging(f"Connected to {self.connection}")
+        self.last = self.connection.address
+        self.last_connected = time.time()
         for service in self.services:
             for characteristic in service.characteristics:
                 characteristic.set_activation_bluetooth(True)
@@ -220,8 +268,13 @@ class Bluetooth:
 
     async def advertise(self):
         """ Advertise once, waits for connection to be established by a central."""
-        await self.server()
+        # Registered once (advertising is repeated when its duration ends)
+        if any(service.service is None for service in self.services):
+            await self.server()
         connection = await self._advertise()
+        # Advertising duration ended without connection
+        if connection is None:
+            return
         if not self._check(connection):
             await self._disconnect(connection)
         else:
@@ -236,10 +289,25 @@ class Bluetooth:
             if connection is not None:
                 self.connection = connection
                 await self.client(connection)
-                self.on_connected()
+                # Not disconnected while discovering
+                if self.connected:
+                    self.on_connected()
             return True
         return False
 
+    async def reconnect(self) -> bool:
+        """ Connect directly to the last peer (without scanning) if its handles are cached.
+        If it fails, the peer and its handles are forgotten (scanning again). """
+        cached = self.cache.get(self.last) if self.last is not None else None
+        if cached is None:
+            return False
+        await self._scan(cached.peer.__class__(cached.peer.device))
+        if not self.connected:
+            self.logging(f"Last peer {self.last} not reached, scanning", "WARNING")
+            self.cache.pop(self.last, None)
+            self.last = None
+        return self.connected
+
     """ GATT: Server / Client """
 
     async def server(self):
@@ -247,8 +315,19 @@ class Bluetooth:
         await self._server()
 
     async def client(self, connection: BluetoothConnection):
-        """ Set the service.service and characteristic.characteristic objects from the connection. """
+        """ Set the service.service and characteristic.characteristic objects from the connection.
+        Uses the handles cached for this peer if still valid, otherwise discovers them and caches them. """
+        address = connection.address
+        cached = self.cache.pop(address, None)
+        if cached is not None and cached.signature == self.signature:
+            if await self._errors("Restoring handles of", connection, 0, self._restore, connection, cached.handles):
+                self.cache[address] = cached
+                return
+            self.logging(f"Cached handles of {connection} are not valid, discovering again", "WARNING")
         await self._client(connection)
+        handles = self._handles(connection)
+        if handles is not None:
+            self.cache[address] = GattCache(connection, self.signature, handles)
 
     """ GAP: Specific to language """
 
@@ -268,6 +347,10 @@ class Bluetooth:
         """ Connect to device (gives a connection object). """
         ...
 
+    def _set_transmission_interval(self, connection: BluetoothConnection, value: int) -> bool:
+        """ Request a transmission (connection) interval in ms to the connection, False if it cannot be requested. """
+        return False
+
     async def _unconnected(self, connection: BluetoothConnection):
         """ Wait for connection to be disconnected. """
         ...
@@ -280,6 +363,14 @@ class Bluetooth:
     async def _client(self, connection: BluetoothConnection):
         ...
 
+    def _handles(self, connection: BluetoothConnection):
+        """ Handles to cache after discovering (None to not cache). """
+        return None
+
+    async def _restore(self, connection: BluetoothConnection, handles) -> bool:
+        """ Set the service.service and characteristic.characteristic objects from cached handles if valid. """
+        return False
+
 
 gc.collect()
 
@@ -318,6 +409,7 @@ class Characteristic(Refresher):
                  name: str = None, is_logging: bool = None, style: str = None,
                  funcs=None, events=None, coroutines=None, event_loop=None,
                  wait_refresh: int | float = 5, wait_change: int | float = None, check_value: bool = True,
+                 wait_batch: int | float | None = None, wait_write: int | float | None = None,
                  initially_active: bool = False,
                  **kwargs):
 
@@ -338,9 +430,14 @@ class Characteristic(Refresher):
         if (not self.service.bluetooth.peripheral and self.flag_write) or (self.service.bluetooth.peripheral and self.flag_read):
             self.is_writing = asyncio.Event()
 
+        # Writing lane: wait before writing (batching) and after writing (rate-limiting)
+        self.wait_batch = wait_batch
+        self.wait_write = wait_write
+
         # Active
         self.char_is_active = initially_active
         self.active_based_on_information = wait_refresh is not None
+        self.active_informations = 0
 
         # Information
         self.informations = []
@@ -429,16 +526,6 @@ class Characteristic(Refresher):
 
     """ Refresher """
 
-    async def checking(self):
-        while True:
-            if all([not info.is_active for info in self.informations]):
-                if self.is_active:
-                    self.pause()
-            else:
-                if not self.is_active:
-                    self.resume()
-            await asyncio.sleep(self.wait_refresh)
-
     async def reading(self):
         while True:
             if hasattr(self, "active"):
@@ -456,12 +543,20 @@ class Characteristic(Refresher):
             if hasattr(self, "active"):
                 await self.active.wait()
             await self.is_writing.wait()
+            # Batching -> Changes made while waiting are sent in the same write
+            if self.wait_batch is not None:
+                await asyncio.sleep(self.wait_batch)
             if self.is_active:
+                # Cleared before writing so that a change made during the write is sent afterwards
+                self.is_writing.clear()
                 res = await self.write()
                 if res:
                     self.update()
-                    self.is_writing.clear()
+                    # Rate-limiting -> Changes made while waiting are coalesced into the next write
+                    if self.wait_write is not None:
+                        await asyncio.sleep(self.wait_write)
                 else:
+                    self.is_writing.set()
                     await asyncio.sleep(_WRITING_ERROR_WAIT)  # To avoid blocking when disconnection which causes an error
 
     async def refreshing(self):
@@ -476,8 +571,6 @@ class Characteristic(Refresher):
             tasks.append(asyncio.create_task(self.reading()))
         if write:
             tasks.append(asyncio.create_task(self.writing()))
-        if self.active_based_on_information:
-            tasks.append(asyncio.create_task(self.checking()))
 
         await asyncio.gather(*tasks)
 
@@ -505,6 +598,21 @@ class Characteristic(Refresher):
                 self.active.clear()
             for information in self.informations:
                 information.set_activation_bluetooth(value)
+            # No information active -> Nothing to exchange
+            if value and self.active_based_on_information and len(self.informations) > 0 and self.active_informations == 0:
+                self.pause()
+
+    def on_information_resumed(self):
+        """ An information became active -> Resume when it is the first one. """
+        self.active_informations += 1
+        if self.active_informations == 1 and self.active_based_on_information and not self.is_active:
+            self.resume()
+
+    def on_information_paused(self):
+        """ An information became inactive -> Pause when it was the last one. """
+        self.active_informations = max(0, self.active_informations - 1)
+        if self.active_informations == 0 and self.active_based_on_information and self.is_active:
+            self.pause()
 
     def set_activation(self, value: bool):
         if value:
@@ -610,12 +718,18 @@ class Information(Refresher):
 
     def pause(self):
         self.char_is_active = False
+        was_active = self.is_active
         super().pause()
+        if was_active:
+            self.characteristic.on_information_paused()
 
     def resume(self):
         self.char_is_active = True
         if self.characteristic.service.bluetooth.connected:
+            was_active = self.is_active
             super().resume()
+            if not was_active:
+                self.characteristic.on_information_resumed()
 
 
 gc.collect()
@@ -92,6 +92,18 @@ class BluetoothConnection:
         ...
 
 
+class GattCache:
+    peer: BluetoothConnection
+    signature: tuple
+    handles: Any
+
+    def __init__(self, peer: BluetoothConnection, signature: tuple, handles: Any):
+        ...
+
+    def __repr__(self) -> str:
+        ...
+
+
 class Bluetooth:
     """ **Bluetooth Interface**
 
@@ -115,6 +127,19 @@ class Bluetooth:
     - This should be done before advertising...
     - Then use the characteristics to read, write, notify, indicate...
 
+    Reconnection
+    ------------
+    - As a client, the handles discovered on a peer are cached per address (and per services definitions).
+    - On reconnection, the last peer is connected to directly (without scanning) and its handles are restored.
+    - If the handles are not valid any more, a full discovery is made again.
+    - If the last peer is not reached, it is forgotten with its handles and the target is scanned for again.
+
+    Radio
+    -----
+    - Use set_transmission_interval() to request a transmission interval (ms), None for the default.
+    - Set advertising_interval (ms) and advertising_duration (s) to change how advertising is made, None for the default.
+    - last_connected is the time of the last connection or disconnection.
+
     """
 
     logging: Logging
@@ -124,12 +149,19 @@ class Bluetooth:
     is_connecting: asyncio.Event
     is_disconnecting: asyncio.Event
     connection_interval: int | float
+    transmission_interval: Optional[int]
+    advertising_interval: Optional[int]
+    advertising_duration: Optional[int | float]
+    last_connected: int | float
     services: list[Service]
     status: asyncio.Event
+    cache: dict[str, GattCache]
+    last: Optional[str]
 
     connected: bool
     peripheral: bool
     central: bool
+    signature: tuple
 
     def __init__(self, name: str | None = None, connection_interval: int | float = 1,
                  logging_name: str | None = None, is_logging: bool | None = None, style: str | None = None):
@@ -163,6 +195,10 @@ class Bluetooth:
     def reset(self) -> 'Bluetooth':
         ...
 
+    def set_transmission_interval(self, value: Optional[int]):
+        """ Request a transmission interval (ms) now if connected, and for the next connections. """
+        ...
+
     """ GAP: Properties and async """
 
     async def connecting(self):
@@ -190,6 +226,11 @@ class Bluetooth:
         """ Scans for devices with specific name/mac address/services. """
         ...
 
+    async def reconnect(self) -> bool:
+        """ Connect directly to the last peer (without scanning) if its handles are cached.
+        If it fails, the peer and its handles are forgotten (scanning again). """
+        ...
+
     """ GATT: Server / Client """
 
     async def server(self):
@@ -218,6 +259,10 @@ class Bluetooth:
         """ Connect to device (gives a connection object). """
         ...
 
+    def _set_transmission_interval(self, connection: BluetoothConnection, value: int) -> bool:
+        """ Request a transmission (connection) interval in ms to the connection, False if it cannot be requested. """
+        ...
+
     async def _unconnected(self, connection: BluetoothConnection):
         """ Wait for connection to be disconnected. """
         ...
@@ -230,6 +275,14 @@ class Bluetooth:
     async def _client(self, connection: BluetoothConnection):
         ...
 
+    def _handles(self, connection: BluetoothConnection) -> Any:
+        """ Handles to cache after discovering (None to not cache). """
+        ...
+
+    async def _restore(self, connection: BluetoothConnection, handles: Any) -> bool:
+        """ Set the service.service and characteristic.characteristic objects from cached handles if valid. """
+        ...
+
 
 # =========================== #
 #             GATT            #
@@ -308,8 +361,11 @@ class Characteristic(Refresher):
     flag_write: bool
     flag_read: bool
     is_writing: asyncio.Event
+    wait_batch: Optional[int | float]
+    wait_write: Optional[int | float]
     char_is_active: bool
     active_based_on_information: bool
+    active_informations: int
     informations: list[Information]
     encoder: Optional[Encoder | ArrayEncoder]
     change: asyncio.Event
@@ -332,6 +388,8 @@ class Characteristic(Refresher):
                  style: Optional[str] = None,
                  wait_change: Optional[int | float] = None,
                  check_value: bool = True,
+                 wait_batch: Optional[int | float] = None,
+                 wait_write: Optional[int | float] = None,
                  initially_active: bool = False,
                  wait_refresh: int | float = 5,
                  **kwargs):
@@ -368,8 +426,14 @@ class Characteristic(Refresher):
                 The (optional) time to wait after a change.
             check_value ():
                 Whether to check if the value is different to last or not.
+            wait_batch (Optional[int | float]):
+                The (optional) time to wait before writing, changes made in the meantime are sent in the same write.
+            wait_write (Optional[int | float]):
+                The (optional) minimum time between two writes, changes made in the meantime are coalesced.
             active ():
                 Whether the characteristic is active or not. This will not mean that the refreshing is run if the connection is not on.
+            wait_refresh (Optional[int | float]):
+                If not None, the characteristic is paused / resumed when none / one of its informations is active.
             **kwargs ():
         """
         ...
@@ -408,9 +472,6 @@ class Characteristic(Refresher):
 
     """ Refresher """
 
-    async def checking(self):
-        ...
-
     async def reading(self):
         ...
 
@@ -446,6 +507,14 @@ class Characteristic(Refresher):
     def set_activation_bluetooth(self, value: bool):
         ...
 
+    def on_information_resumed(self):
+        """ An information became active -> Resume when it is the first one. """
+        ...
+
+    def on_information_paused(self):
+        """ An information became inactive -> Pause when it was the last one. """
+        ...
+
     def add(self,
             funcs: InfActionFuncsArg = None,
             events: Optional[ActionEvents] = None,
@@ -78,15 +78,15 @@ class Clock:
         if initialise_from_rtc and rtc is not None:
             self.initialise_from_rtc()
         elif initialise_from_api and api is not None:
-            self.initialise_from_api()
+            asyncio.create_task(self.initialise_from_api())
 
     # Initialisation and datetime
 
     def initialise_from_rtc(self):
         self.datetime = self.rtc.datetime
 
-    def initialise_from_api(self):
-        self.api.make_date_from_ip()
+    async def initialise_from_api(self):
+        await self.api.make_date_from_ip()
         self.datetime = self.api.datetime
 
     @property
@@ -6,9 +6,23 @@ gc.collect()
 import os
 import json
 import time
+import struct
+import asyncio
 
+from micropython import const
 
-from interface.basic.logger import Logging
+# Compression of the archived logs: deflate (MicroPython) or zlib (CPython, CircuitPython)
+try:
+    import deflate
+except ImportError:
+    deflate = None
+try:
+    import zlib
+except ImportError:
+    zlib = None
+
+from interface.basic.logger import Logging, _get_level_int
+from interface.basic.converters import iso_to_seconds, seconds_to_iso
 
 
 # =========================== #
@@ -116,6 +130,20 @@ class Folder(Loc):
     def _read(self, encoding: str = "utf-8"):
         return os.listdir(self.path)
 
+    def make(self, message: str | None = None) -> bool:
+        try:
+            os.mkdir(self.path)
+            self.logging(
+                f"Made {self.__class__.__name__}: {self.path}{' | ' + message if message is not None else ''}", level="SUCCESS"
+            )
+            return True
+        except Exception as e:
+            self.logging(
+                f"Error when making {self.__class__.__name__}: {self.path} | {e}{' | ' + message if message is not None else ''}",
+                level="ERROR"
+            )
+            return False
+
     def _write(self, data, encoding: str = "utf-8"):
         raise NotImplementedError(f"{self.__class__.__name__}.write() is not implemented")
 
@@ -128,14 +156,40 @@ gc.collect()
 
 class JsonFile(Loc):
     extension = "json"
+    separators: tuple[str, str] | None = None
+
+    @property
+    def exists(self):
+        self._recover()
+        return super().exists
+
+    def _recover(self):
+        """ Power lost between the remove and the rename of _write: only the (complete) temporary file is left. """
+        try:
+            os.stat(self.path)
+        except OSError:
+            try:
+                os.rename(self.path + ".tmp", self.path)
+                self.logging(f"Recovered {self.__class__.__name__}: {self.path}", level="WARNING")
+            except OSError:
+                pass
 
     def _read(self, encoding: str = "utf-8"):
+        self._recover()
         with open(self.path, 'r', encoding=encoding) as f:
             return json.load(f)
 
     def _write(self, data, encoding: str = "utf-8"):
-        with open(self.path, 'w', encoding=encoding) as f:
-            json.dump(data, f)
+        # Atomic: temporary file renamed over the file (never half written)
+        temporary = self.path + ".tmp"
+        with open(temporary, 'w', encoding=encoding) as f:
+            f.write(json.dumps(data) if self.separators is None else json.dumps(data, separators=self.separators))
+        try:
+            os.rename(temporary, self.path)
+        except OSError:
+            # Rename does not replace on some file systems
+            os.remove(self.path)
+            os.rename(temporary, self.path)
         return True
 
     def _append(self, data, encoding: str = "utf-8"):
@@ -145,6 +199,13 @@ class JsonFile(Loc):
 gc.collect()
 
 
+class CompactJsonFile(JsonFile):
+    separators = (",", ":")
+
+
+gc.collect()
+
+
 class TextFile(Loc):
     extension = "txt"
 
@@ -171,6 +232,221 @@ gc.collect()
 # =========================== #
 
 
+class JsonStore:
+    """ Cached JsonFile, shared per path (JsonStore.of).
+
+    - The file is parsed once, reads are served from memory (copies).
+    - Writes mark the store dirty, written at once by flush() after wait_flush seconds without changes (write-behind).
+    - Run JsonStore.flushing() to flush the dirty stores periodically, JsonStore.flush_all() before stopping.
+    """
+
+    stores: dict[str, 'JsonStore'] = {}
+
+    def __init__(self, file: JsonFile, wait_flush: int | float = 2):
+        self.file = file
+        self.wait_flush = wait_flush
+        self._data: dict | None = None
+        self.dirty = False
+        self.changed = 0
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.file.path}{', dirty' if self.dirty else ''})"
+
+    @classmethod
+    def of(cls, file: JsonFile) -> 'JsonStore':
+        store = cls.stores.get(file.path)
+        if store is None:
+            store = cls(file)
+            cls.stores[file.path] = store
+        return store
+
+    @property
+    def data(self) -> dict:
+        """ Cached data (not a copy). """
+        if self._data is None:
+            data = self.file.read(f"Caching {self.__class__.__name__}") if self.file.exists else None
+            self._data = data if isinstance(data, dict) else {}
+        return self._data
+
+    def read(self) -> dict:
+        return {key: value.copy() if isinstance(value, dict) else value for key, value in self.data.items()}
+
+    def write(self, data: dict):
+        self._data = data
+        self.dirty = True
+        self.changed = time.time()
+
+    def flush(self, force: bool = True) -> bool:
+        if not self.dirty or (not force and time.time() - self.changed < self.wait_flush):
+            return True
+        self.dirty = not self.file.write(self._data, message=f"Flushing {self.__class__.__name__}")
+        return not self.dirty
+
+    def remove(self):
+        self._data = {}
+        self.dirty = False
+        self.file.remove()
+
+    @classmethod
+    def flush_all(cls, force: bool = True) -> bool:
+        return all([store.flush(force) for store in cls.stores.values()])
+
+    @classmethod
+    async def flushing(cls, wait: int | float = 1):
+        """ (Async) Flush the dirty stores once unchanged for their wait_flush. """
+        while True:
+            await asyncio.sleep(wait)
+            cls.flush_all(force=False)
+
+
+gc.collect()
+
+
+class JsonBundle(JsonStore):
+    """ Several stores in one (compact) file: {"version", "index", section: data, ...}.
+
+    - mount(name, file): JsonStore.of(file) is then the section of the bundle (Settings use it transparently).
+    - Migration: a section missing from the bundle is read once from its former file, removed after the next flush.
+    - index: templates of each section (without reading the sections).
+    - transaction(): writes inside are flushed at once at the end, or rolled back on an exception.
+    """
+
+    version = 1
+
+    def __init__(self, file: JsonFile, wait_flush: int | float = 2):
+        super().__init__(file, wait_flush)
+        self.sections: dict[str, 'JsonSection'] = {}
+        self.migrated: list[JsonFile] = []
+        self.depth = 0
+        JsonStore.stores[file.path] = self
+
+    @property
+    def data(self) -> dict:
+        if self._data is None:
+            data = super().data
+            data.setdefault("version", self.version)
+            data.setdefault("index", {})
+        return self._data
+
+    @property
+    def index(self) -> dict[str, list[str]]:
+        return self.data["index"]
+
+    def mount(self, name: str, file: JsonFile) -> 'JsonSection':
+        section = JsonSection(self, name, file)
+        self.sections[name] = section
+        JsonStore.stores[file.path] = section
+        return section
+
+    def touch(self):
+        self.dirty = True
+        self.changed = time.time()
+
+    def flush(self, force: bool = True) -> bool:
+        if self.depth > 0:
+            return True
+        res = super().flush(force)
+        if res and self.migrated:
+            for file in self.migrated:
+                file.remove("Migrated to bundle")
+            self.migrated = []
+        return res
+
+    def transaction(self) -> 'Transaction':
+        return Transaction(self)
+
+
+gc.collect()
+
+
+class JsonSection(JsonStore):
+    """ Section of a JsonBundle, used as the store of a former file. """
+
+    def __init__(self, bundle: JsonBundle, name: str, file: JsonFile):
+        super().__init__(file, bundle.wait_flush)
+        self.bundle = bundle
+        self.name = name
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.bundle.file.path}: {self.name})"
+
+    @property
+    def dirty(self) -> bool:
+        return self.bundle.dirty
+
+    @dirty.setter
+    def dirty(self, value: bool):
+        # The bundle is dirty (not the section)
+        ...
+
+    @property
+    def data(self) -> dict:
+        data = self.bundle.data
+        if self.name not in data:
+            data[self.name] = self._migrate()
+            self.bundle.index[self.name] = self.templates(data[self.name])
+        return data[self.name]
+
+    @staticmethod
+    def templates(data: dict) -> list[str]:
+        return [key for key in data.keys() if key != "template"]
+
+    def _migrate(self) -> dict:
+        if not self.file.exists:
+            return {}
+        data = self.file.read(f"Migrating to {self.bundle.__class__.__name__}")
+        if not isinstance(data, dict):
+            return {}
+        self.bundle.migrated.append(self.file)
+        self.bundle.touch()
+        return data
+
+    def write(self, data: dict):
+        self.bundle.data[self.name] = data
+        self.bundle.index[self.name] = self.templates(data)
+        self.bundle.touch()
+
+    def flush(self, force: bool = True) -> bool:
+        return self.bundle.flush(force)
+
+    def remove(self):
+        self.write({})
+
+
+gc.collect()
+
+
+class Transaction:
+    """ with bundle.transaction(): ... -> One flush at the end, rollback on exception (None bundle -> nothing). """
+
+    def __init__(self, bundle: JsonBundle | None):
+        self.bundle = bundle
+        self.snapshot = None
+
+    def __enter__(self):
+        if self.bundle is not None:
+            if self.bundle.depth == 0:
+                self.snapshot = (json.dumps(self.bundle.data), self.bundle.dirty)
+            self.bundle.depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.bundle is None:
+            return False
+        self.bundle.depth -= 1
+        if self.bundle.depth == 0:
+            if exc_type is not None:
+                self.bundle._data = json.loads(self.snapshot[0])
+                self.bundle.dirty = self.snapshot[1]
+            else:
+                self.bundle.flush()
+            self.snapshot = None
+        return False
+
+
+gc.collect()
+
+
 class Settings:
 
     def __init__(self, file: JsonFile = None, phone=None, template: str | None= "default", name: str = "settings", **kwargs):
@@ -197,31 +473,32 @@ class Settings:
             data.remove("template")
         return data
 
+    @property
+    def store(self) -> JsonStore | None:
+        return JsonStore.of(self.file) if isinstance(self.file, JsonFile) else None
+
     """ Reading / Writing """
 
     def file_read(self) -> dict:
-        if self.file is None:
+        if self.store is None:
             return {}
-        data = self.file.read(f"Reading {self.__class__.__name__}")
-        if data is None:
-            return {}
-        return data
+        return self.store.read()
 
     def file_write(self, data: dict) -> None:
-        if isinstance(self.file, JsonFile):
-            self.file.write(data, message=f"Saving {self.__class__.__name__}")
+        if self.store is not None:
+            self.store.write(data)
 
-    def wifi_read(self) -> dict:
+    async def wifi_read(self) -> dict:
         if self.phone is None:
             return {}
-        config = self.phone.get_data(self.name)
+        config = await self.phone.get_data(self.name)
         if not config:
             return {}
         return config
 
-    def wifi_write(self, data: dict) -> None:
+    async def wifi_write(self, data: dict) -> None:
         if self.phone is not None:
-            self.phone.write(**{self.name: data})
+            await self.phone.write(**{self.name: data})
 
     def _add_template(self, config: dict):
         if self.file and config:
@@ -245,9 +522,12 @@ class Settings:
 
     """ User """
 
-    def download(self) -> 'Settings':
-        """ Download data from phone and save to file and load. """
-        config = self.wifi_read()
+    async def download(self) -> 'Settings':
+        """ (Async) Download data from phone and save to file and load. """
+        return self.apply(await self.wifi_read())
+
+    def apply(self, config: dict | None) -> 'Settings':
+        """ Save downloaded data to file and load. """
         if not config:
             return self
         print(config)
@@ -265,12 +545,12 @@ class Settings:
             self._set_template(data.get(value))
         return self
 
-    def upload(self, value: str | None = None) -> 'Settings':
-        """ Send template to phone. """
+    async def upload(self, value: str | None = None) -> 'Settings':
+        """ (Async) Send template to phone. """
         data = self.file_read()
         value = value if value is not None else data.get("template", "default")
         if value in data:
-            self.wifi_write(data.get(value))
+            await self.wifi_write(data.get(value))
         return self
 
     def remove(self, value: str) -> 'Settings':
@@ -293,8 +573,8 @@ class Settings:
         return self
 
     def save(self) -> 'Settings':
-        if isinstance(self.file, JsonFile):
-            self.file.write({self.template: self.to_dict}, message=f"Saving template '{self.template}' of {self.__class__.__name__}")
+        if self.store is not None:
+            self.store.write({self.template: self.to_dict})
         return self
 
     """ Making it. """
@@ -312,8 +592,8 @@ class Settings:
                   is_logging: bool = None, style: str = None, **kwargs):
         file = cls.make_file(name=name, path=path, folder=folder, is_logging=is_logging, style=style) if name is not None else file
 
-        data = file.read(message=f"Getting {cls.__name__}")
-        if not isinstance(data, dict):
+        data = JsonStore.of(file).read() if isinstance(file, JsonFile) else None
+        if not data:
             return cls(file=file, **kwargs)
 
         data.update(kwargs)
@@ -326,8 +606,8 @@ class Settings:
         return instance
 
     def open(self, data: dict | None = None):
-        if isinstance(self.file, JsonFile) and data is None:
-            data = self.file.read(message=f"Getting {self.__class__.__name__}")
+        if self.store is not None and data is None:
+            data = self.store.read()
         if not isinstance(data, dict):
             return
         for key, value in data.items():
@@ -343,7 +623,83 @@ gc.collect()
 # =========================== #
 
 
+# Bytes of the records of a LogFile (JSON objects separated by commas)
+_QUOTE = const(34)
+_BACKSLASH = const(92)
+_OPEN = const(123)
+_CLOSE = const(125)
+
+
+def _filters(level: str | int | None, name: str | list | tuple | None, start: str | int | None, end: str | int | None):
+    """ Normalised filters of the readers: minimum level (int), names (tuple), start and end (ISO). """
+    return (
+        None if level is None else _get_level_int(level),
+        None if name is None else (name,) if isinstance(name, str) else tuple(name),
+        seconds_to_iso(start) if isinstance(start, int) else start,
+        seconds_to_iso(end) if isinstance(end, int) else end,
+    )
+
+
+def _match(record: dict, level: int | None, names: tuple | None, start: str | None, end: str | None,
+           key: str | None = "time") -> int:
+    """ 1 if the record matches the filters, 0 if not, -1 if after end (stop reading). """
+    moment = record.get(key) if key is not None else None
+    if moment is not None:
+        if end is not None and moment > end:
+            return -1
+        if start is not None and moment < start:
+            return 0
+    if level is not None and record.get("level", level) < level:
+        return 0
+    if names is not None and record.get("name") not in names:
+        return 0
+    return 1
+
+
+def _json_records(f, level: int | None, names: tuple | None, start: str | None, end: str | None,
+                  buffer_size: int = 256):
+    """ Generator of the records of a LogFile from a stream (readinto), read through a buffer of buffer_size bytes. """
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    record = bytearray()
+    depth, string, escape = 0, False, False
+    while True:
+        n = f.readinto(buffer)
+        if not n:
+            return
+        begin = 0 if depth else None
+        for i in range(n):
+            c = buffer[i]
+            if string:
+                if escape:
+                    escape = False
+                elif c == _BACKSLASH:
+                    escape = True
+                elif c == _QUOTE:
+                    string = False
+            elif c == _QUOTE:
+                string = True
+            elif c == _OPEN:
+                if depth == 0:
+                    begin = i
+                depth += 1
+            elif c == _CLOSE:
+                depth -= 1
+                if depth == 0:
+                    record.extend(view[begin:i + 1])
+                    data = json.loads(str(record, "utf-8"))
+                    record, begin = bytearray(), None
+                    match = _match(data, level, names, start, end)
+                    if match < 0:
+                        return
+                    if match:
+                        yield data
+        if begin is not None:
+            record.extend(view[begin:n])
+
+
 class LogFile(TextFile):
+    mode = 'a'
 
     def __init__(self, path: str, name: str = None, **kwargs):
         super().__init__(path, name=name, is_logging=False)
@@ -352,6 +708,30 @@ class LogFile(TextFile):
     def __call__(self, data: dict):
         return self.log(data)
 
+    def encode(self, data: dict) -> str:
+        """ Record as written in the file (by LogManager). """
+        record = ("," if self.started else "") + json.dumps(data)
+        self.started = True
+        return record
+
+    def flushed(self):
+        """ Called by LogManager once the encoded records are written. """
+        ...
+
+    def discard(self):
+        """ Called by LogManager when the encoded records are dropped: back to the state of the file. """
+        self.started = self.exists
+
+    def records(self, level: str | int | None = None, name: str | list | tuple | None = None,
+                start: str | None = None, end: str | None = None, buffer_size: int = 256):
+        """ Generator of the records, read one at a time through a buffer of buffer_size bytes.
+
+        - level: minimum level, name: logger(s), start <= time <= end (ISO).
+        - Records are in order of time: stops at the first one after end.
+        """
+        with open(self.path, 'rb') as f:
+            yield from _json_records(f, *_filters(level, name, start, end), buffer_size)
+
     def log(self, data: dict):
         if self.started:
             self.append(data)
@@ -378,59 +758,519 @@ class LogFile(TextFile):
 gc.collect()
 
 
+# Binary log: tags of the stream (file) and of the index
+_MAGIC = b"BLG1"
+_RECORD = const(0x00)
+_INTERN = const(0x01)
+_MARK = const(0x02)
+_NONE = const(0xFFFF)
+
+# Types: struct formats, 's' interned string (H), 't' time in seconds since 2000 (I), 'z' inline string (H + bytes)
+_TYPES = {"B": "B", "b": "b", "H": "H", "h": "h", "I": "I", "i": "i", "f": "f", "d": "d", "?": "?", "s": "H", "t": "I"}
+
+LOGGING_SCHEMA = (("time", "t"), ("level", "B"), ("name", "s"), ("style", "s"), ("message", "z"))
+
+
+class BinaryLogFile(Loc):
+    """ Logs records in a compact binary format, with a sparse time index.
+
+    - Header: magic, then the schema (key and type of each field).
+    - Records: fixed-width fields (struct), then the inline strings ('z').
+    - Strings of 's' fields (logger names, styles) are interned: written once, then referred by id.
+    - Index (.idx next to the file): the interned strings and a (time, offset) mark every `every` bytes,
+      so that a time can be located (find) without scanning the file.
+    """
+    extension = "bin"
+    mode = 'ab'
+    schema: tuple = LOGGING_SCHEMA
+    every: int = 1024
+
+    def __init__(self, path: str, name: str = None, schema: tuple | None = None, every: int | None = None, **kwargs):
+        super().__init__(path, name=name, is_logging=False)
+        self.index = (path[:-len(self.extension)] if path.endswith("." + self.extension) else path + ".") + "idx"
+        self.schema = tuple(schema) if schema is not None else self.schema
+        self.every = every if every is not None else self.every
+        self._format = _format(self.schema)
+        self.started = self.exists
+
+        # Interned strings and marks of the index
+        self._strings: dict[str, int] = {}
+        self._pending: list[bytes] = []
+        self._offset = 0
+        self._mark = None
+        if self.started:
+            self._load()
+
+    def __call__(self, data: dict):
+        return self.log(data)
+
+    @property
+    def header(self) -> bytes:
+        header = [_MAGIC, bytes([len(self.schema)])]
+        for key, kind in self.schema:
+            key = key.encode()
+            header.append(bytes([len(key)]) + key + kind.encode())
+        return b"".join(header)
+
+    def _load(self):
+        """ Continue an existing file: interned strings and last mark from the index. """
+        self._offset = os.stat(self.path).st_size
+        strings, marks = self._read_index()
+        self._strings = {string: i for i, string in strings.items()}
+        self._mark = marks[-1][1] if marks else None
+
+    """ Encoding """
+
+    def _intern(self, value, parts: list) -> int:
+        if value is None:
+            return _NONE
+        value = str(value)
+        i = self._strings.get(value)
+        if i is None:
+            if len(self._strings) >= _NONE:
+                return _NONE
+            i = len(self._strings)
+            self._strings[value] = i
+            data = value.encode()[:255]
+            entry = struct.pack("<BHB", _INTERN, i, len(data)) + data
+            parts.append(entry)
+            self._pending.append(entry)
+        return i
+
+    def encode(self, data: dict) -> bytes:
+        """ Record as written in the file (by LogManager). """
+        parts = []
+        if not self.started:
+            parts.append(self.header)
+            self.started = True
+        fixed, inline, moment = [], [], 0
+        for key, kind in self.schema:
+            value = data.get(key)
+            if kind == "z":
+                value = None if value is None else str(value).encode()[:_NONE - 1]
+                inline.append(struct.pack("<H", _NONE) if value is None else struct.pack("<H", len(value)) + value)
+                continue
+            if kind == "s":
+                value = self._intern(value, parts)
+            elif kind == "t":
+                value = iso_to_seconds(value) if isinstance(value, str) else int(value or 0)
+                moment = moment or value
+            elif value is None:
+                value = 0
+            fixed.append(value)
+        # Mark
+        offset = self._offset + sum(len(part) for part in parts)
+        if self._mark is None or offset - self._mark >= self.every:
+            self._mark = offset
+            self._pending.append(struct.pack("<BII", _MARK, moment, offset))
+        parts.append(bytes([_RECORD]) + struct.pack(self._format, *fixed))
+        parts.extend(inline)
+        record = b"".join(parts)
+        self._offset += len(record)
+        return record
+
+    def flushed(self):
+        """ Called by LogManager once the encoded records are written: write the index. """
+        if self._pending:
+            with open(self.index, 'ab') as f:
+                f.write(b"".join(self._pending))
+            self._pending = []
+
+    def discard(self):
+        """ Called by LogManager when the encoded records are dropped: back to the state of the file. """
+        self._strings, self._pending, self._offset, self._mark = {}, [], 0, None
+        self.started = self.exists
+        if self.started:
+            self._load()
+
+    def log(self, data: dict):
+        return self.append(data)
+
+    """ Decoding """
+
+    def _read_index(self) -> tuple[dict[int, str], list[tuple[int, int]]]:
+        strings, marks = {}, []
+        try:
+            with open(self.index, 'rb') as f:
+                for tag, values in _entries(f, None):
+                    if tag == _INTERN:
+                        strings[values[0]] = values[1]
+                    elif tag == _MARK:
+                        marks.append(values)
+        except OSError:
+            pass
+        return strings, marks
+
+    def find(self, moment: str | int) -> int:
+        """ Offset of the last mark strictly before moment (0 if none): the records of that second before a mark of
+        the same second are read too. """
+        moment = iso_to_seconds(moment) if isinstance(moment, str) else moment
+        marks = self._read_index()[1]
+        low, high = 0, len(marks)
+        while low < high:
+            middle = (low + high) // 2
+            if marks[middle][0] < moment:
+                low = middle + 1
+            else:
+                high = middle
+        return marks[low - 1][1] if low > 0 else 0
+
+    def records(self, level: str | int | None = None, name: str | list | tuple | None = None,
+                start: str | int | None = None, end: str | int | None = None):
+        """ Generator of the records matching the filters (see LogFile.records), from the mark before start. """
+        level, names, start, end = _filters(level, name, start, end)
+        strings = self._read_index()[0] if start is not None else {}
+        with open(self.path, 'rb') as f:
+            schema = _header(f)
+            if start is not None:
+                f.seek(max(f.tell(), self.find(start)))
+            yield from _binary_records(f, schema, strings, level, names, start, end)
+
+    def between(self, start: str | int | None = None, end: str | int | None = None) -> list[dict]:
+        """ Records with start <= time <= end (times are ISO strings or seconds since 2000). """
+        return list(self.records(start=start, end=end))
+
+    def _read(self, encoding: str = "utf-8"):
+        with open(self.path, 'rb') as f:
+            schema = _header(f)
+            return [record for tag, record in _entries(f, schema) if tag == _RECORD]
+
+    def _write(self, data: dict, encoding: str = "utf-8"):
+        self.started = False
+        self._strings, self._pending, self._offset, self._mark = {}, [], 0, None
+        for path in (self.path, self.index):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        return self._append(data, encoding)
+
+    def _append(self, data: dict, encoding: str = "utf-8"):
+        with open(self.path, 'ab') as f:
+            f.write(self.encode(data))
+        self.flushed()
+        return True
+
+    def remove(self, message: str | None = None):
+        super().remove(message)
+        try:
+            os.remove(self.index)
+        except OSError:
+            pass
+
+
+def _format(schema) -> str:
+    return "<" + "".join(_TYPES[kind] for key, kind in schema if kind != "z")
+
+
+def _header(f) -> tuple:
+    """ Schema from the header of a binary log (file at its start). """
+    if f.read(len(_MAGIC)) != _MAGIC:
+        raise ValueError("Not a binary log")
+    schema = []
+    for _ in range(f.read(1)[0]):
+        key = f.read(f.read(1)[0]).decode()
+        schema.append((key, f.read(1).decode()))
+    return tuple(schema)
+
+
+def _binary_records(f, schema: tuple, strings: dict, level: int | None, names: tuple | None,
+                    start: str | None, end: str | None):
+    """ Generator of the records of a binary log (after its header) from a stream (read) matching the filters. """
+    key = next((key for key, kind in schema if kind == "t"), None)
+    for tag, record in _entries(f, schema, strings):
+        if tag != _RECORD:
+            continue
+        match = _match(record, level, names, start, end, key)
+        if match < 0:
+            return
+        if match:
+            yield record
+
+
+def _entries(f, schema: tuple | None, strings: dict | None = None):
+    """ Generator of (tag, values) of a binary log (records decoded with the schema) or of its index. """
+    fmt = _format(schema) if schema is not None else ""
+    size = struct.calcsize(fmt)
+    strings = strings if strings is not None else {}
+    while True:
+        tag = f.read(1)
+        if not tag:
+            return
+        tag = tag[0]
+        if tag == _INTERN:
+            i, length = struct.unpack("<HB", f.read(3))
+            strings[i] = f.read(length).decode()
+            yield tag, (i, strings[i])
+        elif tag == _MARK:
+            yield tag, struct.unpack("<II", f.read(8))
+        elif tag == _RECORD and schema is not None:
+            chunk = f.read(size)
+            if len(chunk) < size:
+                return
+            values, i, record = struct.unpack(fmt, chunk), 0, {}
+            for key, kind in schema:
+                if kind == "z":
+                    length = struct.unpack("<H", f.read(2))[0]
+                    value = None if length == _NONE else f.read(length).decode()
+                else:
+                    value, i = values[i], i + 1
+                    value = strings.get(value) if kind == "s" else seconds_to_iso(value) if kind == "t" else value
+                if value is not None:
+                    record[key] = value
+            yield tag, record
+        else:
+            return
+
+
+gc.collect()
+
+
+# Archives: window of 2^10 bytes (RAM used by the compression), chunks read at once
+_WINDOW_BITS = const(10)
+_CHUNK = const(256)
+
+
+class _ZlibWriter:
+    """ Streaming compression with zlib (when deflate is not available). """
+
+    def __init__(self, f):
+        self.f = f
+        self.z = zlib.compressobj(9, zlib.DEFLATED, _WINDOW_BITS)
+
+    def write(self, data) -> int:
+        self.f.write(self.z.compress(bytes(data)))
+        return len(data)
+
+    def close(self):
+        self.f.write(self.z.flush())
+
+
+class _ZlibReader:
+    """ Streaming decompression with zlib (read / readinto), whole at once if zlib can not stream. """
+
+    def __init__(self, f):
+        self.f = f
+        self.z = zlib.decompressobj() if hasattr(zlib, "decompressobj") else None
+        self.pending = b"" if self.z is not None else zlib.decompress(f.read())
+
+    def read(self, n: int) -> bytes:
+        while self.z is not None and len(self.pending) < n:
+            chunk = self.f.read(_CHUNK)
+            if not chunk:
+                self.pending += self.z.flush()
+                self.z = None
+                break
+            self.pending += self.z.decompress(chunk)
+        data, self.pending = self.pending[:n], self.pending[n:]
+        return data
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def _compressor(f):
+    if deflate is not None:
+        return deflate.DeflateIO(f, deflate.ZLIB, _WINDOW_BITS)
+    if zlib is not None and hasattr(zlib, "compressobj"):
+        return _ZlibWriter(f)
+    raise NotImplementedError("No compression (deflate or zlib) available")
+
+
+def _decompressor(f):
+    if deflate is not None:
+        return deflate.DeflateIO(f, deflate.ZLIB)
+    if zlib is not None:
+        return _ZlibReader(f)
+    raise NotImplementedError("No decompression (deflate or zlib) available")
+
+
+class LogArchive(Loc):
+    """ Compressed (zlib) rotated log: name.txt.z (LogFile) or name.bin.z (BinaryLogFile), read as a stream. """
+    extension = "z"
+
+    def __init__(self, path: str, name: str = None, **kwargs):
+        super().__init__(path, name=name, is_logging=False)
+
+    @property
+    def is_binary(self) -> bool:
+        return self.path.endswith("." + BinaryLogFile.extension + "." + self.extension)
+
+    @property
+    def size(self) -> int:
+        try:
+            return os.stat(self.path).st_size
+        except OSError:
+            return 0
+
+    @classmethod
+    def of(cls, file: 'LogFile | BinaryLogFile') -> 'LogArchive':
+        return cls(f"{file.path}.{cls.extension}", name=f"{cls.__name__}: '{file.path}'")
+
+    def compressing(self, file: 'LogFile | BinaryLogFile'):
+        """ Generator compressing file into the archive, one chunk per step (to let other tasks run in between). """
+        buffer = bytearray(_CHUNK)
+        view = memoryview(buffer)
+        with open(file.path, 'rb') as source, open(self.path, 'wb') as target:
+            stream = _compressor(target)
+            while True:
+                n = source.readinto(buffer)
+                if not n:
+                    break
+                stream.write(view[:n])
+                yield n
+            stream.close()
+
+    def records(self, level: str | int | None = None, name: str | list | tuple | None = None,
+                start: str | None = None, end: str | None = None):
+        """ Generator of the records, decompressed on the fly (see LogFile.records for the filters). """
+        with open(self.path, 'rb') as f:
+            stream = _decompressor(f)
+            if self.is_binary:
+                yield from _binary_records(stream, _header(stream), {}, *_filters(level, name, start, end))
+            else:
+                yield from _json_records(stream, *_filters(level, name, start, end))
+
+    def _read(self, encoding: str = "utf-8"):
+        return list(self.records())
+
+
+gc.collect()
+
+
 class LogManager(Folder):
+    """ Logs records to rotated files (file_class: LogFile or BinaryLogFile) in a folder.
+
+    - The rotation index (files in the folder) is kept in memory: the folder is only listed once.
+    - The current file is kept open, records are buffered in RAM and written at once when
+      buffer_size (bytes) or wait_flush (seconds) is reached. A failed write keeps the buffer for the next flush,
+      up to buffer_max (the new records are then dropped, counted in dropped: the buffered ones open the file).
+    - Records still buffered when rotating (failed write) are dropped: they are encoded for the former file.
+    - Run refreshing() to also flush periodically, close() to flush and close the file.
+    - archive: closed files are compressed in the background (refreshing) into LogArchives, the archive.json index
+      lists them (file, source size, compressed size, start) and keeps archive_amount of them.
+    """
 
     def __init__(self, path: str, name: str = None, is_logging: bool = None, style: str = None,
-                 naming: str = "log", size: int = 5000, amount: int = 5, make_new: bool = True, clock=None):
+                 naming: str = "log", size: int = 5000, amount: int = 5, make_new: bool = True, clock=None,
+                 buffer_size: int = 512, wait_flush: int | float = 5, file_class: type = LogFile, buffer_max: int = 4096,
+                 archive: bool = False, archive_amount: int = 50):
         super().__init__(path, name=name, is_logging=is_logging, style=style)
         self.name = naming
         self.size = size
         self.amount = amount
         self.clock = clock
         self.make_new = make_new
+        self.file_class = file_class
+
+        # Buffer
+        self.buffer_size = buffer_size
+        self.buffer_max = max(buffer_max, buffer_size)
+        self.wait_flush = wait_flush
+        self.dropped = 0
+        self._buffer: list[str | bytes] = []
+        self._buffered = 0
+        self._flushed = time.time()
+
+        # Rotation index (new file made at first log if make_new)
+        self._files: list[LogFile | BinaryLogFile] = self._list()
+        self._handle = None
+        self._written = self._size()
+        self._naming = None
+        self._index = 0
+
+        # Archives (closed files waiting for compression, except the current one)
+        self.archive = archive
+        self.archive_amount = archive_amount
+        self.index = JsonFile.at("archive", folder=self, is_logging=is_logging, style=style)
+        self._archives: list[dict] = self._list_archives() if archive else []
+        self._archiving: list[LogFile | BinaryLogFile] = self._files[:-1] if archive else []
 
-        # Make new file if new document
-        if make_new:
-            self.new_file()
+    @property
+    def files(self) -> list['LogFile | BinaryLogFile']:
+        return self._files
 
     @property
-    def files(self):
-        fs = self.read()
-        if not isinstance(fs, list):
-            return []
-        files = []
-        for file in fs:
-            if file.endswith(".txt"):
-                files.append(LogFile.at(file, folder=self))
-        return files
+    def file(self) -> 'LogFile | BinaryLogFile | None':
+        return self._files[-1] if len(self._files) > 0 else None
 
     @property
     def now(self):
         date = "{:04d}-{:02d}-{:02d}T{:02d}:{:02d}:{:02d}".format(*time.localtime()[:6]) if self.clock is None else self.clock.iso
         return date.replace(":", "_").replace("-", "_")
 
+    def _list(self) -> list['LogFile | BinaryLogFile']:
+        fs = self.read()
+        if not isinstance(fs, list):
+            self.make()
+            return []
+        extension = "." + self.file_class.extension
+        return [self.file_class.at(file, folder=self) for file in sorted(fs) if file.endswith(extension)]
+
+    def _list_archives(self) -> list[dict]:
+        entries = self.index.read() if self.index.exists else None
+        return [entry for entry in entries if isinstance(entry, dict)] if isinstance(entries, list) else []
+
+    """ Files """
+
+    def _size(self) -> int:
+        try:
+            return os.stat(self.file.path).st_size if self.file is not None else 0
+        except OSError:
+            return 0
+
+    def _open(self):
+        if self._handle is None and self.file is not None:
+            self._handle = open(self.file.path, self.file.mode) if "b" in self.file.mode \
+                else open(self.file.path, self.file.mode, encoding="utf-8")
+            self._written = self._size()
+
+    def _close(self):
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def _rotate(self):
+        """ Remove the oldest files above amount, the ones waiting for their archive are not counted
+        (archiving removes them once compressed). """
+        kept = [file for file in self._files if file not in self._archiving]
+        while len(kept) > self.amount:
+            file = kept.pop(0)
+            self._files.remove(file)
+            file.remove()
+
     def continue_on_file(self):
-        # Get file
-        if len(self.files) == 0:
-            file = LogFile.at(f"{self.name}_{self.now}", folder=self)
-            self.files.append(file)
-        else:
-            file = self.files[-1]
-            try:
-                if os.stat(file.path).st_size > self.size:
-                    self.files.append(LogFile.at(f"{self.name}_{self.now}", folder=self))
-            except FileNotFoundError:
-                pass
-            while len(self.files) > self.amount:
-                self.files[0].remove()
-        return file
+        if self.file is None or self._written > self.size:
+            return self.new_file()
+        return self.file
 
     def new_file(self):
-        file = LogFile.at(f"{self.name}_{self.now}", folder=self)
-
-        while len(self.files) > self.amount:
-            self.files[0].remove()
-        return file
+        if not self.flush():
+            self._drop()
+        self._close()
+        # Same name (same second) -> Numbered
+        name = f"{self.name}_{self.now}"
+        self._index = self._index + 1 if name == self._naming else 0
+        self._naming = name
+        file = self.file_class.at(name if self._index == 0 else f"{name}_{self._index:02d}", folder=self)
+        if self.archive and self.file is not None:
+            self._archiving.append(self.file)
+        self._files.append(file)
+        self._written = 0
+        self._rotate()
+        return self.file
+
+    """ Logging """
+
+    def _drop(self):
+        """ Buffered records dropped (the file forgets their encoding). """
+        self.dropped += len(self._buffer)
+        self.logging(f"{len(self._buffer)} records dropped", level="WARNING")
+        self._buffer = []
+        self._buffered = 0
+        self.file.discard()
 
     def log(self, data: dict):
         # Make new file if new document
@@ -439,12 +1279,105 @@ class LogManager(Folder):
             self.make_new = False
         else:
             file = self.continue_on_file()
-        # Log to file
-        return file.log(data)
+        # Full buffer (failed writes): the new record is dropped before being encoded
+        if self._buffered >= self.buffer_max and not self.flush():
+            self.dropped += 1
+            return False
+        # Buffer
+        record = file.encode(data)
+        self._buffer.append(record)
+        self._buffered += len(record)
+        if self._buffered >= self.buffer_size or time.time() - self._flushed >= self.wait_flush:
+            return self.flush()
+        return True
 
     def __call__(self, data: dict):
         return self.log(data)
 
+    def flush(self) -> bool:
+        """ Write the buffered records at once. """
+        self._flushed = time.time()
+        if not self._buffer:
+            return True
+        try:
+            self._open()
+            data = (b"" if isinstance(self._buffer[0], bytes) else "").join(self._buffer)
+            self._handle.write(data)
+            self._handle.flush()
+            self.file.flushed()
+        except Exception as e:
+            # Kept for the next flush (up to buffer_max)
+            self.logging(f"Error when flushing {self.__class__.__name__}: {self.path} | {e}", level="ERROR")
+            self._close()
+            return False
+        self._buffer = []
+        self._buffered = 0
+        # Bytes (characters of the text logs may be several bytes)
+        self._written = self._size()
+        return True
+
+    def close(self):
+        self.flush()
+        self._close()
+
+    def records(self, level: str | int | None = None, name: str | list | tuple | None = None,
+                start: str | None = None, end: str | None = None):
+        """ Generator of the records of the rotated files, in order (see LogFile.records for the filters). """
+        self.flush()
+        level, names, start, end = _filters(level, name, start, end)
+        archives = [LogArchive.at(entry["file"], folder=self) for entry in self._archives]
+        for file in archives + list(self._files):
+            if not file.exists:
+                continue
+            for record in file.records(level, names, start, end):
+                yield record
+
+    """ Archives """
+
+    async def archiving(self) -> bool:
+        """ (Async) Compress the oldest closed file, a chunk at a time. """
+        if not self._archiving:
+            return False
+        # Kept in _archiving (not rotated) until compressed
+        file = self._archiving[0]
+        if not file.exists:
+            self._archiving.remove(file)
+            if file in self._files:
+                self._files.remove(file)
+            return True
+        archive = LogArchive.of(file)
+        try:
+            size = 0
+            for n in archive.compressing(file):
+                size += n
+                await asyncio.sleep(0)
+            start = next(file.records(), {}).get("time")
+        except Exception as e:
+            self.logging(f"Error when archiving {file.path} | {e}", level="ERROR")
+            archive.remove()
+            self._archiving.remove(file)
+            self._rotate()
+            return False
+        self._archiving.remove(file)
+        self._archives.append({"file": archive.path.split("/")[-1], "size": size, "compressed": archive.size, "start": start})
+        if file in self._files:
+            self._files.remove(file)
+        file.remove("Archived")
+        while len(self._archives) > self.archive_amount:
+            LogArchive.at(self._archives.pop(0)["file"], folder=self).remove()
+        self.index.write(self._archives)
+        gc.collect()
+        return True
+
+    async def refreshing(self):
+        """ (Async) Flush periodically (and archive the closed files). """
+        while True:
+            await asyncio.sleep(self.wait_flush)
+            if self._buffer and time.time() - self._flushed >= self.wait_flush:
+                self.flush()
+            while self.archive and await self.archiving():
+                pass
+
 
 gc.collect()
 
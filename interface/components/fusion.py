@@ -0,0 +1,188 @@
+
+import gc
+gc.collect()
+
+from array import array
+
+from interface.operational.triggers import Refresher
+
+
+# =========================== #
+#         IMU batches         #
+# =========================== #
+
+
+class IMUBatches(Refresher):
+    """ **Batches of IMU samples** from its FIFO (e.g. ICM20X.fifo_start / fifo_read / fifo_acceleration).
+
+    Each wait_refresh, the frames waiting in the FIFO are read at once (a few I2C transactions per batch, not one per
+    sample) and decoded into a preallocated array: samples[3 * i + axis] in m/s² for i < count, period seconds apart.
+    The callbacks get (samples, count), events are set (awaited by coroutines).
+    """
+
+    def __init__(self, imu, size: int = 85, gyro: bool = False, wait_refresh: int | float = 0.1,
+                 name: str = None, is_logging: bool = None, style: str = None,
+                 funcs=None, events=None, coroutines=None, event_loop=None,
+                 initially_active: bool = True, uses_active: bool = True,):
+        self.imu = imu
+        self.gyro = gyro
+        self.size = size
+        self.samples = array('f', [0.0] * (3 * size))
+        self.count = 0
+        self.period = 1 / imu.fifo_rate
+        self.errors = 0
+
+        super().__init__(
+            funcs=funcs, events=events, coroutines=coroutines, event_loop=event_loop,
+            name=name, is_logging=is_logging, style=style,
+            wait_refresh=wait_refresh, initially_active=initially_active, uses_active=uses_active,
+        )
+
+    def update(self):
+        try:
+            frames = min(self.imu.fifo_read(), self.size)
+        except OSError as e:
+            self.errors += 1
+            self.logging(f"FIFO not read: {e}", level="DEBUG")
+            return
+        samples = self.samples
+        for i in range(frames):
+            samples[3 * i] = self.imu.fifo_acceleration(i, 0)
+            samples[3 * i + 1] = self.imu.fifo_acceleration(i, 1)
+            samples[3 * i + 2] = self.imu.fifo_acceleration(i, 2)
+        self.count = frames
+        if frames:
+            self.callback(samples, frames)
+
+    def pause(self):
+        self.imu.fifo_stop()
+        super().pause()
+
+    def resume(self):
+        self.imu.fifo_start(self.gyro)
+        super().resume()
+
+
+gc.collect()
+
+
+# =========================== #
+#         Brake fusion        #
+# =========================== #
+
+
+class BrakeFusion(Refresher):
+    """ **Longitudinal acceleration** (m/s²) fusing an IMU (fast) with the wheel (speedometer, slow but unbiased).
+
+    Complementary filter, each wait_refresh (dt): value = alpha * (value + Δimu) + (1 - alpha) * wheel,
+    alpha = tau / (tau + dt). The IMU changes pass (braking seen in tens of ms), its bias (gravity on a slope,
+    mounting) is pulled towards the wheel acceleration in about tau seconds.
+
+    The result is low-passed (time constant smoothing): the road vibration (zero mean) is averaged out, while a
+    braking of a few m/s² still crosses a small threshold in a few ms.
+
+    With batches (IMUBatches), the filter runs over each sample of the batches (dt: their period) instead of polling imu.
+
+    Same source as the Speedometer for a Trigger (value), e.g. TriggerComparison(source=fusion, lower=-0.15, operator="<",
+    expansion_lower=0.1) (hysteresis: released above -0.05).
+    """
+
+    def __init__(self, imu=None, speedometer=None, axis: int = 0, sign: int = 1, tau: float = 0.5,
+                 smoothing: float = 0.25, batches: IMUBatches | None = None, wait_refresh: int | float = 0.02,
+                 name: str = None, is_logging: bool = None, style: str = None,
+                 funcs=None, events=None, coroutines=None, event_loop=None,
+                 initially_active: bool = True, uses_active: bool = True,):
+        """
+
+        Args:
+            imu ():
+                The accelerometer: acceleration -> (x, y, z) in m/s² (e.g. ICM20649).
+            speedometer ():
+                The Speedometer (acceleration in m/s²), None for the IMU only (high-pass).
+            axis ():
+                The axis of the IMU along the bike (0, 1 or 2).
+            sign ():
+                1 if the axis points forward, -1 if backward.
+            tau ():
+                The time constant (s) of the filter: longer trusts the IMU more.
+            smoothing ():
+                The time constant (s) of the low-pass of the result (vibration).
+            batches ():
+                The IMUBatches of the imu (FIFO), None to poll imu each wait_refresh.
+        """
+        self.imu = imu
+        self.speedometer = speedometer
+        self.axis = axis
+        self.sign = sign
+        self.batches = batches
+        dt = wait_refresh if batches is None else batches.period
+        self.alpha = tau / (tau + dt)
+        self.beta = dt / (smoothing + dt)
+        self._fused = 0
+        self._last = None
+        self._steps = 0
+        self._value = 0
+        self.errors = 0
+
+        super().__init__(
+            funcs=funcs, events=events, coroutines=coroutines, event_loop=event_loop,
+            name=name, is_logging=is_logging, style=style,
+            wait_refresh=wait_refresh, initially_active=initially_active, uses_active=uses_active,
+        )
+        if batches is not None:
+            batches.add(funcs=self.feed)
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    @property
+    def wheel(self) -> float:
+        return self.speedometer.acceleration if self.speedometer is not None else 0
+
+    def step(self, sample: float, wheel: float):
+        if self._last is None:
+            self._fused = self._value = wheel
+            self._steps = 1
+        else:
+            # Warm-up: the bias of the IMU is the mean of its samples so far (not the first one, in the vibration)
+            alpha = self.alpha
+            if self._steps / (self._steps + 1) < alpha:
+                alpha = self._steps / (self._steps + 1)
+                self._steps += 1
+            self._fused = alpha * (self._fused + sample - self._last) + (1 - alpha) * wheel
+            self._value += self.beta * (self._fused - self._value)
+        self._last = sample
+
+    def update(self):
+        try:
+            sample = self.imu.acceleration[self.axis] * self.sign
+        except OSError as e:
+            # I2C glitch: keep the last value
+            self.errors += 1
+            self.logging(f"IMU not read: {e}", level="DEBUG")
+            return
+        self.step(sample, self.wheel)
+        self.callback(self._value)
+
+    def feed(self, samples, count: int):
+        """ Batch of IMUBatches (samples[3 * i + axis]). """
+        if not self.is_active:
+            return
+        wheel = self.wheel
+        for i in range(count):
+            self.step(samples[3 * i + self.axis] * self.sign, wheel)
+        self.callback(self._value)
+
+    async def refreshing(self):
+        """ (Async) Polls the imu, unless fed by batches. """
+        if self.batches is None:
+            await super().refreshing()
+
+    def resume(self):
+        # Start again from the wheel (the IMU moved while paused)
+        self._last = None
+        super().resume()
+
+
+gc.collect()
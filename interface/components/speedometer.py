@@ -3,12 +3,17 @@ import gc
 gc.collect()
 
 import time
+import math
+from array import array
+
+from micropython import const
 
 from interface.basic.utils import rounder
-from interface.basic.converters import linear_speed_to_period, kmh_to_ms, ms_to_kmh, period_to_linear_speed, acceleration, displacement, km_to_miles
-from interface.basic.average import Average
 from interface.operational.timer import TriggerTimer
 
+_TICKS_SIZE = const(16)              # Revolutions waiting for calculate (power of 2)
+_TICKS_MASK = const(_TICKS_SIZE - 1)
+
 
 # =========================== #
 #           Classes           #
@@ -16,7 +21,17 @@ from interface.operational.timer import TriggerTimer
 
 
 class Speedometer(TriggerTimer):
-    """ Uses a Timer to reset the counter to 0 each _ seconds. Before resetting it gets the speed from the counts. """
+    """ Uses a Timer to reset the counter to 0 each _ seconds. Before resetting it gets the speed from the counts.
+
+    count() (hall sensor, each revolution) only stores the tick (ms) in a preallocated ring (nothing allocated, ISR-safe),
+    calculate() consumes all the revolutions stored since the last call.
+
+    Fixed point: periods in ms, speeds in mm/s, accelerations in mm/s², distances in mm (small ints, no float per revolution).
+    The properties convert and round once per revolution (cached until the next one).
+    """
+
+    typecode = "q"   # Of the ticks (ms)
+
     def __init__(self, radius: float = 0.25, min_speed: float = 1,
                  unit: int = 0, rounding: int = 2, points: int = 5,
                  max_speed: float = 0, odometer: float = 0, total_duration: float = 0,
@@ -50,16 +65,22 @@ class Speedometer(TriggerTimer):
 
         # Specifications
         self._radius = radius
-        self._period_at_min_speed = linear_speed_to_period(min_speed, self._radius)
+        self._circumference = int(2 * math.pi * radius * 1000)  # mm
+        self._min_speed = max(1, int(min_speed * 1000))         # mm/s
+        self._period_at_min_speed = self._circumference * 1000 // self._min_speed  # ms
         self.rounding = rounding
         self.attr = attr
-        self.unit = unit
+        self._unit = unit
 
-        # Hall Sensor
+        # Hall Sensor (ticks in ms)
         self._time_last = None
         self._period_last = None
+        self._ticks = array(self.typecode, [0] * _TICKS_SIZE)
+        self._head = 0      # Next tick written (count)
+        self._tail = 0      # Next tick read (calculate)
+        self.missed = 0     # Revolutions lost (ring full)
 
-        # Data
+        # Data (ms, mm/s, mm/s², mm)
         self._estimated_period = 0
         self._period = 0
         self._speed = 0
@@ -67,19 +88,39 @@ class Speedometer(TriggerTimer):
         self._distance = 0
 
         # Records
-        self._max_speed = kmh_to_ms(max_speed) if self.unit == 1 else ms_to_kmh(kmh_to_ms(max_speed)) if self.unit == 2 else max_speed
-        self._odometer = kmh_to_ms(odometer) if self.unit == 1 else ms_to_kmh(kmh_to_ms(odometer)) if self.unit == 2 else odometer
+        self._max_speed = int(max_speed * (1609 / 3.6 if self.unit == 2 else 1000 / 3.6 if self.unit == 1 else 1000))  # mm/s
+        self._odometer = int(odometer * (1609000 if self.unit == 2 else 1000000 if self.unit == 1 else 1000))  # mm
         self._total_duration = total_duration
-        self.start = self.now
+        self.start = self.ticks()
 
-        # Average
-        self.average_speed = Average(points)
+        # Average (ring of the last speeds, mm/s)
+        self._speeds = array("l", [0] * max(1, points))
+        self._speeds_head = 0
+        self._speeds_count = 0
+        self._speeds_sum = 0
+
+        # Presentation (cached until the next revolution)
+        self._presented = {}
+
+        # Analytics (fed at each revolution)
+        self.analytics = None
 
         super().__init__(
             name=name, is_logging=is_logging, style=style,
             funcs=self.calculate, wait_refresh=wait_refresh, initially_active=initially_active, uses_active=uses_active,
         )
 
+    # Unit (the presented values are in the former one)
+
+    @property
+    def unit(self) -> int:
+        return self._unit
+
+    @unit.setter
+    def unit(self, value: int):
+        self._unit = value
+        self._presented.clear()
+
     # Radius
 
     @property
@@ -88,83 +129,131 @@ class Speedometer(TriggerTimer):
 
     @radius.setter
     def radius(self, value):
-        self._period_at_min_speed = linear_speed_to_period(
-            period_to_linear_speed(self._period_at_min_speed, self._radius), value
-        )
         self._radius = value
+        self._circumference = int(2 * math.pi * value * 1000)
+        self._period_at_min_speed = self._circumference * 1000 // self._min_speed
 
     # To edit when using a different way to get time
 
-    @property
-    def now(self):
-        return rounder(time.time(), self.rounding)
+    def ticks(self) -> int:
+        """ Milliseconds (int). """
+        return int(time.time() * 1000)
 
-    def diff(self, before=None, now=None):
-        return rounder(
-            (self.now if now is None else now) - (self._time_last if before is None else before),
-            self.rounding
-        )
+    def ticks_diff(self, after: int, before: int) -> int:
+        return after - before
+
+    def diff(self) -> int:
+        """ Milliseconds since the last revolution. """
+        return self.ticks_diff(self.ticks(), self._time_last)
 
     # Callbacks (Hall sensor and Speedometer)
 
     def count(self, _=None):
         """ Hall sensor calls this function each time the sensor detects a magnetic field (each revolution). """
-        if self._time_last is None:
-            self._time_last = self.now
-        else:
-            self._period_last = self.diff()
-            self._time_last = self.now
+        head = self._head
+        following = (head + 1) & _TICKS_MASK
+        if following == self._tail:
+            self.missed += 1
+            return
+        self._ticks[head] = self.ticks()
+        self._head = following
 
     def calculate(self, _=None):
+        # New revolutions (all since the last call)
+        revolutions = 0
+        while self._tail != self._head:
+            moment = self._ticks[self._tail]
+            self._tail = (self._tail + 1) & _TICKS_MASK
+            if self._time_last is not None:
+                period = self.ticks_diff(moment, self._time_last)
+                if period > 0:
+                    self._period_last = period
+                    self._period = period
+                    self._estimated_period = period
+                    self.revolution(period)
+                    revolutions += 1
+            self._time_last = moment
+        if revolutions:
+            return
+
         # Not on
         if self._period_last is None or self._time_last is None:
             return
 
-        # New revolution
-        if self._period_last != self._period:
-            self._period = self._period_last
-            self._estimated_period = self._period
+        elapsed = self.diff()
         # Speed is at minimum
-        elif self._period_at_min_speed <= self.diff():
+        if self._period_at_min_speed <= elapsed:
             self._period = 0
             self._estimated_period = self._period
             self._speed = 0
             self._acceleration = 0
             self._period_last = None
             self._time_last = None
+            self._speeds_count = 0
+            self._speeds_sum = 0
+            self._presented.clear()
+            if self.analytics is not None:
+                self.analytics.stop()
             return
         # Speed is decreasing
-        elif self._period_last < self.diff():
-            self._estimated_period = self.diff()
+        elif self._period_last < elapsed:
+            self._estimated_period = elapsed
         # Same as before
         else:
             return
+        self.revolution(self._estimated_period)
 
-        # Calculate speed...
-        speed = period_to_linear_speed(self._estimated_period, self._radius)
+    def revolution(self, period: int):
+        """ Speed (mm/s), acceleration (mm/s²) and distance (mm) after a revolution of period ms. """
+        speed = self._circumference * 1000 // period
 
         # Average
-        self.average_speed.collect(speed)
-        avg = float(self.average_speed)
+        if self._speeds_count == len(self._speeds):
+            self._speeds_sum -= self._speeds[self._speeds_head]
+        else:
+            self._speeds_count += 1
+        self._speeds[self._speeds_head] = speed
+        self._speeds_sum += speed
+        self._speeds_head = (self._speeds_head + 1) % len(self._speeds)
+        avg = self._speeds_sum // self._speeds_count
 
         # Data
-        self._acceleration = rounder(acceleration(self._speed, avg, self._estimated_period), self.rounding)
-        self._distance += rounder(displacement(avg, self._speed, self._estimated_period), self.rounding)
-        self._speed = rounder(avg, self.rounding)
+        self._acceleration = (avg - self._speed) * 1000 // period
+        self._distance += (avg + self._speed) * period // 2000
+        self._speed = avg
 
         # Records
-        self._max_speed = max(self._max_speed, self._speed)
-        gc.collect()
+        if self._speed > self._max_speed:
+            self._max_speed = self._speed
+        self._presented.clear()
+        if self.analytics is not None:
+            self.analytics.revolution(avg)
+
+    def reset(self):
+        """ New trip: its distance and duration added to the records (odometer, total duration). """
+        self._odometer += self._distance
+        self._total_duration += self.duration
+        self._distance = 0
+        self.start = self.ticks()
+        self._presented.clear()
+
+    # Presentation (converted and rounded once per revolution)
+
+    def _present(self, key: str, value: float):
+        presented = rounder(value, self.rounding)
+        self._presented[key] = presented
+        return presented
 
     # Speed (SI units, European, Imperial)
 
     @property
     def max_speed(self):
-        return rounder(
-            ms_to_kmh(km_to_miles(self._max_speed)) if self.unit == 2
-                else ms_to_kmh(self._max_speed) if self.unit == 1 else self._max_speed,
-            self.rounding
-        )
+        presented = self._presented.get("max_speed")
+        if presented is None:
+            presented = self._present("max_speed", self._max_speed * (
+                0.0036 / 1.609 if self.unit == 2 else 0.0036 if self.unit == 1 else 0.001
+            ))
+        return presented
 
     @property
     def speed(self):
@@ -172,15 +261,18 @@ class Speedometer(TriggerTimer):
 
     @property
     def kmh(self):
-        return rounder(ms_to_kmh(self._speed), self.rounding)
+        presented = self._presented.get("kmh")
+        return self._present("kmh", self._speed * 0.0036) if presented is None else presented
 
     @property
     def mph(self):
-        return rounder(km_to_miles(self.kmh), self.rounding)
+        presented = self._presented.get("mph")
+        return self._present("mph", self._speed * 0.0036 / 1.609) if presented is None else presented
 
     @property
     def ms(self):
-        return rounder(self._speed, self.rounding)
+        presented = self._presented.get("ms")
+        return self._present("ms", self._speed / 1000) if presented is None else presented
 
     # Distance (SI units, European, Imperial)
 
@@ -190,27 +282,31 @@ class Speedometer(TriggerTimer):
 
     @property
     def kilometers(self):
-        return rounder(self._distance / 1000, self.rounding)
+        presented = self._presented.get("kilometers")
+        return self._present("kilometers", self._distance / 1000000) if presented is None else presented
 
     @property
     def miles(self):
-        return rounder(km_to_miles(self._distance / 1000), self.rounding)
+        presented = self._presented.get("miles")
+        return self._present("miles", self._distance / 1000000 / 1.609) if presented is None else presented
 
     @property
     def meters(self):
-        return rounder(self._distance, self.rounding)
+        presented = self._presented.get("meters")
+        return self._present("meters", self._distance / 1000) if presented is None else presented
 
     # Acceleration (only in SI units)
 
     @property
     def acceleration(self):
-        return rounder(self._acceleration, self.rounding)
+        presented = self._presented.get("acceleration")
+        return self._present("acceleration", self._acceleration / 1000) if presented is None else presented
 
     # Duration / Odometer
 
     @property
     def duration(self) -> int:
-        return int(self.diff(before=self.start))
+        return self.ticks_diff(self.ticks(), self.start) // 1000
 
     @property
     def total_duration(self) -> int:
@@ -218,11 +314,12 @@ class Speedometer(TriggerTimer):
 
     @property
     def odometer(self) -> float:
-        return rounder(
-            km_to_miles((self._odometer + self._distance)/1000) if self.unit == 2
-                else (self._odometer + self._distance)/1000 if self.unit == 1 else self._odometer + self._distance,
-            self.rounding
-        )
+        presented = self._presented.get("odometer")
+        if presented is None:
+            millimeters = self._odometer + self._distance
+            presented = self._present("odometer", millimeters / 1000000 / 1.609 if self.unit == 2
+                                      else millimeters / 1000000 if self.unit == 1 else millimeters / 1000)
+        return presented
 
     # Value
 
@@ -232,4 +329,3 @@ class Speedometer(TriggerTimer):
 
 
 gc.collect()
-
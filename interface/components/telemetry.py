@@ -0,0 +1,215 @@
+
+import gc
+gc.collect()
+
+import time
+from array import array
+
+from interface.operational.triggers import Refresher
+from interface.components.files import LogManager
+
+_NAN = float("nan")
+
+
+# =========================== #
+#           Channels          #
+# =========================== #
+
+
+class Channel:
+    """ A recorded source: get() -> float (or None), sampled every `every` ticks of the recorder. """
+
+    def __init__(self, name: str, get, every: int = 1, rounding: int | None = 2):
+        self.name = name
+        self.get = get
+        self.every = max(1, int(every))
+        self.rounding = rounding
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.name}, every={self.every})"
+
+    def sample(self) -> float:
+        try:
+            value = self.get()
+        except Exception:
+            return _NAN
+        return _NAN if value is None else float(value)
+
+
+gc.collect()
+
+
+# =========================== #
+#           Recorder          #
+# =========================== #
+
+
+class Recorder(Refresher):
+    """ **Ride telemetry**: samples channels into a RAM ring buffer and flushes blocks to a LogManager.
+
+    - Ring buffer: preallocated arrays (times and one row of values per tick), nothing allocated while sampling.
+    - Each `block` rows, the new rows are written as one record {"time", "names", "period", "rows"} (LogManager buffers).
+    - Memory pressure (gc.mem_free below memory_low): decimation doubles (one tick out of n recorded, up to
+      decimation_max), halved again once above memory_high.
+    - A full ring before the flush overwrites the oldest rows (counted in `dropped`).
+    - upload(phone) sends the blocks recorded since the last upload (streamed from the files) to the PhoneAPI.
+    """
+
+    def __init__(self, channels: list[Channel], manager: LogManager | None = None,
+                 size: int = 120, block: int = 30,
+                 memory_low: int = 16384, memory_high: int = 32768, decimation_max: int = 8,
+                 wait_refresh: int | float = 1, clock=None,
+                 name: str = None, is_logging: bool = None, style: str = None,
+                 initially_active: bool = True):
+        self.channels = [channel for channel in channels if channel is not None]
+        self.manager = manager
+        self.clock = clock
+
+        # Ring buffer (size rows of len(channels) values)
+        self.size = size
+        self.block = min(block, size)
+        self.width = len(self.channels)
+        self.times = array('f', [0.0] * size)
+        self.values = array('f', [_NAN] * (size * self.width))
+        self.head = 0       # Next row
+        self.count = 0      # Rows in the ring
+        self.pending = 0    # Rows not flushed
+        self.dropped = 0
+        self.ticks = 0
+        self.started = time.time()
+
+        # Upload cursor: time of the last block uploaded (and blocks of that time uploaded)
+        self.uploaded: str | None = None
+        self.uploaded_count = 0
+
+        # Memory pressure
+        self.memory_low = memory_low
+        self.memory_high = memory_high
+        self.decimation = 1
+        self.decimation_max = decimation_max
+
+        super().__init__(
+            name=name, is_logging=is_logging, style=style,
+            wait_refresh=wait_refresh, initially_active=initially_active,
+        )
+
+    @property
+    def names(self) -> list[str]:
+        return [channel.name for channel in self.channels]
+
+    @property
+    def now(self) -> str:
+        return "{:04d}-{:02d}-{:02d}T{:02d}:{:02d}:{:02d}".format(*time.localtime()[:6]) if self.clock is None else self.clock.iso
+
+    """ Memory """
+
+    def check_memory(self):
+        if not hasattr(gc, "mem_free"):
+            return
+        free = gc.mem_free()
+        if free < self.memory_low and self.decimation < self.decimation_max:
+            self.decimation *= 2
+            self.logging(f"Low memory ({free}B): recording 1 tick out of {self.decimation}", level="WARNING")
+        elif free > self.memory_high and self.decimation > 1:
+            self.decimation //= 2
+            self.logging(f"Memory back ({free}B): recording 1 tick out of {self.decimation}", level="INFO")
+
+    """ Sampling """
+
+    def sample(self):
+        """ Record one row (channels not due this tick are NaN). """
+        row = self.head * self.width
+        self.times[self.head] = time.time() - self.started
+        for i, channel in enumerate(self.channels):
+            self.values[row + i] = channel.sample() if self.ticks % channel.every == 0 else _NAN
+        self.head = (self.head + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+        if self.pending < self.size:
+            self.pending += 1
+        else:
+            self.dropped += 1
+
+    def rows(self, last: int | None = None):
+        """ Generator of the last rows of the ring (oldest first): (time, [values]). """
+        last = self.count if last is None else min(last, self.count)
+        for n in range(last, 0, -1):
+            index = (self.head - n) % self.size
+            row = index * self.width
+            yield self.times[index], [self.values[row + i] for i in range(self.width)]
+
+    def update(self):
+        if self.ticks % 16 == 0:
+            self.check_memory()
+        if self.ticks % self.decimation == 0:
+            self.sample()
+            if self.pending >= self.block:
+                self.flush()
+        self.ticks += 1
+
+    """ Flush """
+
+    def to_dict(self, last: int | None = None) -> dict:
+        """ Block of the last rows: [seconds since start, values...], NaN -> None, values rounded per channel. """
+        roundings = [channel.rounding for channel in self.channels]
+        rows = []
+        for moment, values in self.rows(last):
+            rows.append([round(moment, 2)] + [
+                None if value != value else round(value, rounding) if rounding is not None else value
+                for value, rounding in zip(values, roundings)
+            ])
+        return {
+            "time": self.now, "names": self.names, "period": self.wait_refresh * self.decimation, "rows": rows,
+        }
+
+    def flush(self) -> bool:
+        if self.manager is None:
+            self.pending = 0
+        if self.pending == 0:
+            return True
+        data = self.to_dict(self.pending)
+        self.pending = 0
+        gc.collect()
+        return self.manager.log(data)
+
+    def close(self):
+        self.flush()
+        if self.manager is not None:
+            self.manager.close()
+
+    """ Upload """
+
+    async def upload(self, phone, start: str | None = None, end: str | None = None, amount: int = 4) -> bool:
+        """ (Async) Send the blocks recorded since the last upload (or start) to the phone,
+        amount blocks per request (streamed from the files). """
+        self.flush()
+        if self.manager is None:
+            return await phone.write_telemetry([self.to_dict()])
+        start = self.uploaded if start is None else start
+        skip = self.uploaded_count if start is not None and start == self.uploaded else 0
+        blocks = []
+        for record in self.manager.records(start=start, end=end):
+            # Blocks of the same second as the cursor already uploaded
+            if skip and record.get("time") == start:
+                skip -= 1
+                continue
+            blocks.append(record)
+            if len(blocks) >= amount:
+                if not await self._upload(phone, blocks):
+                    return False
+                blocks = []
+        return await self._upload(phone, blocks) if blocks else True
+
+    async def _upload(self, phone, blocks: list[dict]) -> bool:
+        if not await phone.write_telemetry(blocks):
+            return False
+        for block in blocks:
+            moment = block.get("time")
+            if moment == self.uploaded:
+                self.uploaded_count += 1
+            else:
+                self.uploaded, self.uploaded_count = moment, 1
+        return True
+
+
+gc.collect()
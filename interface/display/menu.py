@@ -4,6 +4,7 @@ gc.collect()
 
 # Interface -> Basic
 from interface.basic.scale import Scale
+from interface.basic.utils import schedule
 
 # Interface -> Operational
 from interface.operational.triggers import Trigger
@@ -168,7 +169,7 @@ class State(Selection):
             if self.trigger is not None:
                 self.trigger.set_value(self.index)
             if self.callback is not None:
-                self.callback(self.value)
+                schedule(self.callback(self.value))
 
     def cancel(self):
         super().cancel()
@@ -186,7 +187,7 @@ class Function(Option):
     # Enter / Exit
 
     def enter(self):
-        self.callback()
+        schedule(self.callback())
         self.exit()
 
 
@@ -204,7 +205,7 @@ class CheckBox(Option):
     def enter(self):
         self.value = not self.value
         self.icon = "checked" if self.value else "unchecked"
-        self.callback(self.value)
+        schedule(self.callback(self.value))
         self.exit()
 
 
@@ -17,7 +17,8 @@ from interface.operational.special import TriggerButton, TriggerAnalog
 from interface.operational.triggers import Refresher
 
 # Logic -> Features
-from interface.features.wireless import RearBluetooth, DirectionBluetooth, BrakeBluetooth, ToBackBluetooth, ToFrontBluetooth
+from interface.features.wireless import (RearBluetooth, DirectionBluetooth, BrakeBluetooth, ToBackBluetooth, ToFrontBluetooth,
+                                         ConnectionPolicy)
 from interface.features.settings import RearSettings, DirectionSettings, BrakeSettings, GeneralBackSettings
 
 
@@ -37,6 +38,7 @@ class Back(Feature):
                  sender: ToFrontBluetooth | None = None, receiver: ToBackBluetooth | None = None,
                  receiver_rear: RearBluetooth | None = None,
                  receiver_dir: DirectionBluetooth | None = None, receiver_brake: BrakeBluetooth | None = None,
+                 policy: ConnectionPolicy | None = None,
                  # Logging + Initiate
                  name: str = None, is_logging: bool = None, style: str = None, initiate_first_action: bool = False,
                  ):
@@ -57,6 +59,7 @@ class Back(Feature):
         self.receiver_rear = receiver_rear
         self.receiver_dir = receiver_dir
         self.receiver_brake = receiver_brake
+        self.policy = policy
 
         # Inputs
         self.input_rear = rear
@@ -98,6 +101,8 @@ class Back(Feature):
         if self.receiver is not None:
             self.receiver.eco.add(funcs=self.callback_eco)
             self.receiver.eco.resume()
+            if self.policy is not None:
+                self.receiver.moving.resume()
 
         # Connect to ble
         if self.bluetooth is not None:
@@ -108,7 +113,7 @@ class Back(Feature):
             to_refresh=[
                 self.output_status, self.output_rear, self.output_brake,
                 self.output_left, self.output_right, self.output_warning,
-                self.bluetooth, self.service,
+                self.bluetooth, self.service, self.policy,
                 self.input_rear, self.input_eco, self.input_temperature, self.input_battery,
             ], to_initiate=[]
         )
@@ -173,6 +178,7 @@ class Back(Feature):
                       sender: ToFrontBluetooth | None = None, receiver: ToBackBluetooth | None = None,
                       receiver_rear: RearBluetooth | None = None,
                       receiver_dir: DirectionBluetooth | None = None, receiver_brake: BrakeBluetooth | None = None,
+                      policy: ConnectionPolicy | bool | None = None,
                       # Settings
                       settings_rear: RearSettings | None = None, settings_brake: BrakeSettings | None = None,
                       settings_dir: DirectionSettings | None = None, settings_general: GeneralBackSettings | None = None,
@@ -259,12 +265,21 @@ class Back(Feature):
 
         gc.collect()
 
+        # Bluetooth
+        policy = ConnectionPolicy(
+            bluetooth, moving=receiver.moving if receiver is not None else None, eco=eco,
+            signals=[feature.activation for feature in [receiver_brake, receiver_dir] if feature is not None],
+            interval_fast=settings_general.interval_fast, interval_slow=settings_general.interval_slow,
+            name=f"{name}Policy", is_logging=is_logging, style=style,
+        ) if not isinstance(policy, ConnectionPolicy) and policy is not None and bluetooth is not None else policy
+        gc.collect()
+
         return cls(
             output_status=output_status, output_rear=output_rear, output_brake=output_brake,
             output_left=output_left, output_right=output_right, output_warning=output_warning,
             rear=rear, eco=eco, temperature=temperature, battery=battery,
             bluetooth=bluetooth, service=service, sender=sender, receiver=receiver,
-            receiver_rear=receiver_rear, receiver_dir=receiver_dir, receiver_brake=receiver_brake,
+            receiver_rear=receiver_rear, receiver_dir=receiver_dir, receiver_brake=receiver_brake, policy=policy,
             name=name, is_logging=is_logging, style=style, initiate_first_action=initiate_first_action,
         )
 
@@ -3,6 +3,7 @@ import asyncio
 
 # Logic -> Basic
 from interface.basic.scale import Scale
+from interface.basic.utils import schedule
 
 # Logic -> Display
 from interface.display.apps import Screen
@@ -12,21 +13,29 @@ from interface.display.menu import Selection
 # Logic -> Components
 from interface.components.indicator import Indicator
 from interface.components.speedometer import Speedometer
+from interface.components.analytics import Analytics
+from interface.components.fusion import BrakeFusion, IMUBatches
 from interface.components.clock import Clock
-from interface.wireless.phone import PhoneAPI
+from interface.wireless.phone import PhoneAPI, PhoneUploader
+from interface.wireless.wifi import WifiManager
+from interface.wireless.location import LocationAPI
 from interface.components.ble import Bluetooth, Service
+from interface.components.telemetry import Recorder, Channel
+from interface.components.files import LogManager
 
 # Logic -> Operational
 from interface.operational.triggers import Refresher
 from interface.operational.special import TriggerButton, TriggerScale, TriggerComparison, TriggerAnalog, Input
-from interface.operational.timer import TriggerClock, TriggerTimer
+from interface.operational.timer import TriggerClock, TriggerSun, TriggerTimer
+from interface.basic.solar import Sun
 from interface.operational.feature import Feature
 
 # Logic -> Features
 from interface.features.settings import (RearSettings, DirectionSettings, BrakeSettings, GeneralSettings,
                                          PERIOD_SCALE, MODES_SCALE, MANUAL_SCALE, TYPES_SCALE, ENABLE_TEXT)
 
-from interface.features.wireless import RearBluetooth, DirectionBluetooth, BrakeBluetooth, ToFrontBluetooth, ToBackBluetooth
+from interface.features.wireless import (RearBluetooth, DirectionBluetooth, BrakeBluetooth, ToFrontBluetooth, ToBackBluetooth,
+                                         ConnectionPolicy)
 
 
 
@@ -46,6 +55,7 @@ class Front(Feature):
                  # Inputs (Brake)
                  enable: TriggerScale | None = None, speedometer: Speedometer | None = None,
                  hall: TriggerButton | None = None, acceleration: TriggerComparison | None = None,
+                 analytics: Analytics | None = None, fusion: BrakeFusion | None = None, batches: IMUBatches | None = None,
                  # Inputs (Display)
                  dis_left: TriggerButton | None = None, dis_right: TriggerButton | None = None,
                  dis_select: TriggerButton | None = None, dis_cancel: TriggerButton | None = None,
@@ -58,8 +68,11 @@ class Front(Feature):
                  receiver: ToFrontBluetooth | None = None, sender: ToBackBluetooth | None = None,
                  sender_rear: RearBluetooth | None = None,
                  sender_dir: DirectionBluetooth | None = None, sender_brake: BrakeBluetooth | None = None,
+                 policy: ConnectionPolicy | None = None,
                  # Wifi
-                 phone: PhoneAPI | None = None,
+                 phone: PhoneAPI | None = None, uploader: PhoneUploader | None = None, wifi: WifiManager | None = None,
+                 # Telemetry
+                 recorder: Recorder | None = None,
                  # Settings
                  settings_rear: RearSettings | None = None, settings_brake: BrakeSettings | None = None,
                  settings_dir: DirectionSettings | None = None, settings_general: GeneralSettings | None = None,
@@ -84,9 +97,15 @@ class Front(Feature):
         self.sender_rear = sender_rear
         self.sender_dir = sender_dir
         self.sender_brake = sender_brake
+        self.policy = policy
 
         # Wifi
         self.phone = phone
+        self.uploader = uploader
+        self.wifi = wifi
+
+        # Telemetry
+        self.recorder = recorder
 
         # Inputs (Rear)
         self.activation = activation
@@ -110,6 +129,9 @@ class Front(Feature):
         self.speedometer = speedometer
         self.hall = hall
         self.acceleration = acceleration
+        self.analytics = analytics
+        self.fusion = fusion
+        self.batches = batches
 
         # Inputs (Display)
         self.dis_left = dis_left
@@ -164,13 +186,15 @@ class Front(Feature):
             name=name, is_logging=is_logging, style=style, initiate_first_action=initiate_first_action,
             to_refresh=[
                 self.output_left, self.output_right, self.output_warning,
-                self.bluetooth, self.service,
+                self.bluetooth, self.service, self.policy,
                 self.activation, self.frequency, self.modes, self.types, self.manual, self.dark, self.night,
                 self.left, self.right, self.warning, self.beep,
-                self.enable, self.speedometer, self.hall, self.acceleration,
+                self.enable, self.speedometer, self.hall, self.acceleration, self.fusion, self.batches,
                 self.dis_left, self.dis_right, self.dis_select, self.dis_cancel,
                 self.keys, self.apps, self.timing, self.eco,
-                self.amplification, self.automatic
+                self.amplification, self.automatic,
+                self.recorder, self.recorder.manager if self.recorder is not None else None,
+                self.uploader,
             ],
             to_initiate=[
                 self.enable, self.speedometer, self.hall, self.acceleration, self.amplification, self.automatic,
@@ -187,13 +211,14 @@ class Front(Feature):
                       activation=None, frequency=None,
                       modes=None, types=None, manual=None,
                       dark=None, night=None,
-                      light=None, clock: Clock | None = None,
+                      light=None, clock: Clock | None = None, location: LocationAPI | None = None,
                       # Inputs (Dir)
                       left=None, right=None,
                       warning=None, beep=None,
                       # Inputs (Brake)
                       enable=None, speedometer: Speedometer | bool | None = None,
-                      hall=None, acceleration=None,
+                      hall=None, acceleration=None, analytics: Analytics | bool | None = None,
+                      imu=None, fusion: BrakeFusion | None = None, batches: IMUBatches | None = None,
                       # Inputs (Display)
                       dis_left=None, dis_right=None,
                       dis_select=None, dis_cancel=None,
@@ -205,8 +230,12 @@ class Front(Feature):
                       receiver: ToFrontBluetooth | None = None, sender: ToBackBluetooth | None = None,
                       sender_rear: RearBluetooth | None = None,
                       sender_dir: DirectionBluetooth | None = None, sender_brake: BrakeBluetooth | None = None,
+                      policy: ConnectionPolicy | bool | None = None,
                       # Wifi
-                      phone: PhoneAPI | None = None,
+                      phone: PhoneAPI | None = None, uploader: PhoneUploader | bool | None = None,
+                      wifi: WifiManager | None = None,
+                      # Telemetry (Recorder, LogManager or folder to flush to, True for RAM only)
+                      recorder: Recorder | LogManager | str | bool | None = None,
                       # Settings
                       settings_rear: RearSettings | None = None, settings_brake: BrakeSettings | None = None,
                       settings_dir: DirectionSettings | None = None, settings_general: GeneralSettings | None = None,
@@ -286,7 +315,11 @@ class Front(Feature):
             name=f"{name}Dark", is_logging=is_logging, style=style, uses_active=True, initially_active=False
         ) if not isinstance(dark, Refresher) and dark is not None else dark
 
-        night = TriggerClock(
+        night = TriggerSun(
+            source=night, sun=Sun(settings_general.latitude, settings_general.longitude, settings_general.utc_offset),
+            operator=">=<", location=location,
+            name=f"{name}Night", is_logging=is_logging, style=style, uses_active=True, initially_active=False
+        ) if isinstance(night, Clock) and settings_general.night_sun else TriggerClock(
             source=night if not isinstance(night, bool) else Input(),
             lower=settings_general.limit_morning, upper=settings_general.limit_evening, operator=">=<",
             name=f"{name}Night", is_logging=is_logging, style=style, uses_active=True, initially_active=False
@@ -330,7 +363,7 @@ class Front(Feature):
             radius=settings_general.radius, min_speed=settings_general.min_speed,
             unit=settings_general.unit_speed, rounding=settings_general.rounding,
             max_speed=settings_general.max_speed, odometer=settings_general.odometer,
-            points=settings_general.points_speed, attr="acceleration",
+            total_duration=settings_general.total_duration, points=settings_general.points_speed, attr="acceleration",
             name=f"Speedometer", is_logging=is_logging, style=style, uses_active=uses_shared,
             initially_active=settings_general.enable > 0,
         ) if not isinstance(speedometer, Speedometer) and speedometer is not None else speedometer
@@ -341,13 +374,37 @@ class Front(Feature):
             initially_active=settings_general.enable > 1, uses_active=True,
         ) if not isinstance(hall, Refresher) and hall is not None else hall
 
+        batches = IMUBatches(
+            imu, wait_refresh=settings_general.wait_refresh_imu,
+            name=f"{name}IMU", is_logging=is_logging, style=style, uses_active=True,
+            initially_active=settings_general.enable > 1,
+        ) if batches is None and imu is not None and fusion is None and settings_general.imu_fifo \
+            and hasattr(imu, "fifo_read") else batches
+
+        fusion = BrakeFusion(
+            imu, speedometer=speedometer, axis=settings_general.fusion_axis, sign=settings_general.fusion_sign,
+            tau=settings_general.fusion_tau, smoothing=settings_general.fusion_smoothing,
+            batches=batches, wait_refresh=settings_general.wait_refresh_fusion,
+            name=f"{name}Fusion", is_logging=is_logging, style=style, uses_active=True,
+            initially_active=settings_general.enable > 1,
+        ) if fusion is None and imu is not None else fusion
+
         acceleration = TriggerComparison(
-            source=speedometer, wait_refresh=settings_general.wait_refresh_acceleration,
+            source=speedometer if fusion is None else fusion,
+            wait_refresh=settings_general.wait_refresh_acceleration if fusion is None else settings_general.wait_refresh_fusion,
             lower=settings_general.limit_acceleration, operator="<", switch=True,
+            expansion_lower=settings_general.expansion_acceleration,
             name=f"{name}Acceleration", is_logging=is_logging, style=style, uses_active=True,
             initially_active=settings_general.enable > 1,
         ) if not isinstance(acceleration, Refresher) and acceleration is not None and speedometer is not None else acceleration
 
+        analytics = Analytics(
+            source=speedometer, settings=settings_general,
+            auto_pause=settings_general.auto_pause, pause_speed=settings_general.pause_speed, split=settings_general.split,
+            name=f"{name}Analytics", is_logging=is_logging, style=style,
+        ) if not isinstance(analytics, Analytics) and analytics is not None and analytics is not False \
+            and speedometer is not None else analytics or None
+
         # Inputs (Display)
         dis_left = TriggerButton(
             source=dis_left if not isinstance(dis_left, bool) else Input(), initial=False,
@@ -414,6 +471,46 @@ class Front(Feature):
             name=f"{name}Auto", is_logging=is_logging, style=style, uses_active=True, initially_active=False
         ) if not isinstance(automatic, Refresher) and automatic is not None else automatic
 
+        # Bluetooth
+        policy = ConnectionPolicy(
+            bluetooth, speedometer=speedometer, eco=eco,
+            signals=[feature.activation for feature in [sender_brake, sender_dir] if feature is not None],
+            interval_fast=settings_general.interval_fast, interval_slow=settings_general.interval_slow,
+            advertising_fast=settings_general.advertising_fast, advertising_slow=settings_general.advertising_slow,
+            advertising_stretch=settings_general.advertising_stretch,
+            name=f"{name}Policy", is_logging=is_logging, style=style,
+        ) if not isinstance(policy, ConnectionPolicy) and policy is not None and bluetooth is not None else policy
+
+        # Wifi
+        uploader = PhoneUploader(
+            phone, size=settings_general.sending_size, wait_refresh=settings_general.wait_refresh_sending,
+            name=f"{name}Uploader", is_logging=is_logging, style=style,
+        ) if not isinstance(uploader, PhoneUploader) and uploader is not None and uploader is not False \
+            and phone is not None else uploader or None
+
+        # Telemetry
+        every = settings_general.wait_refresh_recording
+        recorder = Recorder(
+            channels=[
+                Channel("speed", lambda: speedometer.ms) if speedometer is not None else None,
+                Channel("acceleration", lambda: speedometer.acceleration) if speedometer is not None else None,
+                Channel("distance", lambda: speedometer.meters, every=5 / every) if speedometer is not None else None,
+                Channel("light", lambda: light.value, every=5 / every) if light is not None else None,
+                Channel("battery_front", lambda: battery.value, every=settings_general.wait_refresh_battery / every)
+                if battery is not None else None,
+                Channel("battery_back", lambda: receiver.battery.value, every=settings_general.wait_refresh_battery / every)
+                if receiver is not None else None,
+                Channel("temperature", lambda: receiver.temperature.value, every=settings_general.wait_refresh_temp / every)
+                if receiver is not None else None,
+            ],
+            manager=recorder if isinstance(recorder, LogManager) else LogManager(
+                recorder, naming="ride", clock=clock, archive=True, name=f"{name}Rides", is_logging=is_logging, style=style,
+            ) if isinstance(recorder, str) else None,
+            size=settings_general.recording_size, block=settings_general.recording_block,
+            wait_refresh=every, clock=clock,
+            name=f"{name}Recorder", is_logging=is_logging, style=style,
+        ) if not isinstance(recorder, Recorder) and recorder is not None and recorder is not False else recorder or None
+
         return cls(
             output_left=output_left, output_right=output_right, output_warning=output_warning,
             screen=screen,
@@ -421,11 +518,12 @@ class Front(Feature):
             dark=dark, night=night, light=light, clock=clock,
             left=left, right=right, warning=warning, beep=beep,
             enable=enable, speedometer=speedometer, hall=hall, acceleration=acceleration,
+            analytics=analytics, fusion=fusion, batches=batches,
             keys=keys, apps=apps, timing=timing, dis_left=dis_left, dis_right=dis_right, dis_select=dis_select, dis_cancel=dis_cancel,
             eco=eco, battery=battery, amplification=amplification, automatic=automatic,
             bluetooth=bluetooth, service=service, receiver=receiver, sender=sender,
-            sender_rear=sender_rear, sender_dir=sender_dir, sender_brake=sender_brake,
-            phone=phone,
+            sender_rear=sender_rear, sender_dir=sender_dir, sender_brake=sender_brake, policy=policy,
+            phone=phone, uploader=uploader, wifi=wifi, recorder=recorder,
             settings_rear=settings_rear, settings_brake=settings_brake, settings_dir=settings_dir,
             settings_general=settings_general,
             name=name, is_logging=is_logging, style=style, initiate_first_action=initiate_first_action,
@@ -511,6 +609,9 @@ class Front(Feature):
             if self.screen is not None:
                 self.screen.speed_unit(self.speedometer.unit)
                 self.screen.distance_unit(self.speedometer.unit)
+        if self.speedometer is not None and self.sender is not None:
+            self.speedometer.add(funcs=self.callback_moving)
+            self.sender.moving.resume()
         if self.sender_brake is not None:
             if self.acceleration is not None:
                 self.acceleration.add(funcs=self.sender_brake.activation.set_value)
@@ -772,10 +873,24 @@ class Front(Feature):
             if value > 1:
                 self.hall.resume()
                 self.acceleration.resume()
+                if self.fusion is not None:
+                    self.fusion.resume()
+                if self.batches is not None:
+                    self.batches.resume()
         else:
             self.speedometer.pause()
             self.hall.pause()
             self.acceleration.pause()
+            if self.fusion is not None:
+                self.fusion.pause()
+            if self.batches is not None:
+                self.batches.pause()
+
+    def callback_moving(self, _=None):
+        """ Share whether riding or parked (for the connection policy of the back). """
+        moving = self.speedometer.speed > 0
+        if self.sender.moving.value != moving:
+            self.sender.moving.set_value(moving)
 
     """ Display """
 
@@ -821,17 +936,30 @@ class Front(Feature):
             pin_a.toggle_activation()
             pin_b.set_activation(not pin_a.is_active)
 
-    def callback_eco(self, _=None):
-        self.logging("Eco Mode is not implemented yet !")
+    def callback_eco(self, value=None):
+        """ Eco: the wifi is only on while requests wait for it (and idle seconds after). """
+        if self.wifi is not None:
+            self.wifi.set_eco(bool(value))
+        self.logging(f"Eco Mode: {bool(value)}", "INFO")
 
     def callback_sending(self, _=None):
         self.sending = not self.sending
         if self.screen is not None:
             self.screen.sending(self.sending)
         self.callback_screen()
+        if self.sending and self.phone is not None and self.recorder is not None:
+            self.phone.queue(self.recorder.upload, self.phone)
 
     def callback_reset(self, _=None):
-        self.logging("Reset Button is not implemented yet !")
+        """ New trip (records saved). """
+        if self.analytics is not None:
+            self.analytics.reset()
+        elif self.speedometer is not None:
+            self.speedometer.reset()
+        if self.speedometer is not None:
+            self.callback_speed()
+            self.callback_distance()
+            self.callback_duration()
 
     # Speed
 
@@ -856,7 +984,10 @@ class Front(Feature):
 
     def callback_duration(self, _=None):
         if self.screen is not None:
-            self.screen.duration(self.speedometer.total_duration if self.setting_odometer else self.speedometer.duration)
+            self.screen.duration(
+                self.speedometer.total_duration if self.setting_odometer
+                else self.analytics.moving_time if self.analytics is not None else self.speedometer.duration
+            )
 
     def callback_speed_unit(self, value: int):
         self.speedometer.unit = value
@@ -886,13 +1017,23 @@ class Front(Feature):
         self.unit_date = value
         self.callback_date()
 
+    # Sending
+
+    def send(self, **kwargs):
+        """ Values to the phone: queued in the uploader (one batched write), else written at once. """
+        if not self.sending:
+            return
+        if self.uploader is not None:
+            self.uploader.put(**kwargs)
+        elif self.phone is not None:
+            schedule(self.phone.write(**kwargs))
+
     # Sensors
 
     def callback_temperature(self, _=None):
         if self.screen is not None:
             self.screen.temperature(self.temperature, unit=self.unit_temp)
-        if self.sending and self.phone is not None:
-            self.phone.write(temperature=self.temperature)
+        self.send(temperature=self.temperature)
 
     def callback_temperature_unit(self, value: int):
         self.unit_temp = value
@@ -901,20 +1042,17 @@ class Front(Feature):
     def callback_light(self, _=None):
         if self.screen is not None:
             self.screen.light(self.light.value)
-        if self.sending and self.phone is not None:
-            self.phone.write(light=self.light.value)
+        self.send(light=self.light.value)
 
     def callback_battery_front(self, _=None):
         if self.screen is not None:
             self.screen.battery_front(self.battery.value)
-        if self.sending and self.phone is not None:
-            self.phone.write(battery_front=self.battery.value)
+        self.send(battery_front=self.battery.value)
 
     def callback_battery_back(self, _=None):
         if self.screen is not None:
             self.screen.battery_back(self.battery_back)
-        if self.sending and self.phone is not None:
-            self.phone.write(battery_back=self.battery_back)
+        self.send(battery_back=self.battery_back)
 
     """ Other """
 
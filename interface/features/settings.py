@@ -4,7 +4,7 @@ gc.collect()
 
 
 # Logic -> Components
-from interface.components.files import Settings, Folder, JsonFile
+from interface.components.files import Settings, Folder, JsonFile, CompactJsonFile, JsonBundle, Transaction
 from interface.basic.encoding import PercentageInt, Duration, Uint16, Uint8, Float
 from interface.components.lights import RED, YELLOW, LightSettings
 from interface.components.indicator import IndicatorSettings
@@ -42,7 +42,12 @@ gc.collect()
 
 
 class FileSettings(Settings):
-    def __init__(self, folder: Folder | str = "settings", template: str = "default"):
+    """ Settings of each class in its file, or (bundle) all of them in one file read once: settings.json.
+
+    The bundle migrates the former files on its first flush.
+    """
+
+    def __init__(self, folder: Folder | str = "settings", template: str = "default", bundle: bool = False):
         self.folder = Folder(folder) if isinstance(folder, str) else folder
         super().__init__(file=JsonFile.at(name="names", folder=self.folder), template=template)
 
@@ -52,6 +57,15 @@ class FileSettings(Settings):
         self.general_file = JsonFile.at(name="general", folder=self.folder)
         self.creds_file = JsonFile.at(name="creds", folder=self.folder)
 
+        self.bundle = JsonBundle(CompactJsonFile.at(name="settings", folder=self.folder)) if bundle else None
+        if self.bundle is not None:
+            for name, file in [("names", self.file), ("rear", self.rear_file), ("direction", self.direction_file),
+                               ("brake", self.brake_file), ("general", self.general_file), ("creds", self.creds_file)]:
+                self.bundle.mount(name, file)
+
+    def transaction(self) -> Transaction:
+        return Transaction(self.bundle)
+
     @property
     def rear_settings(self):
         return RearSettings.from_file(file=self.rear_file, template=self.template)
@@ -76,9 +90,12 @@ class FileSettings(Settings):
 
     def download_all(self, *settings: Settings):
         """ Download data from phone and save to file and load. """
-        def wrapper(_=None):
-            for setting in settings:
-                setting.download()
+        async def wrapper(_=None):
+            # Downloaded first: no transaction open across the awaits (its rollback would undo other tasks' writes)
+            configs = [await setting.wifi_read() for setting in settings]
+            with self.transaction():
+                for setting, config in zip(settings, configs):
+                    setting.apply(config)
             if len(settings) > 0:
                 self.template = settings[0].template
         return wrapper
@@ -94,20 +111,21 @@ class FileSettings(Settings):
 
     def upload_all(self, *settings: Settings):
         """ Send template to phone. """
-        def wrapper(value: str | None = None):
+        async def wrapper(value: str | None = None):
             for setting in settings:
-                setting.upload(value)
+                await setting.upload(value)
             if len(settings) > 0:
                 self.template = settings[0].template
         return wrapper
 
     def save_all(self, *settings: Settings):
         def wrapper(_=None):
-            for setting in settings:
-                setting.save()
-            if len(settings) > 0:
-                self.template = settings[0].template
-                self.save()
+            with self.transaction():
+                for setting in settings:
+                    setting.save()
+                if len(settings) > 0:
+                    self.template = settings[0].template
+                    self.save()
         return wrapper
 
     def initialise_all(self, *settings: Settings):
@@ -121,9 +139,10 @@ class FileSettings(Settings):
     def remove_all(self, *settings: Settings):
         """ Remove template and initialize again. """
         def wrapper(_=None):
-            for setting in settings:
-                if setting.file is not None and not setting.file.path.endswith("default.json"):
-                    setting.file.remove()
+            with self.transaction():
+                for setting in settings:
+                    if setting.store is not None and not setting.file.path.endswith("default.json"):
+                        setting.store.remove()
             if len(settings) > 0:
                 self.template = settings[0].template
         return wrapper
@@ -147,7 +166,7 @@ class GeneralSettings(Settings):
                  wait_refresh_speedometer: Duration = 0.05,
                  wait_refresh_acceleration: Duration = 0.05,
 
-                 wait_refresh_sending: Duration = 0.2,
+                 wait_refresh_sending: Duration = 2,
                  wait_refresh_timing: Duration = 5,
                  wait_refresh_automatic: Duration = 0.1,
 
@@ -210,14 +229,40 @@ class GeneralSettings(Settings):
                  total_duration: Uint16 = 0,
                  max_speed: float = 0,
 
+                 # Analytics (m/s, m)
+                 auto_pause: bool = True,
+                 pause_speed: float = 1.5,
+                 split: Uint16 = 1000,
+
                  # Accelerometer
                  enable: int = 2,
                  limit_acceleration: int | float = -0.15,
+                 wait_refresh_fusion: Duration = 0.02,
+                 fusion_tau: float = 0.5,
+                 fusion_smoothing: float = 0.25,
+                 expansion_acceleration: float = 0.1,
+                 fusion_axis: Uint8 = 0,
+                 fusion_sign: int = 1,
+                 imu_fifo: bool = True,
+                 wait_refresh_imu: Duration = 0.05,
                  every: Duration = 1,
 
                  # Direction
                  delay: Duration = 0.25,
 
+                 # Bluetooth (ms / s)
+                 interval_fast: Uint16 = 30,
+                 interval_slow: Uint16 = 500,
+                 advertising_fast: Uint16 = 25,
+                 advertising_slow: Uint16 = 1000,
+                 advertising_stretch: Duration = 30,
+
+                 # Telemetry (s / rows)
+                 wait_refresh_recording: Duration = 1,
+                 recording_size: Uint16 = 120,
+                 recording_block: Uint8 = 30,
+                 sending_size: Uint8 = 16,
+
                  # Rear settings
                  modes: Uint8 = 0,
                  types: Uint8 = 0,
@@ -229,6 +274,10 @@ class GeneralSettings(Settings):
 
                  limit_evening: Float = 19,
                  limit_morning: Float = 6,
+                 night_sun: bool = False,
+                 latitude: Float = 48.86,
+                 longitude: Float = 2.35,
+                 utc_offset: Float = 1,
                  limit_dark: Float = 100,
 
                  **kwargs
@@ -305,15 +354,41 @@ class GeneralSettings(Settings):
         self.odometer: Uint16 = odometer
         self.total_duration: Uint16 = total_duration
 
+        # Analytics
+        self.auto_pause: bool = auto_pause
+        self.pause_speed: float = pause_speed
+        self.split: Uint16 = split
+
         # Accelerometer
         self.enable: int = enable
         self.every: int | float = every
         self.points_speed: int = points_speed
         self.limit_acceleration: int | float = limit_acceleration
+        self.wait_refresh_fusion: Duration = wait_refresh_fusion
+        self.fusion_tau: float = fusion_tau
+        self.fusion_smoothing: float = fusion_smoothing
+        self.expansion_acceleration: float = expansion_acceleration
+        self.fusion_axis: Uint8 = fusion_axis
+        self.fusion_sign: int = fusion_sign
+        self.imu_fifo: bool = imu_fifo
+        self.wait_refresh_imu: Duration = wait_refresh_imu
 
         # Direction
         self.delay: Duration = delay
 
+        # Bluetooth
+        self.interval_fast: Uint16 = interval_fast
+        self.interval_slow: Uint16 = interval_slow
+        self.advertising_fast: Uint16 = advertising_fast
+        self.advertising_slow: Uint16 = advertising_slow
+        self.advertising_stretch: Duration = advertising_stretch
+
+        # Telemetry
+        self.wait_refresh_recording: Duration = wait_refresh_recording
+        self.recording_size: Uint16 = recording_size
+        self.recording_block: Uint8 = recording_block
+        self.sending_size: Uint8 = sending_size
+
         # Wait refresh
         self.wait_refresh_dark: Duration = wait_refresh_dark
         self.wait_change_dark: Duration = wait_change_dark
@@ -325,6 +400,11 @@ class GeneralSettings(Settings):
         # Limits
         self.limit_evening: Float = limit_evening
         self.limit_morning: Float = limit_morning
+        # Opt-in: sunrise and sunset (at latitude and longitude until located) instead of limit_morning / limit_evening
+        self.night_sun: bool = night_sun
+        self.latitude: Float = latitude
+        self.longitude: Float = longitude
+        self.utc_offset: Float = utc_offset
         self.limit_dark: Float = limit_dark
 
         # Modes and types and manual after manual activation
@@ -352,6 +432,10 @@ class GeneralBackSettings(Settings):
                  # Sensors
                  difference_temperature: float = 0.3,
                  difference_battery: float = 1,
+
+                 # Bluetooth (ms)
+                 interval_fast: Uint16 = 30,
+                 interval_slow: Uint16 = 500,
                  **kwargs
                  ):
         super().__init__(file)
@@ -371,6 +455,10 @@ class GeneralBackSettings(Settings):
         self.difference_battery = difference_battery
         self.difference_temperature = difference_temperature
 
+        # Bluetooth
+        self.interval_fast: Uint16 = interval_fast
+        self.interval_slow: Uint16 = interval_slow
+
 
 gc.collect()
 
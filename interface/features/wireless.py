@@ -5,14 +5,19 @@ gc.collect()
 
 
 # Built-in
+import time
 from micropython import const
 
 # Interface -> Basic
 from interface.basic.encoding import (Encoder, BOOLEAN_ENCODER, UINT8_ENCODER, PERCENTAGE_INT_ENCODER, FLOAT_ENCODER)
+from interface.basic.utils import to_list
 
 # Interface -> Components
 from interface.components.ble import Service, Characteristic, Bluetooth, Information
 
+# Interface -> Operational
+from interface.operational.triggers import Refresher
+
 
 # =========================== #
 #          Bluetooth          #
@@ -25,6 +30,18 @@ _FRONT_TO_BACK = const(1)
 _BACK_TO_FRONT = const(2)
 _BOTH_DIRECTIONS = const(3)
 
+# Priority classes (lanes) of the characteristics
+PRIORITY_URGENT = const(0)     # Sent immediately
+PRIORITY_CONFIG = const(1)     # Rate-limited
+PRIORITY_TELEMETRY = const(2)  # Batched at a slow cadence
+
+# Lanes: (wait_batch, wait_write)
+_PRIORITY_TIMINGS = {
+    PRIORITY_URGENT: (None, None),
+    PRIORITY_CONFIG: (None, 0.25),
+    PRIORITY_TELEMETRY: (1, 5),
+}
+
 
 # =========================== #
 #         Top-classes         #
@@ -33,18 +50,22 @@ _BOTH_DIRECTIONS = const(3)
 
 class CharacteristicDefinition:
 
-    def __init__(self, uuid: str |int, server: int = 2, encoder: Encoder | None = None, name: str = None, ):
+    def __init__(self, uuid: str |int, server: int = 2, encoder: Encoder | None = None, name: str = None,
+                 priority: int = PRIORITY_CONFIG, ):
         self.uuid = uuid
         self.server = server
         self.encoder = encoder
         self.name = name
+        self.priority = priority
 
     def make_characteristic(self, service: Service, _class: type[Characteristic] = Characteristic,
                             is_logging: bool | None = None, style: str | None = None) -> Characteristic:
+        wait_batch, wait_write = _PRIORITY_TIMINGS.get(self.priority, (None, None))
         return _class(
             uuid=self.uuid,
             service=service, server=self.server, encoder=self.encoder,
-            name=self.name, is_logging=is_logging, style=style
+            name=self.name, is_logging=is_logging, style=style,
+            wait_batch=wait_batch, wait_write=wait_write,
         )
 
 
@@ -76,9 +97,20 @@ class BikeLight:
     # Service
     SERVICE = "0adf3b2b-9772-4302-ae25-d15939407b89"
 
-    """ Generic """
+    """ Signals (safety-critical) """
+    SIGNALS = CharacteristicDefinition(
+        "a179fe55-465b-4646-971b-ef1b9df46926", _FRONT_TO_BACK, name="BleSignals", priority=PRIORITY_URGENT
+    )
+
+    # Direction
+    DIR_ACTIVATION = InformationDefinition(UINT8_ENCODER, "BleDirActivation")
+
+    # Brake
+    BRAKE_ACTIVATION = InformationDefinition(BOOLEAN_ENCODER, "BleBrakeActivation")
+
+    """ Generic (configuration) """
     GENERIC = CharacteristicDefinition(
-        "5b5716df-51e1-4de8-8199-71860c0b69cf", _FRONT_TO_BACK, name="BleGeneric"
+        "5b5716df-51e1-4de8-8199-71860c0b69cf", _FRONT_TO_BACK, name="BleGeneric", priority=PRIORITY_CONFIG
     )
 
     # Informations
@@ -89,19 +121,18 @@ class BikeLight:
     REAR_BRIGHTNESS = InformationDefinition(PERCENTAGE_INT_ENCODER, "BleRearBrightness")
 
     # Direction
-    DIR_ACTIVATION = InformationDefinition(UINT8_ENCODER, "BleDirActivation")
     DIR_BRIGHTNESS = InformationDefinition(PERCENTAGE_INT_ENCODER, "BleDirBrightness")
 
     # Brake
-    BRAKE_ACTIVATION = InformationDefinition(BOOLEAN_ENCODER, "BleBrakeActivation")
     BRAKE_BRIGHTNESS = InformationDefinition(PERCENTAGE_INT_ENCODER, "BleBrakeBrightness")
 
     # General
     GENERAL_ECO = InformationDefinition(BOOLEAN_ENCODER, "GeneralEco")
+    GENERAL_MOVING = InformationDefinition(BOOLEAN_ENCODER, "GeneralMoving")
 
-    """ Back to front """
+    """ Back to front (telemetry) """
     BLUEFRUIT = CharacteristicDefinition(
-        "46acacdb-30c5-49ab-bbbb-a09e0b4cb1b6", _BACK_TO_FRONT, name="BleBack"
+        "46acacdb-30c5-49ab-bbbb-a09e0b4cb1b6", _BACK_TO_FRONT, name="BleBack", priority=PRIORITY_TELEMETRY
     )
 
     BLUEFRUIT_TEMPERATURE = InformationDefinition(FLOAT_ENCODER, "BleBackTemperature")
@@ -116,6 +147,15 @@ class BikeLight:
 
         self.service = service(self.SERVICE, bluetooth)
 
+        # Signals
+        self.signals = self.SIGNALS.make_characteristic(
+            self.service, characteristic, is_logging if is_logging_char is None else is_logging_char, style
+        )
+
+        args = (self.signals, information, is_logging if is_logging_info is None else is_logging_info, style)
+        self.dir_activation = self.DIR_ACTIVATION.make_information(*args)
+        self.brake_activation = self.BRAKE_ACTIVATION.make_information(*args)
+
         # Generic
         self.generic = self.GENERIC.make_characteristic(
             self.service, characteristic, is_logging if is_logging_char is None else is_logging_char, style
@@ -125,11 +165,10 @@ class BikeLight:
         self.rear_activation = self.REAR_ACTIVATION.make_information(*args)
         self.rear_brightness = self.REAR_BRIGHTNESS.make_information(*args)
         self.rear_frequency = self.REAR_FREQUENCY.make_information(*args)
-        self.dir_activation = self.DIR_ACTIVATION.make_information(*args)
         self.dir_brightness = self.DIR_BRIGHTNESS.make_information(*args)
-        self.brake_activation = self.BRAKE_ACTIVATION.make_information(*args)
         self.brake_brightness = self.BRAKE_BRIGHTNESS.make_information(*args)
         self.general_eco = self.GENERAL_ECO.make_information(*args)
+        self.general_moving = self.GENERAL_MOVING.make_information(*args)
 
         # From back
         self.bluefruit = self.BLUEFRUIT.make_characteristic(
@@ -178,6 +217,7 @@ gc.collect()
 
 class ToBackBluetooth(FeatureBluetooth):
     eco = PropertyBluetooth("general_eco")
+    moving = PropertyBluetooth("general_moving")
 
 
 class ToFrontBluetooth(FeatureBluetooth):
@@ -202,3 +242,97 @@ class BrakeBluetooth(FeatureBluetooth):
 
 
 gc.collect()
+
+
+# =========================== #
+#           Policy            #
+# =========================== #
+
+
+class ConnectionPolicy(Refresher):
+    """ Radio parameters from the riding state.
+
+    - Short transmission interval while moving, braking or indicating, long one while parked or in eco mode.
+    - The advertising interval is doubled each advertising_stretch seconds without connection (up to advertising_slow).
+    - Signals (brake, direction) are safety-critical -> Short interval even in eco mode.
+    """
+
+    def __init__(self, bluetooth: Bluetooth, speedometer=None, moving=None, eco=None, signals=None,
+                 interval_fast: int = 30, interval_slow: int = 500,
+                 advertising_fast: int = 25, advertising_slow: int = 1000, advertising_stretch: int | float = 30,
+                 name: str = None, is_logging: bool = None, style: str = None):
+        self.bluetooth = bluetooth
+
+        # Inputs -> speedometer (speed) or moving (value), eco (value), signals (values)
+        self.speedometer = speedometer
+        self.moving = moving
+        self.eco = eco
+        self.signals = [signal for signal in to_list(signals) if signal is not None]
+
+        # Intervals (ms)
+        self.interval_fast = interval_fast
+        self.interval_slow = interval_slow
+        self.advertising_fast = advertising_fast
+        self.advertising_slow = advertising_slow
+        self.advertising_stretch = advertising_stretch
+
+        # Advertising is repeated each stretch to use the new interval
+        self.bluetooth.advertising_duration = advertising_stretch
+
+        super().__init__(
+            name=name, is_logging=is_logging, style=style,
+            wait_refresh=advertising_stretch, uses_active=False,
+        )
+
+        # Changes -> Updated immediately
+        for source in [self.speedometer, self.moving, self.eco] + self.signals:
+            if source is not None:
+                source.add(funcs=self.on_change)
+        self.update()
+
+    """ State """
+
+    @property
+    def is_moving(self) -> bool:
+        if self.speedometer is not None:
+            return self.speedometer.speed > 0
+        return bool(self.moving.value) if self.moving is not None else False
+
+    @property
+    def is_eco(self) -> bool:
+        return bool(self.eco.value) if self.eco is not None else False
+
+    @property
+    def is_signaling(self) -> bool:
+        for signal in self.signals:
+            if signal.value:
+                return True
+        return False
+
+    """ Intervals """
+
+    @property
+    def interval(self) -> int:
+        if self.is_signaling or (self.is_moving and not self.is_eco):
+            return self.interval_fast
+        return self.interval_slow
+
+    @property
+    def advertising_interval(self) -> int:
+        if self.is_eco:
+            return self.advertising_slow
+        steps = int((time.time() - self.bluetooth.last_connected) // self.advertising_stretch)
+        return min(self.advertising_slow, self.advertising_fast << min(steps, 8))
+
+    """ Refresher """
+
+    def on_change(self, _=None):
+        self.update()
+
+    def update(self):
+        self.bluetooth.set_transmission_interval(self.interval)
+        if self.bluetooth.peripheral:
+            self.bluetooth.advertising_interval = self.advertising_interval
+
+
+gc.collect()
@@ -12,6 +12,7 @@ from interface.basic.operators import get_operator
 from interface.components.clock import Clock
 from interface.operational.special import comparison
 from interface.basic.average import Average
+from interface.basic.solar import Sun
 
 
 class TriggerTimer(Refresher):
@@ -70,12 +71,18 @@ class TriggerClock(Refresher):
     def inputted(self):
         return self.source.value
 
+    def bounds(self):
+        """ Update lower and upper (fixed). """
+        pass
+
     @property
     def value(self):
+        self.bounds()
         return comparison(self.inputted, self._operator, self._lower, self._upper)
 
     @property
     def next_change(self) -> float:
+        self.bounds()
         if self.inputted < self._lower:
             return self._lower - self.inputted
         if isinstance(self._upper, float) or isinstance(self._upper, int):
@@ -113,6 +120,66 @@ class TriggerClock(Refresher):
 gc.collect()
 
 
+class TriggerSun(TriggerClock):
+    """ TriggerClock from sunrise (lower) to sunset (upper) of the day of the clock.
+
+    With a location (LocationAPI), the sun is moved to its (cached) coordinates and timezone each wait_locate seconds,
+    the place of the sun given (settings) is only the offline fallback.
+    """
+
+    def __init__(self, source: Clock, sun: Sun, operator: str = ">=<", location=None, wait_locate: int | float = 3600,
+                 name: str = None, is_logging: bool = None, style: str = None,
+                 funcs=None, events=None, coroutines=None, event_loop=None,
+                 initially_active: bool = True, uses_active: bool = True, ):
+        self.sun = sun
+        self.location = location
+        self.wait_locate = wait_locate
+
+        super().__init__(
+            source=source, lower=0, upper=24, operator=operator,
+            funcs=funcs, events=events, coroutines=coroutines, event_loop=event_loop,
+            name=name, is_logging=is_logging, style=style,
+            initially_active=initially_active, uses_active=uses_active,
+        )
+
+    def bounds(self):
+        self._lower, self._upper = self.sun.times(
+            self.source.years, self.source.months, self.source.days, max(0, self.source.isdst)
+        )
+
+    def locate(self, latitude: float | None, longitude: float | None, offset: int | None = None):
+        """ Sun moved to latitude, longitude and offset (seconds to UTC, daylight saving included) if new. """
+        if latitude is None or longitude is None:
+            return
+        # The daylight saving of the clock is added back by the sun
+        offset = None if offset is None else offset / 3600 - max(0, self.source.isdst)
+        if (latitude, longitude) == (self.sun.latitude, self.sun.longitude) and offset in (None, self.sun.offset):
+            return
+        self.sun.locate(latitude, longitude, offset)
+        self.logging(f"Located: {self.sun}", "INFO")
+        # Bounds of the new place
+        self.change.set()
+
+    async def locating(self):
+        while True:
+            try:
+                latitude, longitude = await self.location.read()
+                self.locate(latitude, longitude, self.location.offset)
+            except Exception as e:
+                self.logging(f"Not located: {e}", "WARNING")
+            await asyncio.sleep(self.wait_locate)
+
+    async def refreshing(self):
+        """ (Async) Continuously refreshes (and locates the sun with the location). """
+        if self.location is None:
+            await super().refreshing()
+        else:
+            await asyncio.gather(super().refreshing(), self.locating())
+
+
+gc.collect()
+
+
 class ContinuousAverage(TriggerTimer):
     def __init__(self, *, source, points: int = 100,
                  name: str = None, is_logging: bool = None, style: str = None,
@@ -9,6 +9,8 @@ from machine import Pin
 # Local -> Interface
 from interface.operational.triggers import Refresher
 from interface.basic.average import Average
+from interface.basic.solar import Sun
+from interface.wireless.location import LocationAPI
 from interface.operational.triggers import ActionEvents, ActionCoroutines
 
 
@@ -136,6 +138,9 @@ class TriggerClock(Refresher):
                  ):
         ...
 
+    def bounds(self):
+        ...
+
     async def refreshing(self):
         """ (Async) Continuously refreshes. When paused waits for active """
         ...
@@ -149,6 +154,54 @@ class TriggerClock(Refresher):
         ...
 
 
+""" Sun """
+
+class SunSourceProtocol(Protocol):
+    value: ClockInput
+    change: asyncio.Event
+    years: int
+    months: int
+    days: int
+    isdst: int
+
+
+class TriggerSun(TriggerClock):
+    source: SunSourceProtocol
+    sun: Sun
+    location: Optional[LocationAPI]
+    wait_locate: int | float
+
+    def __init__(self,
+                 source: SunSourceProtocol,
+                 sun: Sun,
+                 operator: str = ">=<",
+                 location: Optional[LocationAPI] = None,
+                 wait_locate: int | float = 3600,
+                 funcs: ClockActionFuncsArg = None,
+                 events: Optional[ActionEvents] = None,
+                 coroutines: Optional[ActionCoroutines] = None,
+                 event_loop: Optional[asyncio.AbstractEventLoop] = None,
+                 name: Optional[str] = None,
+                 is_logging: Optional[bool] = None,
+                 style: Optional[str] = None,
+                 initially_active: bool = True,
+                 uses_active: bool = True,
+                 ):
+        ...
+
+    def bounds(self):
+        ...
+
+    def locate(self, latitude: Optional[float], longitude: Optional[float], offset: Optional[int] = None):
+        ...
+
+    async def locating(self):
+        ...
+
+    async def refreshing(self):
+        ...
+
+
 """ Average """
 
 AverageInput: float
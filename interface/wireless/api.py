@@ -1,9 +1,13 @@
 
 import json
-import requests
+import time
+import asyncio
 
 from interface.basic.logger import Logging
+from interface.components.files import JsonFile, JsonStore
 from interface.wireless.wifi import WifiManager
+from interface.wireless.http import HTTPClient, Response
+from interface.wireless.extract import JsonExtractor
 
 
 def make_query(params):
@@ -15,37 +19,139 @@ def make_query(params):
         return str(params)
 
 
+class ResponseCache:
+    """ **Responses persisted to flash**: url -> {"time", "data"}, in one JsonStore (flushed by JsonStore.flushing). """
+
+    def __init__(self, file: JsonFile | str, wait_flush: int | float = 10):
+        self.store = JsonStore.of(JsonFile(file) if isinstance(file, str) else file)
+        self.store.wait_flush = wait_flush
+
+    def get(self, key: str) -> tuple[dict | list | None, float | None]:
+        """ (data, age in seconds) or (None, None). """
+        entry = self.store.data.get(key)
+        if not isinstance(entry, dict):
+            return None, None
+        return entry.get("data"), time.time() - entry.get("time", 0)
+
+    def set(self, key: str, data: dict | list):
+        entries = self.store.data
+        entries[key] = {"time": time.time(), "data": data}
+        self.store.write(entries)
+
+
 class API:
-    def __init__(self, url: str, key: str = None, wifi: WifiManager | None = None,
+    """ **API** (asynchronous requests with the HTTPClient).
+
+    cached(): responses kept in a ResponseCache
+    - fresh for ttl seconds (no request),
+    - then served for stale more seconds while revalidated in the background (stale-while-revalidate),
+    - then requested again, the cached response being served if it fails (offline).
+    """
+
+    ttl: int | float = 0
+    stale: int | float = 0
+    wait: int | float = 0      # Seconds a request waits for the wifi (0: None at once when not connected)
+    paths: list[tuple] | None = None   # Key paths kept of the responses (None: all)
+
+    def __init__(self, url: str, key: str = None, wifi: WifiManager | None = None, client: HTTPClient | None = None,
+                 cache: ResponseCache | None = None,
                  name: str | None = None, is_logging: bool | None = None, style: str | None = None):
         self.url = url
         self.key = key
         if wifi is not None:
             self.wifi = wifi
+        self.client = HTTPClient.shared() if client is None else client
+        self.cache = cache
+        self.revalidating: list[str] = []
         self.logging = Logging(name, is_logging, self, style=style)
 
-    def request(self, endpoint: str = "", query: str | dict[str, str] = "",
-                method: str = "GET", data: bytes | dict | None = None) -> requests.Response | None:
-        if hasattr(self, "wifi") and not self.wifi.connected:
+    async def request(self, endpoint: str = "", query: str | dict[str, str] = "",
+                      method: str = "GET", data: bytes | dict | list | None = None,
+                      headers: dict[str, str] | None = None, sink=None) -> Response | None:
+        """ (Async) Request: None when not connected (after waiting for the wifi wait seconds). """
+        wifi = getattr(self, "wifi", None)
+        if wifi is not None and not wifi.connected and (not self.wait or not hasattr(wifi, "run")):
             return None
         data = None if data is None else data if isinstance(data, bytes) else json.dumps(data).encode("utf-8")
         query = make_query(query)
         url = f"{self.url}{'/' if endpoint else ''}{endpoint}{'?' if query else ''}{query}"
         self.logging(f"Request ({method}): {url}", "INFO")
-        return requests.request(method, url, data=data)
+        if hasattr(wifi, "run"):
+            # WifiManager: waits for the connection (requested if on demand), kept on idle seconds after
+            return await wifi.run(self.client.request, method, url, data, headers, None, sink, timeout=self.wait)
+        return await self.client.request(method, url, data=data, headers=headers, sink=sink)
+
+    def queue(self, func, *args):
+        """ func(*args) (async) in the background, once the wifi is connected (WifiManager.queue). """
+        if hasattr(getattr(self, "wifi", None), "queue"):
+            return self.wifi.queue(func, *args, timeout=self.wait)
+        return asyncio.create_task(func(*args))
+
+    async def get(self, endpoint: str = "", query: str | dict[str, str] = "", data: bytes | dict | list | None = None,
+                  headers: dict[str, str] | None = None, sink=None) -> Response | None:
+        return await self.request(method="GET", endpoint=endpoint, query=query, data=data, headers=headers, sink=sink)
+
+    async def post(self, endpoint: str = "", query: str | dict[str, str] = "", data: bytes | dict | list | None = None) -> Response | None:
+        return await self.request(method="POST", endpoint=endpoint, query=query, data=data)
+
+    async def put(self, endpoint: str = "", query: str | dict[str, str] = "", data: bytes | dict | list | None = None) -> Response | None:
+        return await self.request(method="PUT", endpoint=endpoint, query=query, data=data)
+
+    async def patch(self, endpoint: str = "", query: str | dict[str, str] = "", data: bytes | dict | list | None = None) -> Response | None:
+        return await self.request(method="PATCH", endpoint=endpoint, query=query, data=data)
+
+    async def delete(self, endpoint: str = "", query: str | dict[str, str] = "", data: bytes | dict | list | None = None) -> Response | None:
+        return await self.request(method="DELETE", endpoint=endpoint, query=query, data=data)
+
 
-    def get(self, endpoint: str = "", query: str | dict[str, str] = "", data: bytes | dict | None = None) -> requests.Response:
-        return self.request(method="GET", endpoint=endpoint, query=query, data=data)
+    # Cache
 
-    def post(self, endpoint: str = "", query: str | dict[str, str] = "", data: bytes | dict | None = None) -> requests.Response:
-        return self.request(method="POST", endpoint=endpoint, query=query, data=data)
+    def cache_key(self, endpoint: str = "", query: str | dict[str, str] = "") -> str:
+        """ Key of the cached responses. """
+        return f"{self.url}/{endpoint}?{make_query(query)}"
 
-    def put(self, endpoint: str = "", query: str | dict[str, str] = "", data: bytes | dict | None = None) -> requests.Response:
-        return self.request(method="PUT", endpoint=endpoint, query=query, data=data)
+    async def extract(self, endpoint: str = "", query: str | dict[str, str] = "", paths: list[tuple] | None = None,
+                      headers: dict[str, str] | None = None) -> tuple[Response | None, dict | list | None]:
+        """ (Async) (response, JSON of a GET): only the key paths are kept (streamed), all of it if paths is None. """
+        sink = JsonExtractor([()] if paths is None else paths)
+        response = await self.get(endpoint, query, headers=headers, sink=sink)
+        if response is None or response.status_code != 200 or not sink.done:
+            return response, None
+        return response, sink.result
 
-    def patch(self, endpoint: str = "", query: str | dict[str, str] = "", data: bytes | dict | None = None) -> requests.Response:
-        return self.request(method="PATCH", endpoint=endpoint, query=query, data=data)
+    async def fetch(self, endpoint: str = "", query: str | dict[str, str] = "") -> dict | list | None:
+        """ (Async) JSON of a GET (cached, only the paths if any), None when it failed. """
+        try:
+            _, data = await self.extract(endpoint, query, self.paths)
+            if data is not None:
+                if self.cache is not None:
+                    self.cache.set(self.cache_key(endpoint, query), data)
+                return data
+        except Exception as e:
+            self.logging(f"Error when trying to access the {self.__class__.__name__}, .fetch(): {e}", "ERROR")
+        return None
 
-    def delete(self, endpoint: str = "", query: str | dict[str, str] = "", data: bytes | dict | None = None) -> requests.Response:
-        return self.request(method="DELETE", endpoint=endpoint, query=query, data=data)
+    async def revalidate(self, endpoint: str = "", query: str | dict[str, str] = ""):
+        key = self.cache_key(endpoint, query)
+        if key in self.revalidating:
+            return
+        self.revalidating.append(key)
+        try:
+            await self.fetch(endpoint, query)
+        finally:
+            self.revalidating.remove(key)
 
+    async def cached(self, endpoint: str = "", query: str | dict[str, str] = "") -> tuple[dict | list | None, float]:
+        """ (Async) (JSON of a GET, age in seconds: 0 when just requested). """
+        data, age = (None, None) if self.cache is None else self.cache.get(self.cache_key(endpoint, query))
+        if data is not None and 0 <= age < self.ttl:
+            return data, age
+        if data is not None and 0 <= age < self.ttl + self.stale:
+            self.queue(self.revalidate, endpoint, query)
+            return data, age
+        fetched = await self.fetch(endpoint, query)
+        if fetched is not None:
+            return fetched, 0
+        if data is not None:
+            self.logging(f"Offline: cached response of {endpoint} ({age:.0f}s)", "WARNING")
+        return data, age if data is not None and age >= 0 else 0
@@ -1,7 +1,7 @@
 
 import time
 
-from interface.wireless.api import API
+from interface.wireless.api import API, ResponseCache
 from interface.wireless.wifi import WifiManager
 from interface.components.clock import WEEKDAYS
 
@@ -10,23 +10,34 @@ URL = "https://timeapi.io"
 
 
 class DateAPI(API):
-    def __init__(self, wifi: WifiManager,
+    """ Date from the IP: a cached response is moved forward by its age (the board clock kept running). """
+
+    ttl = 86400     # A day (timezone and daylight saving)
+    stale = 604800
+    wait = 30
+    paths = [("year",), ("month",), ("day",), ("hour",), ("minute",), ("seconds",),
+             ("dayOfWeek",), ("timeZone",), ("dstActive",)]
+
+    def __init__(self, wifi: WifiManager, cache: ResponseCache | None = None,
                  name: str | None = None, is_logging: bool | None = None, style: str | None = None):
-        super().__init__(URL, wifi=wifi, name=name, is_logging=is_logging, style=style)
+        super().__init__(URL, wifi=wifi, cache=cache, name=name, is_logging=is_logging, style=style)
 
         self.datetime = time.localtime()
         self.timezone = ""
 
-    def get_from_ip(self):
+    def cache_key(self, endpoint: str = "", query: str | dict[str, str] = "") -> str:
+        return f"{self.url}/{endpoint}"   # Same response whatever the IP (offline)
+
+    async def get_from_ip(self):
         try:
-            return self.get(f"api/time/current/ip", f"ipAddress={self.wifi.ip}")
+            return await self.get(f"api/time/current/ip", f"ipAddress={self.wifi.ip}")
         except Exception as e:
             self.logging(f"Error when trying to access the ClockAPI, .get_gmt(): {e}", "ERROR")
-            return ""
+            return None
 
-    def make_date_from_ip(self):
+    async def make_date_from_ip(self):
         try:
-            data = self.get_from_ip().json()
+            data, age = await self.cached(f"api/time/current/ip", f"ipAddress={self.wifi.ip}")
             if data is not None:
                 self.timezone = data["timeZone"]
                 self.datetime = (
@@ -36,11 +47,14 @@ class DateAPI(API):
                     int(data['timeZone'] == "UTC"),
                     int(data['dstActive'] == "True")
                 )
+                if age:
+                    self.datetime = tuple(time.localtime(time.mktime(self.datetime[:6] + (0, 0, -1)) + int(age))[:7]) \
+                                    + self.datetime[7:]
         except Exception as e:
             self.logging(f"Error when trying to access the {self.__class__.__name__}, make_date_from_ip.(): {e}", "ERROR")
         return self.datetime
 
-    def read(self):
+    async def read(self):
         """ Returns the datetime. Timezone available as self.timezone. """
-        self.make_date_from_ip()
+        await self.make_date_from_ip()
         return self.datetime
@@ -0,0 +1,176 @@
+
+import gc
+gc.collect()
+
+import json
+
+from micropython import const
+
+_QUOTE = const(34)          # "
+_BACKSLASH = const(92)      # \
+_OPEN_OBJECT = const(123)   # {
+_CLOSE_OBJECT = const(125)  # }
+_OPEN_ARRAY = const(91)     # [
+_CLOSE_ARRAY = const(93)    # ]
+_COLON = const(58)          # :
+_COMMA = const(44)          # ,
+_WHITESPACE = b" \t\r\n"
+_END = b",}] \t\r\n"
+
+
+# =========================== #
+#       JSON extraction       #
+# =========================== #
+
+
+class JsonExtractor:
+    """ **Streaming JSON parser** keeping only some key paths (sink of the HTTPClient).
+
+    - paths: tuples of keys (and indexes in arrays), e.g. ("current", "temperature_2m") or ("daily", "sunrise", 0).
+    - feed(chunk) as the bytes arrive: only the bytes of the value being kept are held, the rest is skipped.
+    - result: nested dicts of the kept values ({"current": {"temperature_2m": 12.3}}), () keeps the whole document.
+    """
+
+    def __init__(self, paths: list[tuple] | tuple):
+        self.paths = [tuple(path) for path in paths]
+        self.prefixes = []
+        for path in self.paths:
+            for n in range(len(path)):
+                if path[:n] not in self.prefixes:
+                    self.prefixes.append(path[:n])
+        self.result = {}
+        self.done = False
+        # Buffer (current chunk) and capture (bytes of the kept value)
+        self.buffer = b""
+        self.pos = 0
+        self.capture: bytearray | None = None
+        self.start = 0
+        self._parser = self._document()
+        next(self._parser)
+
+    def feed(self, chunk: bytes):
+        if self.done or not chunk:
+            return
+        try:
+            self._parser.send(chunk)
+        except StopIteration:
+            self.done = True
+            self.buffer = b""
+
+    # Result
+
+    def _set(self, path: tuple, value):
+        if not path:
+            self.result = value
+            return
+        node = self.result
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = value
+
+    # Bytes
+
+    def _next(self):
+        while self.pos >= len(self.buffer):
+            if self.capture is not None:
+                self.capture.extend(self.buffer[self.start:])
+                self.start = 0
+            self.buffer = yield
+            self.pos = 0
+        byte = self.buffer[self.pos]
+        self.pos += 1
+        return byte
+
+    def _skip(self):
+        """ Next byte which is not a whitespace. """
+        byte = yield from self._next()
+        while byte in _WHITESPACE:
+            byte = yield from self._next()
+        return byte
+
+    # Values
+
+    def _document(self):
+        yield from self._value(())
+
+    def _value(self, path: tuple):
+        byte = yield from self._skip()
+        if path in self.paths:
+            self.pos -= 1
+            self.capture = bytearray()
+            self.start = self.pos
+            yield from self._skip_value((yield from self._next()))
+            self.capture.extend(self.buffer[self.start:self.pos])
+            value, self.capture = self.capture, None
+            self._set(path, json.loads(value))
+        elif byte == _OPEN_OBJECT and path in self.prefixes:
+            yield from self._object(path)
+        elif byte == _OPEN_ARRAY and path in self.prefixes:
+            yield from self._array(path)
+        else:
+            yield from self._skip_value(byte)
+
+    def _object(self, path: tuple):
+        byte = yield from self._skip()
+        while byte == _QUOTE:
+            key = yield from self._string(keep=True)
+            yield from self._skip()  # :
+            yield from self._value(path + (key,))
+            byte = yield from self._skip()  # , or }
+            if byte == _COMMA:
+                byte = yield from self._skip()
+
+    def _array(self, path: tuple):
+        byte = yield from self._skip()
+        if byte == _CLOSE_ARRAY:
+            return
+        self.pos -= 1
+        index = 0
+        while True:
+            yield from self._value(path + (index,))
+            byte = yield from self._skip()  # , or ]
+            if byte != _COMMA:
+                return
+            index += 1
+
+    def _string(self, keep: bool = False):
+        """ String (after its opening quote): the key if keep. """
+        data = bytearray() if keep else None
+        escaped = False
+        while True:
+            byte = yield from self._next()
+            if byte == _QUOTE:
+                break
+            if keep:
+                data.append(byte)
+            if byte == _BACKSLASH:
+                escaped = True
+                byte = yield from self._next()
+                if keep:
+                    data.append(byte)
+        if not keep:
+            return None
+        return json.loads(b'"' + data + b'"') if escaped else data.decode("utf-8")
+
+    def _skip_value(self, byte: int):
+        """ Value starting with byte, not kept. """
+        if byte == _QUOTE:
+            yield from self._string()
+        elif byte == _OPEN_OBJECT or byte == _OPEN_ARRAY:
+            depth = 1
+            while depth:
+                byte = yield from self._next()
+                if byte == _QUOTE:
+                    yield from self._string()
+                elif byte == _OPEN_OBJECT or byte == _OPEN_ARRAY:
+                    depth += 1
+                elif byte == _CLOSE_OBJECT or byte == _CLOSE_ARRAY:
+                    depth -= 1
+        else:
+            # Number, true, false, null: until the next delimiter (not consumed)
+            while byte not in _END:
+                byte = yield from self._next()
+            self.pos -= 1
+
+
+gc.collect()
@@ -0,0 +1,240 @@
+
+import gc
+gc.collect()
+
+import json
+import time
+import asyncio
+
+from micropython import const
+
+from interface.basic.logger import Logging
+
+_CHUNK = const(256)
+
+
+# =========================== #
+#           Response          #
+# =========================== #
+
+
+class Response:
+    """ Same attributes as the ones used of requests.Response: status_code, content, text, json(). """
+
+    def __init__(self, status_code: int, headers: dict[str, str], content: bytes, reason: str = ""):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.reason = reason
+
+    def __repr__(self):
+        return f"<Response [{self.status_code}]>"
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status_code < 300
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.content.decode("utf-8"))
+
+
+gc.collect()
+
+
+# =========================== #
+#            Client           #
+# =========================== #
+
+
+def split_url(url: str) -> tuple[bool, str, int, str]:
+    """ url -> (https, host, port, path) """
+    https = url.startswith("https://")
+    url = url.split("://", 1)[1] if "://" in url else url
+    address, _, path = url.partition("/")
+    host, _, port = address.partition(":")
+    return https, host, int(port) if port else 443 if https else 80, "/" + path
+
+
+class HTTPClient:
+    """ **Asynchronous HTTP client** on asyncio streams (no blocking of the loop).
+
+    - timeout (seconds): for the whole request (connection, sending and response).
+    - concurrency: requests at once (the others wait), one client shared by the APIs (HTTPClient.shared()).
+    - HTTP/1.1 keep-alive: up to pool_size idle connections per host are reused for idle seconds.
+      A reused connection closed by the server (stale) is replaced by a new one and the request sent again.
+    - Bodies: Content-Length, chunked, or until the connection closes (which is then not reused).
+    - sink (e.g. JsonExtractor): the body is fed to sink.feed() chunk by chunk instead of being kept (content is empty).
+    """
+
+    _shared: 'HTTPClient | None' = None
+
+    def __init__(self, timeout: int | float = 5, concurrency: int = 2, pool_size: int = 2, idle: int | float = 30,
+                 name: str | None = None, is_logging: bool | None = None, style: str | None = None):
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.running = 0
+        self.released = asyncio.Event()
+        # Idle connections: (https, host, port) -> [(reader, writer, time)]
+        self.pool_size = pool_size
+        self.idle = idle
+        self.pool: dict[tuple, list] = {}
+        self.opened = 0
+        self.logging = Logging(name, is_logging, self, style=style)
+
+    @classmethod
+    def shared(cls) -> 'HTTPClient':
+        if cls._shared is None:
+            cls._shared = cls(name="HTTPClient")
+        return cls._shared
+
+    # Concurrency
+
+    async def acquire(self):
+        while self.running >= self.concurrency:
+            self.released.clear()
+            await self.released.wait()
+        self.running += 1
+
+    def release(self):
+        self.running -= 1
+        self.released.set()
+
+    # Connections
+
+    async def _connect(self, key: tuple) -> tuple:
+        """ (reader, writer, reused): an idle connection of the pool, else a new one. """
+        connections = self.pool.get(key, [])
+        while connections:
+            reader, writer, moment = connections.pop()
+            if time.time() - moment < self.idle:
+                return reader, writer, True
+            writer.close()
+        https, host, port = key
+        reader, writer = await asyncio.open_connection(host, port, ssl=True) if https \
+            else await asyncio.open_connection(host, port)
+        self.opened += 1
+        return reader, writer, False
+
+    def _keep(self, key: tuple, reader, writer):
+        connections = self.pool.setdefault(key, [])
+        if len(connections) >= self.pool_size:
+            writer.close()
+            return
+        connections.append((reader, writer, time.time()))
+
+    def close(self):
+        """ Close the idle connections. """
+        for connections in self.pool.values():
+            for _, writer, _ in connections:
+                writer.close()
+        self.pool = {}
+
+    # Requests
+
+    async def request(self, method: str, url: str, data: bytes | None = None, headers: dict[str, str] | None = None,
+                      timeout: int | float | None = None, sink=None) -> Response:
+        await self.acquire()
+        try:
+            return await asyncio.wait_for(
+                self._request(method, url, data, headers, sink), self.timeout if timeout is None else timeout
+            )
+        finally:
+            self.release()
+
+    async def _request(self, method: str, url: str, data: bytes | None, headers: dict[str, str] | None,
+                       sink=None) -> Response:
+        https, host, port, path = split_url(url)
+        key = (https, host, port)
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {host}", "Connection: keep-alive"]
+        if data is not None:
+            lines.append(f"Content-Length: {len(data)}")
+            lines.append("Content-Type: application/json")
+        for name, value in (headers or {}).items():
+            lines.append(f"{name}: {value}")
+        head = ("\r\n".join(lines) + "\r\n\r\n").encode()
+        while True:
+            reader, writer, reused = await self._connect(key)
+            kept = False
+            try:
+                try:
+                    writer.write(head)
+                    if data is not None:
+                        writer.write(data)
+                    await writer.drain()
+                    line = await reader.readline()
+                    if not line:
+                        raise OSError("Connection closed")
+                except OSError as e:
+                    # Stale (closed by the server while idle, nothing received): again on a new connection
+                    if not reused:
+                        raise
+                    self.logging(f"Stale connection to {host}:{port} ({e})", "DEBUG")
+                    continue
+                # Response started: errors are raised (the sink was fed, the request may have been applied)
+                response, reusable = await self._response(reader, sink, method, line)
+                if reusable:
+                    self._keep(key, reader, writer)
+                    kept = True
+                return response
+            finally:
+                if not kept:
+                    writer.close()
+
+    async def _response(self, reader, sink=None, method: str = "GET", line: bytes | None = None) -> tuple[Response, bool]:
+        """ (response, reusable connection), line: status line already read. """
+        line = await reader.readline() if line is None else line
+        if not line:
+            raise OSError("Connection closed")
+        status = line.decode().strip().split(" ", 2)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if not line or line == b"\r\n":
+                break
+            name, _, value = line.decode().partition(":")
+            headers[name.strip().lower()] = value.strip()
+        code = int(status[1])
+        reusable = status[0] == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        parts = [] if sink is None else None
+        length = headers.get("content-length")
+        if method == "HEAD" or code in (204, 304) or 100 <= code < 200:
+            pass
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size = int((await reader.readline()).split(b";")[0].strip(), 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b""):
+                        pass
+                    break
+                await self._body(reader, size, sink, parts)
+                await reader.readexactly(2)
+        elif length is not None:
+            await self._body(reader, int(length), sink, parts)
+        else:
+            await self._body(reader, -1, sink, parts)
+            reusable = False
+        content = b"".join(parts) if parts is not None else b""
+        return Response(code, headers, content, status[2] if len(status) > 2 else ""), reusable
+
+    @staticmethod
+    async def _body(reader, size: int, sink, parts: list | None):
+        """ size bytes (-1: until closed) fed to the sink or appended to parts. """
+        while size != 0:
+            chunk = await reader.read(_CHUNK if size < 0 else min(_CHUNK, size))
+            if not chunk:
+                if size > 0:
+                    raise EOFError("Incomplete body")
+                return
+            if sink is not None:
+                sink.feed(chunk)
+            else:
+                parts.append(chunk)
+            if size > 0:
+                size -= len(chunk)
+
+
+gc.collect()
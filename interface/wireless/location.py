@@ -1,17 +1,25 @@
 
 
-from interface.wireless.api import API
+from interface.wireless.api import API, ResponseCache
 from interface.wireless.wifi import WifiManager
 
 URL = "http://ip-api.com"
+FIELDS = "status,timezone,offset,lat,lon,country,city,zip"
 
 
 class LocationAPI(API):
-    def __init__(self, wifi: WifiManager, unit: int = 1,
+
+    ttl = 86400     # A day
+    stale = 604800  # A week
+    wait = 30
+    paths = [("timezone",), ("offset",), ("lat",), ("lon",), ("country",), ("city",), ("zip",)]
+
+    def __init__(self, wifi: WifiManager, unit: int = 1, cache: ResponseCache | None = None,
                  name: str | None = None, is_logging: bool | None = None, style: str | None = None):
-        super().__init__(URL, wifi=wifi, name=name, is_logging=is_logging, style=style)
+        super().__init__(URL, wifi=wifi, cache=cache, name=name, is_logging=is_logging, style=style)
 
         self.timezone = None
+        self.offset = None      # Offset to UTC in seconds (daylight saving included)
         self.latitude = None
         self.longitude = None
 
@@ -19,19 +27,19 @@ class LocationAPI(API):
         self.city = None
         self.zip = None
 
-    def get_from_ip(self):
+    async def get_from_ip(self):
         try:
-            return self.get("json")
+            return await self.get("json")
         except Exception as e:
             self.logging(f"Error when trying to access the {self.__class__.__name__}, .get_from_ip(): {e}", "ERROR")
-            return ""
+            return None
 
-    def make_from_ip(self):
+    async def make_from_ip(self):
         try:
-            data = self.get_from_ip()
-            if data is not None:
-                res = data.json()
+            res, _ = await self.cached("json", {"fields": FIELDS})
+            if res is not None:
                 self.timezone = res.get("timezone")
+                self.offset = res.get("offset")
                 self.latitude = res.get("lat")
                 self.longitude = res.get("lon")
                 self.country = res.get("country")
@@ -41,8 +49,8 @@ class LocationAPI(API):
             self.logging(f"Error when trying to access the {self.__class__.__name__}, .make_from_ip(): {e}", "ERROR")
         return self.latitude, self.longitude
 
-    def read(self) -> tuple[float | None, float | None]:
+    async def read(self) -> tuple[float | None, float | None]:
         """ Returns the lat and long. Other information are retrievable after reading too. """
-        self.make_from_ip()
+        await self.make_from_ip()
         return self.latitude, self.longitude
 
@@ -1,8 +1,11 @@
 
-import json
+import time
+import random
+import asyncio
 
 from interface.wireless.wifi import WifiManager
 from interface.wireless.api import API
+from interface.operational.triggers import Refresher
 
 
 PORT = 8000
@@ -10,53 +13,181 @@ HOST = "192.168.1.128"
 
 
 class PhoneAPI(API):
-    def __init__(self, wifi: WifiManager | None = None, host: str = HOST, port: int = PORT,
+    """ **Phone** (one JSON document: settings, wifi, records, streamed keeping only these sections).
+
+    - Snapshot: the document read is kept for ttl seconds (the get_* calls share one request).
+    - Once expired, it is revalidated (If-None-Match / If-Modified-Since): 304 keeps the snapshot.
+    - Writes are merged into the snapshot (same as the phone).
+    """
+
+    wait = 10
+    paths = [("wifi",), ("creds",), ("rear",), ("direction",), ("brake",), ("general",), ("records",)]
+
+    def __init__(self, wifi: WifiManager | None = None, host: str = HOST, port: int = PORT, ttl: int | float = 5,
                  name: str | None = None, is_logging: bool | None = None, style: str | None = None):
         super().__init__(f"http://{host}:{port}", wifi=wifi, name=name, is_logging=is_logging, style=style)
-
-    def read(self) -> dict:
+        self.ttl = ttl
+        self.snapshot: dict | None = None
+        self.etag: str | None = None
+        self.modified: str | None = None
+        self.fetched = 0
+        self.reading = asyncio.Lock()
+
+    def invalidate(self):
+        self.snapshot = None
+        self.etag = None
+        self.modified = None
+
+    async def read(self, fresh: bool = False) -> dict:
+        """ (Async) Whole document: the snapshot if younger than ttl (and not fresh), else revalidated. """
+        async with self.reading:
+            if not fresh and self.snapshot is not None and time.time() - self.fetched < self.ttl:
+                return self.snapshot
+            headers = {}
+            if self.snapshot is not None:
+                if self.etag is not None:
+                    headers["If-None-Match"] = self.etag
+                if self.modified is not None:
+                    headers["If-Modified-Since"] = self.modified
+            try:
+                response, data = await self.extract(headers=headers, paths=self.paths)
+                if response is not None and response.status_code == 304 and self.snapshot is not None:
+                    self.fetched = time.time()
+                    return self.snapshot
+                if data is not None:
+                    self.snapshot = data
+                    self.etag = response.headers.get("etag")
+                    self.modified = response.headers.get("last-modified")
+                    self.fetched = time.time()
+                    return self.snapshot
+            except Exception as e:
+                self.logging(f"Error when trying to access the {self.__class__.__name__}, .read(): {e}", "ERROR")
+            return {}
+
+    async def write(self, **kwargs) -> bool:
         try:
-            response = self.get()
-            if response.status_code == 200:
-                return json.loads(response.content.decode("utf-8"))
+            response = await self.put(data=kwargs)
+            if response is not None and response.status_code == 200:
+                if self.snapshot is not None:
+                    self.snapshot.update(kwargs)
+                return True
         except Exception as e:
-            self.logging(f"Error when trying to access the {self.__class__.__name__}, .read(): {e}", "ERROR")
-        return {}
+            self.logging(f"Error when trying to access the {self.__class__.__name__}, .write(): {e}", "ERROR")
+        return False
 
-    def write(self, **kwargs) -> bool:
+    async def write_telemetry(self, blocks: list[dict]) -> bool:
         try:
-            response = self.put(data=kwargs)
-            if response.status_code == 200:
+            response = await self.post(endpoint="telemetry", data=blocks)
+            if response is not None and response.status_code == 200:
                 return True
         except Exception as e:
-            self.logging(f"Error when trying to access the {self.__class__.__name__}, .write(): {e}", "ERROR")
+            self.logging(f"Error when trying to access the {self.__class__.__name__}, .write_telemetry(): {e}", "ERROR")
         return False
 
-    def get_wifi_config(self) -> dict:
-        data = self.read()
+    async def get_wifi_config(self) -> dict:
+        data = await self.read()
         if "wifi" in data:
             data = data["wifi"]
             return data if "template" in data and "ssid" in data else {}
         return {}
 
-    def get_data(self, name: str):
-        data = self.read()
+    async def get_data(self, name: str):
+        data = await self.read()
         if name in data:
-            return data[name]
+            return dict(data[name]) if isinstance(data[name], dict) else data[name]
         return {}
 
-    def get_rear_settings(self) -> dict:
-        return self.get_data("rear")
+    async def get_rear_settings(self) -> dict:
+        return await self.get_data("rear")
+
+    async def set_direction_settings(self) -> dict:
+        return await self.get_data("direction")
+
+    async def get_brake_settings(self) -> dict:
+        return await self.get_data("brake")
+
+    async def get_general_settings(self) -> dict:
+        return await self.get_data("general")
 
-    def set_direction_settings(self) -> dict:
-        return self.get_data("direction")
+    async def get_records(self) -> dict:
+        return await self.get_data("records")
 
-    def get_brake_settings(self) -> dict:
-        return self.get_data("brake")
 
-    def get_general_settings(self) -> dict:
-        return self.get_data("general")
+class PhoneUploader(Refresher):
+    """ **Batched writes** to the phone.
 
-    def get_records(self) -> dict:
-        return self.get_data("records")
+    - put(key=value): queued, coalesced by key (last value wins), sent as one PUT each wait_refresh seconds.
+    - Bounded queue (size keys): when full, a new key drops the oldest one (drop="oldest") or is dropped (drop="newest").
+    - Phone unreachable: the batch is queued again ahead of the values put meanwhile (these win, the oldest keys
+      are dropped beyond size) and the next try waits backoff * 2^failures seconds (up to backoff_max) with a jitter
+      of +-50%.
+    """
+
+    def __init__(self, phone: PhoneAPI, size: int = 16, drop: str = "oldest",
+                 backoff: int | float = 2, backoff_max: int | float = 60,
+                 wait_refresh: int | float = 2,
+                 name: str | None = None, is_logging: bool | None = None, style: str | None = None):
+        self.phone = phone
+        self.size = size
+        self.drop = drop
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+
+        # Queue: key -> value, keys in order of arrival
+        self.pending: dict = {}
+        self.order: list[str] = []
+        self.dropped = 0
+        self.sent = 0
+        self.failures = 0
+        self.retry = 0
+
+        super().__init__(name=name, is_logging=is_logging, style=style, wait_refresh=wait_refresh, uses_active=False)
+
+    def _queue(self, key: str, value):
+        if key in self.pending:
+            self.pending[key] = value
+            return
+        if len(self.order) >= self.size:
+            if self.drop != "oldest":
+                self.dropped += 1
+                return
+            self.pending.pop(self.order.pop(0))
+            self.dropped += 1
+        self.pending[key] = value
+        self.order.append(key)
+
+    def put(self, **kwargs):
+        for key, value in kwargs.items():
+            self._queue(key, value)
+
+    def delay(self) -> float:
+        return min(self.backoff_max, self.backoff * 2 ** (self.failures - 1)) * (0.5 + random.random())
+
+    async def send(self) -> bool:
+        """ (Async) Send the queued values at once. """
+        if not self.pending:
+            return True
+        batch, order = self.pending, self.order
+        self.pending, self.order = {}, []
+        if await self.phone.write(**batch):
+            self.sent += 1
+            self.failures = 0
+            return True
+        # Queued again ahead of the values put meanwhile (newer, they win), the oldest dropped beyond size
+        order = [key for key in order if key not in self.pending] + self.order
+        batch.update(self.pending)
+        while len(order) > self.size:
+            batch.pop(order.pop(0))
+            self.dropped += 1
+        self.pending, self.order = batch, order
+        self.failures += 1
+        self.retry = time.time() + self.delay()
+        self.logging(f"Phone unreachable: retry in {self.retry - time.time():.1f}s", level="WARNING")
+        return False
 
+    async def refreshing(self):
+        """ (Async) Send the queued values each wait_refresh (or once the back off is over). """
+        while True:
+            await asyncio.sleep(self.wait_refresh)
+            if self.pending and time.time() >= self.retry:
+                await self.send()
@@ -1,10 +1,14 @@
 
 
-from interface.wireless.api import API
+from interface.wireless.api import API, ResponseCache
 from interface.wireless.location import LocationAPI
 
 URL = "https://api.open-meteo.com/v1"
 
+CURRENT = ["temperature_2m", "apparent_temperature", "relative_humidity_2m", "precipitation", "cloud_cover",
+           "surface_pressure", "wind_speed_10m", "wind_direction_10m"]
+DAILY = ["sunrise", "sunset", "temperature_2m_max", "temperature_2m_min"]
+
 class WeatherProperty:
 
     def __init__(self, category: str, name: str, unit: bool = False, index: bool = False):
@@ -64,41 +68,54 @@ class WeatherAPI(API):
     sunset_str = WeatherProperty("daily", name="sunset", unit=True, index=True)
     sunrise_str = WeatherProperty("daily", name="sunrise", unit=True, index=True)
 
-    def __init__(self, location: LocationAPI | None = None, unit: int = 1,
+    ttl = 3600      # An hour
+    stale = 10800
+    wait = 30
+    paths = [(category, name) for category in ("current", "current_units") for name in CURRENT] + \
+            [(category, name) for category in ("daily", "daily_units") for name in DAILY]
+
+    def __init__(self, location: LocationAPI | None = None, unit: int = 1, cache: ResponseCache | None = None,
                  name: str | None = None, is_logging: bool | None = None, style: str | None = None):
-        super().__init__(URL, wifi=location.wifi if location is not None else None, name=name, is_logging=is_logging, style=style)
+        super().__init__(
+            URL, wifi=location.wifi if location is not None else None,
+            cache=location.cache if cache is None and location is not None else cache,
+            name=name, is_logging=is_logging, style=style,
+        )
 
         self.location = location
         self.data = {}
 
-    def get_from_ip(self):
+    @property
+    def params(self) -> dict:
+        return {
+            "latitude": self.location.latitude,
+            "longitude": self.location.longitude,
+            "timezone": self.location.timezone,
+            "current": CURRENT,
+            "daily": DAILY,
+            "forecast_days": 1
+        }
+
+    async def get_from_ip(self):
         try:
-            self.location.make_from_ip()
-            params = {
-                "latitude": self.location.latitude,
-                "longitude": self.location.longitude,
-                "timezone": self.location.timezone,
-                "current": ["temperature_2m", "apparent_temperature", "relative_humidity_2m", "precipitation", "cloud_cover",
-                            "surface_pressure", "wind_speed_10m", "wind_direction_10m"],
-                "daily": ["sunrise", "sunset", "temperature_2m_max", "temperature_2m_min"],
-                "forecast_days": 1
-            }
-            return self.get(f"forecast", query=params)
+            await self.location.make_from_ip()
+            return await self.get(f"forecast", query=self.params)
         except Exception as e:
             self.logging(f"Error when trying to access the WeatherAPI, .get_from_ip(): {e}", "ERROR")
             return None
 
-    def make_from_ip(self):
+    async def make_from_ip(self):
         try:
-            data = self.get_from_ip()
+            await self.location.make_from_ip()
+            data, _ = await self.cached("forecast", query=self.params)
             if data is not None:
-                self.data = data.json()
+                self.data = data
         except Exception as e:
             self.logging(f"Error when trying to access the WeatherAPI, .make_from_ip(): {e}", "ERROR")
         return self.temperature_str, self.wind_speed_str, self.sunset, self.sunrise
 
-    def read(self):
+    async def read(self):
         """ Returns the sunset, sunrise, temperature, humidity, precipitation and cloud cover. Other data is retrievable..."""
-        self.make_from_ip()
+        await self.make_from_ip()
         return self.sunset, self.sunrise, self.temperature, self.humidity, self.precipitation, self.cloudiness
 
@@ -1,4 +1,8 @@
 
+import time
+import asyncio
+
+from micropython import const
 
 from interface.basic.logger import Logging
 from interface.components.files import JsonFile, Settings
@@ -7,6 +11,13 @@ from interface.components.files import JsonFile, Settings
 AP_SSID = "BikeLight"
 AP_PASSWORD = "123456"
 
+# States of the WifiManager
+DISCONNECTED = const(0)
+CONNECTING = const(1)
+CONNECTED = const(2)
+BACKOFF = const(3)
+STATES = ["Disconnected", "Connecting", "Connected", "Backoff"]
+
 
 class Wifi:
     def __init__(self, ssid: str | None = None, password: str | None = None,
@@ -79,9 +90,22 @@ class PropSetter:
 
     def __set__(self, instance, value):
         setattr(getattr(instance, self.instance), self.attr, value)
+        if hasattr(instance, "cut_backoff"):
+            instance.cut_backoff()
 
 
 class WifiManager(Settings):
+    """ **Wifi** (access point or station) and its credentials.
+
+    refreshing(): asynchronous connection state machine (DISCONNECTED -> CONNECTING -> CONNECTED, BACKOFF on failure)
+    - station() / ap() / connect() pick the mode, the connection itself never blocks (timeout seconds at most).
+    - A failed connection waits backoff * 2^failures seconds (up to backoff_max) with the radio off: work waiting
+      meanwhile is only recorded, a change of mode, eco or credentials cuts it short.
+    - `changed` (asyncio.Event) is set on each change of state.
+    - wait_connected() / run() / queue(): API work waits for the connection (which is requested if needed).
+    - On demand (no mode picked, or eco): the radio is on while work is waiting and idle seconds after.
+    """
+
     ap_ssid = PropSetter("_ap", "ssid")
     ap_password = PropSetter("_ap", "password")
     station_ssid = PropSetter("_station", "ssid")
@@ -91,6 +115,9 @@ class WifiManager(Settings):
                  phone=None, file: JsonFile = None, template: str | None = "default",
                  ap_ssid: str | None = None, ap_password: str | None = None,
                  station_ssid: str | None = None, station_password: str | None = None,
+                 timeout: int | float = 15, backoff: int | float = 2, backoff_max: int | float = 300,
+                 idle: int | float = 30, eco: bool = False, wait_refresh: int | float = 1,
+                 is_logging: bool | None = None, style: str | None = None,
                  ):
         self._ap = Wifi() if ap is None else ap
         self._station = Wifi() if station is None else station
@@ -101,6 +128,32 @@ class WifiManager(Settings):
             station_ssid=station_ssid, station_password=station_password,
         )
 
+        # State machine
+        self.timeout = timeout
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.idle = idle
+        self.eco = eco
+        self.wait_refresh = wait_refresh
+        self.target: str | None = None     # "ap", "station" or None (on demand)
+        self.state = DISCONNECTED
+        self.failures = 0
+        self.retry = 0          # End of the backoff
+        self.demand = 0
+        self.used = 0
+        self.running = False
+        self.changed = asyncio.Event()
+        self.wake = asyncio.Event()
+        self.logging = Logging("WifiManager", is_logging, self, style=style)
+
+    @property
+    def to_dict(self):
+        return {
+            "template": self.template,
+            "ap_ssid": self.ap_ssid, "ap_password": self.ap_password,
+            "station_ssid": self.station_ssid, "station_password": self.station_password,
+        }
+
     @property
     def is_station(self):
         return self._station.connected
@@ -117,23 +170,157 @@ class WifiManager(Settings):
     def ip(self) -> str:
         return self._ap.ip if self.is_ap else self._station.ip if self.is_station else ""
 
+    @property
+    def default(self) -> str:
+        return "ap" if self.default_is_ap else "station"
+
+    def _pick(self, mode: str | None):
+        self.target = mode
+        self.failures = 0
+        self.retry = 0
+        if self.running:
+            self.wake.set()
+        elif mode is not None:
+            (self._station if mode == "ap" else self._ap).disconnect()
+            (self._ap if mode == "ap" else self._station).connect()
+
     def station(self, _=None):
-        self._ap.disconnect()
-        self._station.connect()
+        self._pick("station")
 
     def ap(self, _=None):
-        self._station.disconnect()
-        self._ap.connect()
+        self._pick("ap")
 
     def connect(self, _=None):
-        if self.default_is_ap:
-            self.ap()
-        else:
-            self.station()
+        self._pick(self.default)
+
+    def set_eco(self, value: bool = True):
+        """ Eco: the radio is on demand even with a mode picked. """
+        self.eco = value
+        self.cut_backoff()
 
     def disconnect(self, _=None):
+        self.target = None
+        self.used = 0
+        self.retry = 0
         self._ap.disconnect()
         self._station.disconnect()
+        self._set_state(DISCONNECTED)
+        if self.running:
+            self.wake.set()
+
+    # State machine
+
+    def _set_state(self, state: int):
+        if state != self.state:
+            self.state = state
+            self.logging(f"Wifi: {STATES[state]}", "INFO")
+            self.changed.set()
+
+    def cut_backoff(self):
+        """ Connect again at once (mode, eco or credentials changed). """
+        self.retry = 0
+        if self.running:
+            self.wake.set()
+
+    def touch(self):
+        """ Wifi used (on demand: kept on idle seconds more). """
+        self.used = time.time()
+
+    def wanted(self) -> str | None:
+        """ Mode the radio should be in (None: off). """
+        if self.demand:
+            return self.target or self.default
+        if self.target is None or self.eco:
+            return (self.target or self.default) if time.time() - self.used < self.idle else None
+        return self.target
+
+    async def _connecting(self, mode: str) -> bool:
+        wifi, other = (self._ap, self._station) if mode == "ap" else (self._station, self._ap)
+        if other.connected:
+            other.disconnect()
+        wifi.connect()
+        start = time.time()
+        while not wifi.connected:
+            if time.time() - start > self.timeout:
+                wifi.disconnect()
+                return False
+            await asyncio.sleep(0.2)
+        return True
+
+    async def refreshing(self):
+        """ (Async) Connect, reconnect (with backoff) and disconnect (on demand) the wifi. """
+        self.running = True
+        while True:
+            mode = self.wanted()
+            wait = self.wait_refresh
+            if mode is None:
+                if self.is_ap or self.is_station:
+                    self._ap.disconnect()
+                    self._station.disconnect()
+                self._set_state(DISCONNECTED)
+            elif (self._ap if mode == "ap" else self._station).connected:
+                self._set_state(CONNECTED)
+                self.failures = 0
+            elif time.time() < self.retry:
+                # Backing off until retry (the work waiting meanwhile is only recorded)
+                wait = self.retry - time.time()
+            else:
+                self._set_state(CONNECTING)
+                if await self._connecting(mode):
+                    self.failures = 0
+                    self.touch()
+                    self._set_state(CONNECTED)
+                else:
+                    self.failures += 1
+                    wait = min(self.backoff_max, self.backoff * 2 ** (self.failures - 1))
+                    self.retry = time.time() + wait
+                    self.logging(f"Wifi: no connection ({self.failures}), retry in {wait}s", "WARNING")
+                    self._set_state(BACKOFF)
+            self.wake.clear()
+            try:
+                await asyncio.wait_for(self.wake.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _connected(self):
+        while not self.connected:
+            self.changed.clear()
+            await self.changed.wait()
+
+    async def wait_connected(self, timeout: int | float | None = None) -> bool:
+        """ (Async) Wait for the connection (requested if on demand), False after timeout seconds. """
+        if self.connected:
+            return True
+        if not self.running:
+            return False
+        self.demand += 1
+        # Only recorded while backing off
+        if time.time() >= self.retry:
+            self.wake.set()
+        try:
+            if timeout is None:
+                await self._connected()
+            else:
+                await asyncio.wait_for(self._connected(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self.demand -= 1
+            self.touch()
+
+    async def run(self, func, *args, timeout: int | float | None = None):
+        """ (Async) func(*args) (async) once connected, None if not connected after timeout seconds. """
+        if not await self.wait_connected(timeout):
+            return None
+        try:
+            return await func(*args)
+        finally:
+            self.touch()
+
+    def queue(self, func, *args, timeout: int | float | None = None):
+        """ func(*args) (async) in the background once connected. """
+        return asyncio.create_task(self.run(func, *args, timeout=timeout))
 
     @property
     def value(self):